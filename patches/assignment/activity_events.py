@@ -0,0 +1,364 @@
+"""
+Activity Events
+
+Append-only fact table of annotation activity, one row per event:
+
+- confirm: ExampleState created (tick mark / Enter)
+- submit:  AnnotationTracking (re)submitted (status 'submitted', keyed by annotated_at)
+- approve / reject: an approver's review (ApproverCompletionStatus write)
+
+Each row carries project, user, example, timestamp, the local calendar
+day and the example's audio minutes / syllables (payment_metrics) at
+write time, so the analytics API answers any date range with an index
+range scan on (day, project, event_type) instead of scanning ExampleState
+and AnnotationTracking with a giant example-id IN list.
+
+Rows are unique on (event_type, example, user, occurred_at) for events
+with a user (NULLs are distinct in a unique index, so writers skip
+user-less rows; user stays nullable only so deleting a user keeps the
+history): writers insert with ON CONFLICT DO NOTHING, so repeated saves,
+re-syncs and the backfill never double count. The only deletion is a confirmation being
+undone (ExampleState deleted), mirroring the rollups.
+
+Writers:
+- ExampleState post_save / post_delete and AnnotationTracking post_save
+  receivers (connect_activity_signals)
+- CompletionMatrixUpdater.update_approver_status, bulk_review and
+  sync_from_assignments (record_review_events / record_events)
+- the bulk writers that bypass signals: tracking_buffer.apply_tracking_events
+  and the reconciler (record_bulk_events)
+- `python manage.py backfill_activity_events` for history / bulk paths
+  that bypass signals; backfill_pending_activity_events_task runs the
+  same backfill on the Celery beat schedule for every project without an
+  ActivityBackfill mark. Readers never backfill: a single new event must
+  not be mistaken for a loaded history.
+"""
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+EVENT_BATCH_SIZE = 2000
+
+_DEFAULT_BACKFILL_SECONDS = 60 * 60
+
+
+class ActivityEvent(models.Model):
+    """One confirm / submit / approve / reject event."""
+    CONFIRM = 'confirm'
+    SUBMIT = 'submit'
+    APPROVE = 'approve'
+    REJECT = 'reject'
+    EVENT_CHOICES = [
+        (CONFIRM, 'Confirmed'),
+        (SUBMIT, 'Submitted'),
+        (APPROVE, 'Approved'),
+        (REJECT, 'Rejected'),
+    ]
+
+    event_type = models.CharField(max_length=10, choices=EVENT_CHOICES)
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    # History outlives the example: no FK constraint, id kept after deletes
+    example = models.ForeignKey(
+        'examples.Example',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    occurred_at = models.DateTimeField()
+    day = models.DateField()
+    minutes = models.FloatField(default=0.0)
+    syllables = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'assignment_activity_event'
+        indexes = [
+            models.Index(fields=['day', 'project', 'event_type'], name='activity_day_project_idx'),
+            models.Index(fields=['project', 'occurred_at'], name='activity_project_time_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event_type', 'example', 'user', 'occurred_at'],
+                condition=models.Q(user__isnull=False),
+                name='activity_event_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} of Example {self.example_id} by {self.user_id} at {self.occurred_at}"
+
+
+class ActivityBackfill(models.Model):
+    """Marks a project whose existing history was loaded into ActivityEvent."""
+    project = models.OneToOneField(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='activity_backfill'
+    )
+    backfilled_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'assignment_activity_backfill'
+
+    def __str__(self):
+        return f"Activity backfill for Project {self.project_id} @ {self.backfilled_at}"
+
+
+REVIEW_EVENTS = {
+    'approved': ActivityEvent.APPROVE,
+    'rejected': ActivityEvent.REJECT,
+}
+
+
+def _metrics(example_ids):
+    """{example_id: (minutes, syllables)}, computing missing payment metrics first."""
+    from .payment_metrics import ExamplePaymentMetrics, refresh_payment_metrics
+
+    example_ids = set(example_ids)
+    found = {
+        example_id: (minutes, syllables)
+        for example_id, minutes, syllables in ExamplePaymentMetrics.objects.filter(
+            example_id__in=example_ids
+        ).values_list('example_id', 'duration_minutes', 'syllables')
+    }
+    missing = example_ids - set(found)
+    if missing:
+        refresh_payment_metrics(missing)
+        found.update({
+            example_id: (minutes, syllables)
+            for example_id, minutes, syllables in ExamplePaymentMetrics.objects.filter(
+                example_id__in=missing
+            ).values_list('example_id', 'duration_minutes', 'syllables')
+        })
+    return found
+
+
+def record_events(event_type, project_id, rows):
+    """
+    Append events (duplicates are ignored, rows without a user are skipped).
+
+    Args:
+        event_type: ActivityEvent.CONFIRM / SUBMIT / APPROVE / REJECT
+        project_id: Project of every row
+        rows: (example_id, user_id, occurred_at) tuples
+
+    Returns:
+        Number of rows offered for insert
+    """
+    rows = [row for row in rows if row[0] and row[1] and row[2]]
+    if not rows:
+        return 0
+    metrics = _metrics(example_id for example_id, _, _ in rows)
+    ActivityEvent.objects.bulk_create([
+        ActivityEvent(
+            event_type=event_type,
+            project_id=project_id,
+            user_id=user_id,
+            example_id=example_id,
+            occurred_at=occurred_at,
+            day=timezone.localdate(occurred_at),
+            minutes=metrics.get(example_id, (0.0, 0))[0],
+            syllables=metrics.get(example_id, (0.0, 0))[1]
+        )
+        for example_id, user_id, occurred_at in rows
+    ], batch_size=EVENT_BATCH_SIZE, ignore_conflicts=True)
+    return len(rows)
+
+
+def record_review_events(project_id, approver_id, example_ids, decision, when):
+    """Approve / reject events for one reviewer's decision on many examples."""
+    event_type = REVIEW_EVENTS.get(decision)
+    if event_type is None:
+        return 0
+    try:
+        with transaction.atomic():
+            return record_events(
+                event_type, project_id, [(example_id, approver_id, when) for example_id in example_ids]
+            )
+    except Exception as e:
+        print(f'[Monlam Activity] ⚠️ Could not record {event_type} events: {e}')
+        return 0
+
+
+def record_bulk_events(event_type, rows):
+    """
+    Events for bulk_create / bulk_update writers, which send no post_save.
+
+    Args:
+        rows: (project_id, example_id, user_id, occurred_at) tuples, any projects
+
+    Returns:
+        Number of rows offered for insert (0 on failure)
+    """
+    by_project = {}
+    for project_id, example_id, user_id, occurred_at in rows:
+        by_project.setdefault(project_id, []).append((example_id, user_id, occurred_at))
+    offered = 0
+    for project_id, project_rows in by_project.items():
+        # Savepoint: a failure must not abort the caller's transaction
+        try:
+            with transaction.atomic():
+                offered += record_events(event_type, project_id, project_rows)
+        except Exception as e:
+            print(f'[Monlam Activity] ⚠️ Could not record {event_type} events: {e}')
+    return offered
+
+
+# ============================================================================
+# Signals
+# ============================================================================
+
+def _record_safely(event_type, project_id, rows):
+    # Savepoint: a failure must not abort the caller's transaction
+    try:
+        with transaction.atomic():
+            record_events(event_type, project_id, rows)
+    except Exception as e:
+        print(f'[Monlam Activity] ⚠️ Could not record {event_type} event: {e}')
+
+
+def _example_state_saved(sender, instance, created, **kwargs):
+    if not created or not instance.confirmed_by_id:
+        return
+    # The tick-mark guard may already have deleted a non-annotator's confirmation
+    if not type(instance).objects.filter(pk=instance.pk).exists():
+        return
+    _record_safely(ActivityEvent.CONFIRM, instance.example.project_id, [
+        (instance.example_id, instance.confirmed_by_id, instance.confirmed_at or timezone.now())
+    ])
+
+
+def _example_state_deleted(sender, instance, **kwargs):
+    # A confirmation that was undone (or rejected by the tick-mark guard)
+    if not instance.confirmed_by_id or not instance.confirmed_at:
+        return
+    ActivityEvent.objects.filter(
+        event_type=ActivityEvent.CONFIRM,
+        example_id=instance.example_id,
+        user_id=instance.confirmed_by_id,
+        occurred_at=instance.confirmed_at
+    ).delete()
+
+
+def _tracking_saved(sender, instance, **kwargs):
+    if instance.status != 'submitted' or not instance.annotated_by_id or not instance.annotated_at:
+        return
+    _record_safely(ActivityEvent.SUBMIT, instance.project_id, [
+        (instance.example_id, instance.annotated_by_id, instance.annotated_at)
+    ])
+
+
+def connect_activity_signals():
+    """Append confirm / submit events from ExampleState and AnnotationTracking saves."""
+    from django.db.models.signals import post_save, post_delete
+    from examples.models import ExampleState
+    from .simple_tracking import AnnotationTracking
+
+    post_save.connect(
+        _example_state_saved,
+        sender=ExampleState,
+        dispatch_uid='monlam_activity_example_state_saved'
+    )
+    post_delete.connect(
+        _example_state_deleted,
+        sender=ExampleState,
+        dispatch_uid='monlam_activity_example_state_deleted'
+    )
+    post_save.connect(
+        _tracking_saved,
+        sender=AnnotationTracking,
+        dispatch_uid='monlam_activity_tracking_saved'
+    )
+
+
+# ============================================================================
+# Backfill
+# ============================================================================
+
+def backfill_activity_events(project, chunk_size=EVENT_BATCH_SIZE):
+    """
+    Append events for a project's existing ExampleState, AnnotationTracking
+    and ApproverCompletionStatus rows (idempotent). Returns rows offered.
+    """
+    from examples.models import ExampleState
+    from .simple_tracking import AnnotationTracking
+    from .completion_tracking import ApproverCompletionStatus
+
+    sources = [
+        (ActivityEvent.CONFIRM, ExampleState.objects.filter(
+            example__project=project,
+            confirmed_by__isnull=False,
+            confirmed_at__isnull=False
+        ).values_list('example_id', 'confirmed_by_id', 'confirmed_at')),
+        (ActivityEvent.SUBMIT, AnnotationTracking.objects.filter(
+            project=project,
+            annotated_by__isnull=False,
+            annotated_at__isnull=False
+        ).values_list('example_id', 'annotated_by_id', 'annotated_at')),
+    ]
+    for decision, event_type in REVIEW_EVENTS.items():
+        sources.append((event_type, ApproverCompletionStatus.objects.filter(
+            project=project,
+            status=decision,
+            reviewed_at__isnull=False
+        ).values_list('example_id', 'approver_id', 'reviewed_at')))
+
+    offered = 0
+    for event_type, queryset in sources:
+        batch = []
+        for row in queryset.order_by('pk').iterator(chunk_size=chunk_size):
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                offered += record_events(event_type, project.id, batch)
+                batch = []
+        offered += record_events(event_type, project.id, batch)
+    ActivityBackfill.objects.update_or_create(project=project, defaults={'backfilled_at': timezone.now()})
+    return offered
+
+
+def projects_pending_backfill(projects):
+    """The projects (queryset) whose history has not been backfilled yet."""
+    return projects.filter(activity_backfill__isnull=True)
+
+
+def register_beat_schedule():
+    """
+    Add backfill_pending_activity_events_task to Celery beat, every
+    settings.MONLAM_ACTIVITY_BACKFILL_SECONDS (default 1 h; a no-op once
+    every project is marked).
+    """
+    from celery import current_app
+
+    schedule = current_app.conf.beat_schedule or {}
+    schedule.setdefault('monlam-backfill-activity-events', {
+        'task': 'assignment.celery_tasks.backfill_pending_activity_events_task',
+        'schedule': getattr(settings, 'MONLAM_ACTIVITY_BACKFILL_SECONDS', _DEFAULT_BACKFILL_SECONDS),
+    })
+    current_app.conf.beat_schedule = schedule
+
+
+def events_in_range(projects, start, end, event_type=None):
+    """
+    Events of the projects in [start, end]: a range scan on the day index,
+    narrowed to the exact (HH:MM) bounds.
+    """
+    events = ActivityEvent.objects.filter(
+        project__in=projects,
+        day__gte=timezone.localdate(start),
+        day__lte=timezone.localdate(end),
+        occurred_at__gte=start,
+        occurred_at__lte=end
+    )
+    if event_type is not None:
+        events = events.filter(event_type=event_type)
+    return events
@@ -27,3 +27,52 @@ from django.contrib import admin
 #     list_filter = ['project']
 #     search_fields = ['assigned_to__username']
 
+
+
+# ============================================================================
+# Project admin action: materialize assignments
+# ============================================================================
+
+def materialize_assignments_action(modeladmin, request, queryset):
+    """Create missing Assignment rows for the selected projects in bulk."""
+    from .materialize import materialize_assignments
+    
+    for project in queryset:
+        result = materialize_assignments(project)
+        modeladmin.message_user(
+            request,
+            f"Project {project.id} ({project.name}): created {result['created']} "
+            f"assignments in {result['elapsed_seconds']}s"
+        )
+
+
+materialize_assignments_action.short_description = 'Materialize assignments for selected projects'
+
+
+try:
+    from projects.models import Project
+    
+    _project_admin = admin.site._registry.get(Project)
+    if _project_admin is not None:
+        _project_admin.actions = list(_project_admin.actions or []) + [materialize_assignments_action]
+except Exception as e:
+    print(f'[Monlam Admin] ⚠️ Could not add materialize action to Project admin: {e}')
+
+
+# ============================================================================
+# Payment rates (editable without a deploy)
+# ============================================================================
+
+try:
+    from .payment_rates import PaymentRate
+    
+    @admin.register(PaymentRate)
+    class PaymentRateAdmin(admin.ModelAdmin):
+        list_display = [
+            'prefix', 'audio_minute_rate', 'segment_rate', 'syllable_rate',
+            'effective_from', 'effective_to', 'updated_at'
+        ]
+        list_filter = ['prefix']
+        search_fields = ['prefix', 'notes']
+except Exception as e:
+    print(f'[Monlam Admin] ⚠️ Could not register PaymentRate admin: {e}')
@@ -14,5 +14,41 @@ class AssignmentConfig(AppConfig):
     
     def ready(self):
         # Import signals when app is ready
-        pass
+        try:
+            from .rollups import connect_rollup_signals
+            connect_rollup_signals()
+        except Exception as e:
+            print(f'[Monlam Assignment] ⚠️ Could not connect rollup signals: {e}')
+        
+        try:
+            from .role_service import connect_role_cache_signals
+            connect_role_cache_signals()
+        except Exception as e:
+            print(f'[Monlam Assignment] ⚠️ Could not connect role cache signals: {e}')
 
+        
+        try:
+            from .completion_view import connect_completion_view_signals, register_beat_schedule
+            connect_completion_view_signals()
+            register_beat_schedule()
+        except Exception as e:
+            print(f'[Monlam Assignment] ⚠️ Could not set up completion view refresh: {e}')
+
+        try:
+            from .payment_metrics import connect_payment_metrics_signals
+            connect_payment_metrics_signals()
+        except Exception as e:
+            print(f'[Monlam Assignment] ⚠️ Could not connect payment metrics signals: {e}')
+
+        try:
+            from .payment_rates import connect_rate_cache_signals
+            connect_rate_cache_signals()
+        except Exception as e:
+            print(f'[Monlam Assignment] ⚠️ Could not connect payment rate cache signals: {e}')
+
+        try:
+            from .activity_events import connect_activity_signals, register_beat_schedule
+            connect_activity_signals()
+            register_beat_schedule()
+        except Exception as e:
+            print(f'[Monlam Assignment] ⚠️ Could not set up activity events: {e}')
@@ -0,0 +1,166 @@
+"""
+Bulk Review
+
+Approve or reject many examples in one request
+(POST /v1/projects/{project_id}/tracking/bulk-review/).
+
+Eligibility is checked in set form with review_eligibility.annotate_eligibility,
+then every write is a fixed number of statements inside one transaction:
+
+- ApproverCompletionStatus: upsert (upserts.py)
+- AnnotationTracking:       upsert (upserts.py)
+- Assignment:               one UPDATE per resulting status
+- Rollups:                  rollups.record_reviews (one bump per user)
+- Activity events:          activity_events.record_review_events (one insert)
+
+Examples are selected by explicit ids, or taken from the reviewer's
+review queue (review_queue.py) up to a limit.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+MAX_BULK_REVIEW = 5000
+
+TRACKING_STATUS = {
+    'approved': 'reviewed',
+    'rejected': 'rejected',
+}
+
+
+def queued_example_ids(project, user, user_role, limit=MAX_BULK_REVIEW):
+    """Ids in the user's review queue they have not reviewed yet (oldest first)."""
+    from .review_queue import review_queue, unreviewed_by
+
+    queue = review_queue(project, user_role)
+    if queue is None:
+        return []
+    return list(unreviewed_by(queue, user).order_by('id').values_list('id', flat=True)[:limit])
+
+
+def bulk_review(project, user, user_role, example_ids, decision, notes=''):
+    """
+    Apply one review decision to many examples.
+
+    Args:
+        project: Project instance
+        user: Reviewer
+        user_role: Reviewer's role in the project
+        example_ids: Examples to review (at most MAX_BULK_REVIEW)
+        decision: 'approved' or 'rejected'
+        notes: Review notes stored on every row
+
+    Returns:
+        {'results': [{'example_id', 'success', 'status' | 'reason'}], 'summary': {...}}
+    """
+    from examples.models import Example
+    from .models_separate import Assignment
+    from .simple_tracking import AnnotationTracking
+    from .completion_tracking import ApproverCompletionStatus
+    from .review_eligibility import annotate_eligibility, eligibility_error
+    from .rollups import example_review_statuses, record_reviews
+    from .upserts import upsert_approver_statuses, upsert_tracking
+    from .completion_view import mark_project_dirty
+    from .activity_events import record_review_events
+
+    verb = 'approve' if decision == 'approved' else 'reject'
+    requested = list(dict.fromkeys(int(i) for i in example_ids))[:MAX_BULK_REVIEW]
+
+    examples = annotate_eligibility(
+        Example.objects.filter(project=project, pk__in=requested).only('id'),
+        project
+    )
+    reasons = {}
+    eligible = []
+    for example in examples:
+        error = eligibility_error(example, user_role, verb)
+        if error:
+            reasons[example.id] = next(key for key in error if key != 'error')
+        else:
+            eligible.append(example.id)
+
+    now = timezone.now()
+    if eligible:
+        with transaction.atomic():
+            previous = dict(ApproverCompletionStatus.objects.filter(
+                approver=user,
+                example_id__in=eligible
+            ).values_list('example_id', 'status'))
+            statuses_before = example_review_statuses(eligible)
+
+            upsert_approver_statuses([
+                ApproverCompletionStatus(
+                    example_id=example_id,
+                    project=project,
+                    approver=user,
+                    status=decision,
+                    reviewed_at=now,
+                    review_notes=notes
+                )
+                for example_id in eligible
+            ])
+            upsert_tracking([
+                AnnotationTracking(
+                    project=project,
+                    example_id=example_id,
+                    status=TRACKING_STATUS[decision],
+                    reviewed_by=user,
+                    reviewed_at=now,
+                    review_notes=notes
+                )
+                for example_id in eligible
+            ])
+
+            # Assignment mirrors the approver statuses (any rejection wins,
+            # as in reconciliation.DatasetReconciler)
+            rejected = set(ApproverCompletionStatus.objects.filter(
+                example_id__in=eligible,
+                status='rejected'
+            ).values_list('example_id', flat=True))
+            active = Assignment.objects.filter(project=project, example_id__in=eligible, is_active=True)
+            for assignment_status, ids in (
+                ('rejected', rejected),
+                ('approved', set(eligible) - rejected),
+            ):
+                if ids:
+                    active.filter(example_id__in=ids).update(
+                        status=assignment_status,
+                        reviewed_by=user,
+                        reviewed_at=now,
+                        review_notes=notes
+                    )
+
+            mark_project_dirty(project.id)
+
+            # Savepoint: a failed rollup write must not abort the review transaction
+            try:
+                with transaction.atomic():
+                    record_reviews(
+                        project.id,
+                        user,
+                        {example_id: previous.get(example_id) for example_id in eligible},
+                        decision,
+                        statuses_before,
+                        example_review_statuses(eligible),
+                        when=now
+                    )
+            except Exception as e:
+                print(f'[Monlam Rollup] ⚠️ Could not record bulk review: {e}')
+
+            record_review_events(project.id, user.id, eligible, decision, now)
+
+    eligible_set = set(eligible)
+    results = []
+    for example_id in requested:
+        if example_id in eligible_set:
+            results.append({'example_id': example_id, 'success': True, 'status': decision})
+        else:
+            results.append({
+                'example_id': example_id,
+                'success': False,
+                'reason': reasons.get(example_id, 'not_found')
+            })
+
+    summary = {'requested': len(requested), decision: len(eligible), 'skipped': len(requested) - len(eligible)}
+    print(f'[Monlam Review] ✅ Bulk {verb} in project {project.id} by {user.username}: {summary}')
+    return {'results': results, 'summary': summary}
@@ -0,0 +1,83 @@
+"""
+Celery tasks for the assignment app.
+
+Discovered by Doccano's Celery app alongside data_import/data_export tasks.
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def reconcile_project_task(project_id, full=False):
+    """Incrementally reconcile ExampleState / AnnotationTracking / Assignment for a project."""
+    from projects.models import Project
+    from .reconciliation import reconcile_project
+
+    project = Project.objects.filter(pk=project_id).first()
+    if project is None:
+        return {'error': f'Project {project_id} not found'}
+    return reconcile_project(project, full=full)
+
+
+@shared_task
+def reconcile_all_projects_task(full=False):
+    """Reconcile every project (intended for a periodic beat schedule)."""
+    from projects.models import Project
+    from .reconciliation import reconcile_project
+
+    results = {}
+    for project in Project.objects.all().only('id'):
+        try:
+            results[project.id] = reconcile_project(project, full=full)
+        except Exception as e:
+            print(f'[Monlam Reconcile] ⚠️ Project {project.id} failed: {e}')
+            results[project.id] = {'error': str(e)}
+    return results
+
+
+@shared_task
+def materialize_assignments_task(project_id):
+    """Create missing active Assignment rows for a project (queued by the dataset table)."""
+    from projects.models import Project
+    from .materialize import materialize_assignments
+
+    project = Project.objects.filter(pk=project_id).first()
+    if project is None:
+        return {'error': f'Project {project_id} not found'}
+    return materialize_assignments(project)
+
+
+@shared_task
+def refresh_completion_view_task(force=False):
+    """Refresh the materialized completion view if any project changed (beat schedule)."""
+    from .completion_view import refresh_completion_view
+
+    return refresh_completion_view(force=force)
+
+
+@shared_task
+def rebuild_rollups_task(project_id):
+    """Rebuild a project's status rollups (queued by rollups.ensure_rollups)."""
+    from projects.models import Project
+    from .rollups import rebuild_rollups
+
+    project = Project.objects.filter(pk=project_id).first()
+    if project is None:
+        return {'error': f'Project {project_id} not found'}
+    return {'rows': rebuild_rollups(project)}
+
+
+@shared_task
+def backfill_pending_activity_events_task():
+    """Load existing history into ActivityEvent for projects not backfilled yet (beat schedule)."""
+    from projects.models import Project
+    from .activity_events import backfill_activity_events, projects_pending_backfill
+
+    results = {}
+    for project in projects_pending_backfill(Project.objects.all()):
+        try:
+            results[project.id] = backfill_activity_events(project)
+        except Exception as e:
+            print(f'[Monlam Activity] ⚠️ Backfill of project {project.id} failed: {e}')
+            results[project.id] = {'error': str(e)}
+    return results
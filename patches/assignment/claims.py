@@ -0,0 +1,116 @@
+"""
+Claim-Next Allocator
+
+Hands annotators the next example to work on, one at a time, without two
+annotators landing on the same shared ("unassigned") row.
+
+An example is claimable by a user when its active Assignment:
+- is assigned to the user, or to nobody
+- is still open (assigned / in_progress / rejected)
+- is not skipped by the user and not submitted/approved in AnnotationTracking
+- has no live lease held by someone else
+
+claim_next() picks the lowest such example id with
+SELECT ... FOR UPDATE SKIP LOCKED inside a transaction and leases it to
+the user for settings.MONLAM_CLAIM_LEASE_SECONDS (default 15 minutes).
+Concurrent callers skip each other's locked rows instead of waiting.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+_DEFAULT_LEASE_SECONDS = 15 * 60
+
+OPEN_STATUSES = ['assigned', 'in_progress', 'rejected']
+
+
+def lease_duration():
+    return timedelta(seconds=getattr(settings, 'MONLAM_CLAIM_LEASE_SECONDS', _DEFAULT_LEASE_SECONDS))
+
+
+def claimable_assignments(project, user, now=None):
+    """Active assignments the user may claim (lease-free or leased to them)."""
+    from .models_separate import Assignment
+    from .simple_tracking import AnnotationTracking, SkippedExample
+
+    now = now or timezone.now()
+    return Assignment.objects.filter(
+        project=project,
+        is_active=True,
+        status__in=OPEN_STATUSES
+    ).filter(
+        Q(assigned_to=user) | Q(assigned_to__isnull=True)
+    ).filter(
+        Q(lease_owner__isnull=True) | Q(lease_owner=user) | Q(lease_expires_at__lt=now)
+    ).exclude(
+        Exists(SkippedExample.objects.filter(
+            project=project,
+            example_id=OuterRef('example_id'),
+            skipped_by=user
+        ))
+    ).exclude(
+        Exists(AnnotationTracking.objects.filter(
+            project=project,
+            example_id=OuterRef('example_id'),
+            status__in=['submitted', 'approved']
+        ))
+    )
+
+
+def claim_next(project, user, after_example_id=None):
+    """
+    Lease the next claimable example to the user.
+
+    Args:
+        project: Project instance
+        user: Annotator
+        after_example_id: Keyset cursor - only consider examples with a higher id
+            (wraps around to the start when nothing is left after it)
+
+    Returns:
+        The leased Assignment, or None if nothing is claimable
+    """
+    now = timezone.now()
+    expires_at = now + lease_duration()
+
+    with transaction.atomic():
+        candidates = claimable_assignments(project, user, now).order_by('example_id')
+        assignment = None
+        if after_example_id:
+            assignment = candidates.filter(
+                example_id__gt=after_example_id
+            ).select_for_update(skip_locked=True).first()
+        if assignment is None:
+            assignment = candidates.select_for_update(skip_locked=True).first()
+        if assignment is None:
+            return None
+
+        # Drop any other lease this user still holds in the project
+        type(assignment).objects.filter(
+            project=project,
+            lease_owner=user
+        ).exclude(pk=assignment.pk).update(lease_owner=None, lease_expires_at=None)
+
+        assignment.lease_owner = user
+        assignment.lease_expires_at = expires_at
+        update_fields = ['lease_owner', 'lease_expires_at']
+        if assignment.status == 'assigned':
+            assignment.status = 'in_progress'
+            assignment.started_at = now
+            update_fields += ['status', 'started_at']
+        assignment.save(update_fields=update_fields)
+    return assignment
+
+
+def release_claims(project, user, example_id=None):
+    """Release the user's lease(s) in the project; returns the number released."""
+    from .models_separate import Assignment
+
+    leases = Assignment.objects.filter(project=project, lease_owner=user)
+    if example_id:
+        leases = leases.filter(example_id=example_id)
+    return leases.update(lease_owner=None, lease_expires_at=None)
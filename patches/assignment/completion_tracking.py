@@ -7,7 +7,7 @@ for Project Managers.
 """
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.db.models import Count, Q, F
 from django.contrib.auth import get_user_model
@@ -159,6 +159,20 @@ class ApproverCompletionStatus(models.Model):
         self.save(update_fields=['status', 'reviewed_at', 'review_notes'])
 
 
+MATRIX_CHUNK_SIZE = 2000
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
 class CompletionMatrix:
     """
     Utility class to generate completion matrix for Project Managers.
@@ -168,10 +182,26 @@ class CompletionMatrix:
     def __init__(self, project):
         self.project = project
     
-    def get_annotator_matrix(self):
+    def _members(self, role_name):
+        """Project members with the given role, with users loaded."""
+        from projects.models import Member
+        return Member.objects.filter(
+            project=self.project,
+            role__name__iexact=role_name
+        ).select_related('user').order_by('user__username')
+    
+    def get_annotator_matrix(self, include_examples=False):
         """
         Get completion matrix for all annotators in the project.
         
+        Counts come from two grouped aggregate queries (Assignment by
+        assigned_to, AnnotatorCompletionStatus by annotator), so the cost does
+        not grow with the number of annotators or assignments.
+        
+        Args:
+            include_examples: Also attach the per-example list to each row.
+                For large projects page through annotator_examples() instead.
+        
         Returns:
             List of dicts with structure:
             [
@@ -181,73 +211,69 @@ class CompletionMatrix:
                     'total_assigned': int,
                     'completed': int,
                     'in_progress': int,
+                    'submitted': int,
+                    'approved': int,
                     'completion_rate': float,
-                    'examples': [
-                        {
-                            'example_id': int,
-                            'status': 'completed' | 'in_progress' | 'not_started',
-                            'completed_at': datetime or None
-                        }
-                    ]
+                    'examples': [...]  # only with include_examples
                 }
             ]
         """
         from .models_separate import Assignment
         
-        # Get all project members who are annotators
-        annotator_role = self._get_annotator_role()
-        members = self.project.members.filter(role=annotator_role)
+        members = self._members(self._get_annotator_role())
         
-        matrix = []
-        for member in members:
-            # Get assignments for this annotator
-            assignments = Assignment.objects.filter(
+        assignment_counts = {
+            row['assigned_to_id']: row
+            for row in Assignment.objects.filter(
                 project=self.project,
-                assigned_to=member.user,
-                is_active=True
+                is_active=True,
+                assigned_to__isnull=False
+            ).values('assigned_to_id').annotate(
+                total=Count('id'),
+                in_progress=Count('id', filter=Q(status='in_progress')),
+                submitted=Count('id', filter=Q(status='submitted')),
+                approved=Count('id', filter=Q(status='approved')),
             )
-            
-            # Get completion status
-            completions = AnnotatorCompletionStatus.objects.filter(
+        }
+        completed_counts = dict(
+            AnnotatorCompletionStatus.objects.filter(
                 project=self.project,
-                annotator=member.user
-            )
-            
-            total = assignments.count()
-            completed = completions.filter(is_completed=True).count()
-            
-            # Build example details
-            examples = []
-            for assignment in assignments:
-                completion = completions.filter(example=assignment.example).first()
-                examples.append({
-                    'example_id': assignment.example_id,
-                    'assignment_id': assignment.id,
-                    'status': assignment.status,
-                    'is_completed': completion.is_completed if completion else False,
-                    'completed_at': completion.completed_at if completion else None,
-                    'started_at': assignment.started_at,
-                    'submitted_at': assignment.submitted_at,
-                })
-            
-            matrix.append({
-                'annotator_id': member.user.id,
+                is_completed=True
+            ).values('annotator_id').annotate(n=Count('id')).values_list('annotator_id', 'n')
+        )
+        
+        examples_by_user = {}
+        if include_examples:
+            for example in self.annotator_examples():
+                examples_by_user.setdefault(example['annotator_id'], []).append(example)
+        
+        matrix = []
+        for member in members:
+            counts = assignment_counts.get(member.user_id, {})
+            total = counts.get('total', 0)
+            completed = completed_counts.get(member.user_id, 0)
+            row = {
+                'annotator_id': member.user_id,
                 'annotator_username': member.user.username,
                 'total_assigned': total,
                 'completed': completed,
-                'in_progress': assignments.filter(status='in_progress').count(),
-                'submitted': assignments.filter(status='submitted').count(),
-                'approved': assignments.filter(status='approved').count(),
+                'in_progress': counts.get('in_progress', 0),
+                'submitted': counts.get('submitted', 0),
+                'approved': counts.get('approved', 0),
                 'completion_rate': round((completed / total * 100), 1) if total > 0 else 0,
-                'examples': examples
-            })
+            }
+            if include_examples:
+                row['examples'] = examples_by_user.get(member.user_id, [])
+            matrix.append(row)
         
         return matrix
     
-    def get_approver_matrix(self):
+    def get_approver_matrix(self, include_examples=False):
         """
         Get approval matrix for all approvers in the project.
         
+        Counts come from one grouped aggregate query on ApproverCompletionStatus.
+        
         Returns:
             List of dicts with structure:
             [
@@ -259,59 +285,115 @@ class CompletionMatrix:
                     'rejected': int,
                     'pending': int,
                     'approval_rate': float,
-                    'examples': [...]
+                    'examples': [...]  # only with include_examples
                 }
             ]
         """
-        from .models_separate import Assignment
+        members = self._members(self._get_approver_role())
+        
+        approval_counts = {
+            row['approver_id']: row
+            for row in ApproverCompletionStatus.objects.filter(
+                project=self.project
+            ).values('approver_id').annotate(
+                total=Count('id'),
+                approved=Count('id', filter=Q(status='approved')),
+                rejected=Count('id', filter=Q(status='rejected')),
+                pending=Count('id', filter=Q(status='pending')),
+            )
+        }
         
-        # Get all project members who are approvers
-        approver_role = self._get_approver_role()
-        members = self.project.members.filter(role=approver_role)
+        examples_by_user = {}
+        if include_examples:
+            for example in self.approver_examples():
+                examples_by_user.setdefault(example['approver_id'], []).append(example)
         
         matrix = []
         for member in members:
-            # Get assignments reviewed by this approver
-            assignments = Assignment.objects.filter(
-                project=self.project,
-                reviewed_by=member.user
-            )
-            
-            # Get approval status
-            approvals = ApproverCompletionStatus.objects.filter(
-                project=self.project,
-                approver=member.user
-            )
-            
-            total = approvals.count()
-            approved_count = approvals.filter(status='approved').count()
-            rejected_count = approvals.filter(status='rejected').count()
-            pending_count = approvals.filter(status='pending').count()
-            
-            # Build example details
-            examples = []
-            for approval in approvals:
-                examples.append({
-                    'example_id': approval.example_id,
-                    'status': approval.status,
-                    'reviewed_at': approval.reviewed_at,
-                    'review_notes': approval.review_notes,
-                })
-            
-            matrix.append({
-                'approver_id': member.user.id,
+            counts = approval_counts.get(member.user_id, {})
+            total = counts.get('total', 0)
+            approved_count = counts.get('approved', 0)
+            row = {
+                'approver_id': member.user_id,
                 'approver_username': member.user.username,
                 'total_to_review': total,
                 'approved': approved_count,
-                'rejected': rejected_count,
-                'pending': pending_count,
+                'rejected': counts.get('rejected', 0),
+                'pending': counts.get('pending', 0),
                 'approval_rate': round((approved_count / total * 100), 1) if total > 0 else 0,
-                'examples': examples
-            })
+            }
+            if include_examples:
+                row['examples'] = examples_by_user.get(member.user_id, [])
+            matrix.append(row)
         
         return matrix
     
-    def get_complete_matrix(self):
+    def annotator_examples(self, annotator_id=None, offset=0, limit=None):
+        """
+        Per-example annotator detail, streamed in chunks.
+        
+        Completions for each chunk are fetched with one query and keyed in a
+        dict by (example_id, annotator_id).
+        
+        Yields:
+            {'annotator_id', 'example_id', 'assignment_id', 'status',
+             'is_completed', 'completed_at', 'started_at', 'submitted_at'}
+        """
+        from .models_separate import Assignment
+        
+        assignments = Assignment.objects.filter(
+            project=self.project,
+            is_active=True,
+            assigned_to__isnull=False
+        )
+        if annotator_id:
+            assignments = assignments.filter(assigned_to_id=annotator_id)
+        assignments = assignments.order_by('assigned_to_id', 'example_id').values(
+            'id', 'example_id', 'assigned_to_id', 'status', 'started_at', 'submitted_at'
+        )
+        if limit is not None:
+            assignments = assignments[offset:offset + limit]
+        
+        for chunk in _chunked(assignments.iterator(chunk_size=MATRIX_CHUNK_SIZE), MATRIX_CHUNK_SIZE):
+            completions = {
+                (c['example_id'], c['annotator_id']): c
+                for c in AnnotatorCompletionStatus.objects.filter(
+                    project=self.project,
+                    example_id__in={a['example_id'] for a in chunk},
+                    annotator_id__in={a['assigned_to_id'] for a in chunk}
+                ).values('example_id', 'annotator_id', 'is_completed', 'completed_at')
+            }
+            for a in chunk:
+                completion = completions.get((a['example_id'], a['assigned_to_id']))
+                yield {
+                    'annotator_id': a['assigned_to_id'],
+                    'example_id': a['example_id'],
+                    'assignment_id': a['id'],
+                    'status': a['status'],
+                    'is_completed': completion['is_completed'] if completion else False,
+                    'completed_at': completion['completed_at'] if completion else None,
+                    'started_at': a['started_at'],
+                    'submitted_at': a['submitted_at'],
+                }
+    
+    def approver_examples(self, approver_id=None, offset=0, limit=None):
+        """
+        Per-example approver detail, streamed.
+        
+        Yields:
+            {'approver_id', 'example_id', 'status', 'reviewed_at', 'review_notes'}
+        """
+        approvals = ApproverCompletionStatus.objects.filter(project=self.project)
+        if approver_id:
+            approvals = approvals.filter(approver_id=approver_id)
+        approvals = approvals.order_by('approver_id', 'example_id').values(
+            'approver_id', 'example_id', 'status', 'reviewed_at', 'review_notes'
+        )
+        if limit is not None:
+            approvals = approvals[offset:offset + limit]
+        yield from approvals.iterator(chunk_size=MATRIX_CHUNK_SIZE)
+    
+    def get_complete_matrix(self, include_examples=False):
         """
         Get complete matrix with both annotators and approvers.
         This is the main view for Project Managers.
@@ -319,8 +401,8 @@ class CompletionMatrix:
         return {
             'project_id': self.project.id,
             'project_name': self.project.name,
-            'annotators': self.get_annotator_matrix(),
-            'approvers': self.get_approver_matrix(),
+            'annotators': self.get_annotator_matrix(include_examples),
+            'approvers': self.get_approver_matrix(include_examples),
             'summary': self._get_summary_stats()
         }
     
@@ -399,42 +481,44 @@ class CompletionMatrixUpdater:
     @staticmethod
     def update_annotator_status(example, annotator, is_completed=True):
         """
-        Update or create annotator completion status.
+        Upsert annotator completion status.
         
         Args:
             example: Example instance
             annotator: User instance (can be None, in which case this is a no-op)
             is_completed: Boolean
         """
-        from examples.models import Example
+        from .upserts import upsert_annotator_statuses
+        from .comprehensive_example_api import count_annotations
+        from .completion_view import mark_project_dirty
         
         # Skip if annotator is None (assignment has no assigned user)
         if annotator is None:
             return None
         
-        # Get or create completion status
-        status, created = AnnotatorCompletionStatus.objects.get_or_create(
+        status = AnnotatorCompletionStatus(
             example=example,
+            project_id=example.project_id,
             annotator=annotator,
-            defaults={
-                'project': example.project,
-                'is_completed': is_completed
-            }
+            is_completed=is_completed
         )
-        
-        if not created and is_completed:
+        if is_completed:
             # Count annotations for this example by this annotator
-            annotation_count = example.annotations.filter(user=annotator).count()
-            status.mark_complete(annotation_count=annotation_count)
-        elif not created and not is_completed:
-            status.mark_incomplete()
+            status.completed_at = timezone.now()
+            status.annotation_count = count_annotations(example, user=annotator)
+            update_fields = ['is_completed', 'completed_at', 'annotation_count']
+        else:
+            update_fields = ['is_completed', 'completed_at']
         
+        upsert_annotator_statuses([status], update_fields)
+        # Upserts send no post_save: mark the completion view explicitly
+        mark_project_dirty(example.project_id)
         return status
     
     @staticmethod
     def update_approver_status(example, approver, status_choice, notes=''):
         """
-        Update or create approver completion status.
+        Upsert approver completion status.
         
         Args:
             example: Example instance
@@ -442,21 +526,44 @@ class CompletionMatrixUpdater:
             status_choice: 'approved', 'rejected', or 'pending'
             notes: Review notes
         """
-        status, created = ApproverCompletionStatus.objects.get_or_create(
+        from .rollups import example_review_status, record_review
+        from .upserts import upsert_approver_statuses, REVIEW_FIELDS
+        from .activity_events import record_review_events
+        from .completion_view import mark_project_dirty
+        
+        # Capture state before the write so the rollups can apply a delta
+        previous_status = ApproverCompletionStatus.objects.filter(
+            example=example,
+            approver=approver
+        ).values_list('status', flat=True).first()
+        example_status_before = example_review_status(example.id)
+        
+        status = ApproverCompletionStatus(
             example=example,
+            project_id=example.project_id,
             approver=approver,
-            defaults={
-                'project': example.project,
-                'status': status_choice,
-                'review_notes': notes
-            }
+            status=status_choice,
+            review_notes=notes
         )
+        if status_choice in ('approved', 'rejected'):
+            status.reviewed_at = timezone.now()
+            upsert_approver_statuses([status], REVIEW_FIELDS)
+        else:
+            # 'pending' never overwrites an existing review
+            upsert_approver_statuses([status], update_fields=None)
+            if previous_status:
+                status.status = previous_status
+        mark_project_dirty(example.project_id)
         
-        if not created:
-            if status_choice == 'approved':
-                status.approve(notes)
-            elif status_choice == 'rejected':
-                status.reject(notes)
+        try:
+            # Savepoint: callers (tracking approve/reject) run this inside their own atomic block
+            with transaction.atomic():
+                record_review(example, approver, previous_status, status.status, example_status_before)
+        except Exception as e:
+            print(f'[Monlam Rollup] ⚠️ Could not record review: {e}')
+        
+        if status_choice in ('approved', 'rejected'):
+            record_review_events(example.project_id, approver.id, [example.id], status_choice, status.reviewed_at)
         
         return status
     
@@ -466,34 +573,88 @@ class CompletionMatrixUpdater:
         Sync completion tracking from existing assignments.
         Useful for migrating existing data.
         
+        Writes are upserts: one statement per batch of annotator rows and a
+        few per (approver, status) group, instead of one per assignment.
+        
         Args:
             project: Project instance
         """
         from .models_separate import Assignment
+        from .rollups import example_review_statuses, record_reviews
+        from .upserts import upsert_annotator_statuses, upsert_approver_statuses, REVIEW_FIELDS
+        from .completion_view import mark_project_dirty
+        from .activity_events import REVIEW_EVENTS, record_events
         
-        assignments = Assignment.objects.filter(project=project, is_active=True)
+        now = timezone.now()
+        assignments = Assignment.objects.filter(project=project, is_active=True).values(
+            'example_id', 'assigned_to_id', 'status', 'submitted_at',
+            'reviewed_by_id', 'reviewed_at', 'review_notes'
+        )
         
-        for assignment in assignments:
-            # Update annotator status (skip if assigned_to is None)
-            if assignment.status in ['submitted', 'approved'] and assignment.assigned_to:
-                CompletionMatrixUpdater.update_annotator_status(
-                    example=assignment.example,
-                    annotator=assignment.assigned_to,
-                    is_completed=True
+        annotator_rows = {}
+        reviews = {}
+        for a in assignments.iterator(chunk_size=2000):
+            # Annotator status (skip if assigned_to is None)
+            if a['status'] in ['submitted', 'approved'] and a['assigned_to_id']:
+                annotator_rows[(a['example_id'], a['assigned_to_id'])] = AnnotatorCompletionStatus(
+                    example_id=a['example_id'],
+                    project=project,
+                    annotator_id=a['assigned_to_id'],
+                    is_completed=True,
+                    completed_at=a['submitted_at'] or now
                 )
             
-            # Update approver status if reviewed
-            if assignment.reviewed_by:
-                status_map = {
-                    'approved': 'approved',
-                    'rejected': 'rejected'
-                }
-                status = status_map.get(assignment.status, 'pending')
-                
-                CompletionMatrixUpdater.update_approver_status(
-                    example=assignment.example,
-                    approver=assignment.reviewed_by,
-                    status_choice=status,
-                    notes=assignment.review_notes
+            # Approver status if reviewed
+            if a['reviewed_by_id']:
+                status = a['status'] if a['status'] in ('approved', 'rejected') else 'pending'
+                # One row per example per statement (ON CONFLICT cannot touch a row twice)
+                reviews.setdefault((a['reviewed_by_id'], status), {})[a['example_id']] = a
+        
+        upsert_annotator_statuses(list(annotator_rows.values()), ['is_completed', 'completed_at'])
+        mark_project_dirty(project.id)
+        
+        for (approver_id, status_choice), by_example in reviews.items():
+            rows = list(by_example.values())
+            example_ids = list(by_example)
+            previous = dict(ApproverCompletionStatus.objects.filter(
+                approver_id=approver_id,
+                example_id__in=example_ids
+            ).values_list('example_id', 'status'))
+            statuses_before = example_review_statuses(example_ids)
+            
+            upsert_approver_statuses([
+                ApproverCompletionStatus(
+                    example_id=a['example_id'],
+                    project=project,
+                    approver_id=approver_id,
+                    status=status_choice,
+                    reviewed_at=(a['reviewed_at'] or now) if status_choice != 'pending' else None,
+                    review_notes=a['review_notes'] or ''
                 )
+                for a in rows
+            ], REVIEW_FIELDS if status_choice != 'pending' else None)
+            
+            if status_choice == 'pending':
+                continue
+            try:
+                with transaction.atomic():
+                    record_reviews(
+                        project.id,
+                        User(pk=approver_id),
+                        {example_id: previous.get(example_id) for example_id in example_ids},
+                        status_choice,
+                        statuses_before,
+                        example_review_statuses(example_ids),
+                        when=now
+                    )
+            except Exception as e:
+                print(f'[Monlam Rollup] ⚠️ Could not record synced reviews: {e}')
+            
+            try:
+                with transaction.atomic():
+                    record_events(REVIEW_EVENTS[status_choice], project.id, [
+                        (a['example_id'], approver_id, a['reviewed_at'] or now) for a in rows
+                    ])
+            except Exception as e:
+                print(f'[Monlam Activity] ⚠️ Could not record synced review events: {e}')
 
@@ -0,0 +1,233 @@
+"""
+Materialized Completion View
+
+example_completion_comprehensive (see create_completion_view.sql) as a
+MATERIALIZED VIEW, created by migration 0013 (which holds the view's SQL;
+a change to the view needs a new migration) with a unique index on
+example_id so it can be refreshed with REFRESH ... CONCURRENTLY (readers
+are never blocked).
+
+PostgreSQL can only refresh the whole view, so "incremental" here means
+the view is refreshed only when something changed:
+
+- CompletionViewDirtyProject holds one row per project with changes since
+  the last refresh (marked by post_save/post_delete receivers and by the
+  bulk writers that bypass signals)
+- refresh_completion_view() is a no-op while no project is dirty; it
+  deletes the marks it takes before REFRESH starts, so any change
+  committed later leaves a fresh mark for the next run
+- refresh_completion_view_task runs on the Celery beat schedule registered
+  by register_beat_schedule() (the Dockerfile runs the worker with -B)
+
+ExampleCompletionSummary is an unmanaged model over the view, so APIs can
+query it with plain filters:
+
+    ExampleCompletionSummary.objects.filter(project_id=1, overall_status='approved')
+"""
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+VIEW_NAME = 'example_completion_comprehensive'
+
+_DEFAULT_REFRESH_SECONDS = 5 * 60
+_DEFAULT_FORCED_REFRESH_SECONDS = 60 * 60
+
+
+class ExampleCompletionSummary(models.Model):
+    """Read-only row of the materialized completion view (one per example)."""
+    example = models.OneToOneField(
+        'examples.Example',
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_column='example_id',
+        related_name='completion_summary'
+    )
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.DO_NOTHING,
+        db_column='project_id',
+        related_name='+'
+    )
+    uuid = models.UUIDField()
+    filename = models.CharField(max_length=1024, null=True)
+    example_created_at = models.DateTimeField()
+    example_updated_at = models.DateTimeField()
+
+    assignment_id = models.BigIntegerField(null=True)
+    assigned_annotator_id = models.IntegerField(null=True)
+    assigned_annotator_username = models.CharField(max_length=150, null=True)
+    assignment_status = models.CharField(max_length=20, null=True)
+    assigned_at = models.DateTimeField(null=True)
+    started_at = models.DateTimeField(null=True)
+    submitted_at = models.DateTimeField(null=True)
+
+    total_annotators = models.IntegerField()
+    completed_by_annotators = models.IntegerField()
+    total_approvers = models.IntegerField()
+    approved_by_approvers = models.IntegerField()
+    rejected_by_approvers = models.IntegerField()
+    pending_approvers = models.IntegerField()
+    overall_status = models.CharField(max_length=20)
+
+    last_completed_at = models.DateTimeField(null=True)
+    last_reviewed_at = models.DateTimeField(null=True)
+    annotation_count = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = VIEW_NAME
+
+    def __str__(self):
+        return f"Completion summary for Example {self.example_id}: {self.overall_status}"
+
+
+class CompletionViewDirtyProject(models.Model):
+    """A project whose data changed since the completion view was last refreshed."""
+    project = models.OneToOneField(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='completion_view_dirty'
+    )
+    marked_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'assignment_completion_view_dirty'
+
+    def __str__(self):
+        return f"Completion view dirty for Project {self.project_id} since {self.marked_at}"
+
+
+def view_available():
+    """True on PostgreSQL (the only backend the migration creates the view on)."""
+    return connection.vendor == 'postgresql'
+
+
+def mark_projects_dirty(project_ids):
+    """
+    Flag projects for the next refresh (one INSERT ... ON CONFLICT DO UPDATE
+    of marked_at: the row lock makes a concurrent refresh wait for the
+    marking transaction before it takes the mark).
+    """
+    from .upserts import upsert
+
+    project_ids = {pid for pid in project_ids if pid}
+    if not project_ids:
+        return
+    now = timezone.now()
+    # Savepoint: callers mark inside their own transactions (bulk review, sync)
+    try:
+        with transaction.atomic():
+            upsert(
+                CompletionViewDirtyProject,
+                [CompletionViewDirtyProject(project_id=pid, marked_at=now) for pid in project_ids],
+                ['project'],
+                ['marked_at']
+            )
+    except Exception as e:
+        print(f'[Monlam Completion View] ⚠️ Could not mark projects dirty: {e}')
+
+
+def mark_project_dirty(project_id):
+    mark_projects_dirty([project_id])
+
+
+def refresh_completion_view(force=False):
+    """
+    Refresh the materialized view if any project is dirty (or force=True).
+
+    Returns:
+        {'refreshed': bool, 'projects': [...], 'elapsed_seconds': float}
+    """
+    import time
+
+    if not view_available():
+        return {'refreshed': False, 'reason': 'not postgresql'}
+
+    dirty = list(CompletionViewDirtyProject.objects.values_list('project_id', flat=True))
+    if not dirty and not force:
+        return {'refreshed': False, 'projects': []}
+
+    # Take the marks before the REFRESH snapshot: a change committed after
+    # this DELETE re-marks its project for the next run instead of being lost
+    with transaction.atomic():
+        CompletionViewDirtyProject.objects.filter(project_id__in=dirty).delete()
+
+    started = time.monotonic()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {VIEW_NAME}')
+    except Exception:
+        mark_projects_dirty(dirty)
+        raise
+
+    elapsed = round(time.monotonic() - started, 3)
+    print(f'[Monlam Completion View] ✅ Refreshed in {elapsed}s (dirty projects: {dirty})')
+    return {'refreshed': True, 'projects': dirty, 'elapsed_seconds': elapsed}
+
+
+# ============================================================================
+# Signals / schedule
+# ============================================================================
+
+def _project_id_of(instance):
+    project_id = getattr(instance, 'project_id', None)
+    if project_id is None and getattr(instance, 'example_id', None):
+        from examples.models import Example
+        project_id = Example.objects.filter(pk=instance.example_id).values_list('project_id', flat=True).first()
+    return project_id
+
+
+def _row_changed(sender, instance, **kwargs):
+    mark_project_dirty(_project_id_of(instance))
+
+
+def connect_completion_view_signals():
+    """
+    Mark projects dirty when rows feeding the view change (labels feed
+    annotation_count). Writers that bypass signals (upserts, bulk_create,
+    bulk_update) call mark_project(s)_dirty themselves.
+    """
+    from django.db.models.signals import post_save, post_delete
+    from examples.models import Example
+    from labels.models import Category, Span, TextLabel
+    from .models_separate import Assignment
+    from .completion_tracking import AnnotatorCompletionStatus, ApproverCompletionStatus
+
+    for model in (
+        Example, Assignment, AnnotatorCompletionStatus, ApproverCompletionStatus,
+        Category, Span, TextLabel,
+    ):
+        post_save.connect(
+            _row_changed,
+            sender=model,
+            dispatch_uid=f'monlam_completion_view_{model.__name__}_saved'
+        )
+        post_delete.connect(
+            _row_changed,
+            sender=model,
+            dispatch_uid=f'monlam_completion_view_{model.__name__}_deleted'
+        )
+
+
+def register_beat_schedule():
+    """
+    Add the refresh tasks to Celery beat: dirty-only every
+    settings.MONLAM_COMPLETION_VIEW_REFRESH_SECONDS (default 5 min) and a
+    forced refresh every MONLAM_COMPLETION_VIEW_FORCED_REFRESH_SECONDS
+    (default 1 h) to catch bulk writes that bypass the dirty marks.
+    """
+    from celery import current_app
+
+    schedule = current_app.conf.beat_schedule or {}
+    schedule.setdefault('monlam-refresh-completion-view', {
+        'task': 'assignment.celery_tasks.refresh_completion_view_task',
+        'schedule': getattr(settings, 'MONLAM_COMPLETION_VIEW_REFRESH_SECONDS', _DEFAULT_REFRESH_SECONDS),
+    })
+    schedule.setdefault('monlam-refresh-completion-view-forced', {
+        'task': 'assignment.celery_tasks.refresh_completion_view_task',
+        'schedule': getattr(settings, 'MONLAM_COMPLETION_VIEW_FORCED_REFRESH_SECONDS', _DEFAULT_FORCED_REFRESH_SECONDS),
+        'kwargs': {'force': True},
+    })
+    current_app.conf.beat_schedule = schedule
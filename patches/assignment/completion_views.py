@@ -30,6 +30,7 @@ from .roles import (
     ROLE_ANNOTATION_APPROVER,
     ROLE_PROJECT_MANAGER
 )
+from .review_eligibility import get_reviewable_example, eligibility_error
 
 
 class CompletionMatrixViewSet(viewsets.ViewSet):
@@ -40,6 +41,7 @@ class CompletionMatrixViewSet(viewsets.ViewSet):
     - GET /projects/{project_id}/completion-matrix/ - Get full matrix (PM only)
     - GET /projects/{project_id}/completion-matrix/annotators/ - Annotator matrix
     - GET /projects/{project_id}/completion-matrix/approvers/ - Approver matrix
+    - GET /projects/{project_id}/completion-matrix/examples/ - Paginated per-example detail
     - GET /projects/{project_id}/completion-matrix/my/ - Current user's stats
     - GET /projects/{project_id}/completion-matrix/summary/ - Project summary
     - POST /projects/{project_id}/completion-matrix/sync/ - Sync from assignments
@@ -69,8 +71,10 @@ class CompletionMatrixViewSet(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        # Per-example detail is opt-in; page through examples/ for large projects
+        include_examples = request.query_params.get('include_examples', '').lower() == 'true'
         matrix = CompletionMatrix(project)
-        data = matrix.get_complete_matrix()
+        data = matrix.get_complete_matrix(include_examples=include_examples)
         
         return Response(data)
     
@@ -155,6 +159,55 @@ class CompletionMatrixViewSet(viewsets.ViewSet):
         
         return Response(data)
     
+    @action(detail=False, methods=['get'])
+    def examples(self, request, project_id):
+        """
+        Paginated per-example detail for the matrix.
+        
+        GET /projects/{project_id}/completion-matrix/examples/?type=annotator|approver&user_id=&offset=0&limit=100
+        Project Managers see everyone, approvers and annotators only themselves.
+        """
+        project = self.get_project(project_id)
+        
+        kind = request.query_params.get('type', 'annotator')
+        if kind not in ('annotator', 'approver'):
+            return Response(
+                {'error': "type must be 'annotator' or 'approver'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            user_id = int(request.query_params['user_id']) if request.query_params.get('user_id') else None
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+            limit = min(max(int(request.query_params.get('limit', 100)), 1), 1000)
+        except ValueError:
+            return Response(
+                {'error': 'user_id, offset and limit must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not ProjectManagerMixin.is_project_manager(request.user, project):
+            if user_id not in (None, request.user.id):
+                return Response(
+                    {'error': "You can only view your own examples"},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            user_id = request.user.id
+        
+        matrix = CompletionMatrix(project)
+        if kind == 'annotator':
+            rows = list(matrix.annotator_examples(user_id, offset=offset, limit=limit + 1))
+        else:
+            rows = list(matrix.approver_examples(user_id, offset=offset, limit=limit + 1))
+        
+        return Response({
+            'type': kind,
+            'offset': offset,
+            'limit': limit,
+            'has_more': len(rows) > limit,
+            'results': rows[:limit]
+        })
+    
     @action(detail=False, methods=['get'])
     def my(self, request, project_id):
         """
@@ -235,9 +288,16 @@ class CompletionMatrixViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def export(self, request, project_id):
         """
-        Export completion matrix as CSV.
+        Export completion matrix as a streamed CSV download.
         Only accessible to Project Managers and Admins.
+        
+        Query Parameters:
+        - gzip: 'true' to download completion_matrix_{id}.csv.gz
+        - as_json: 'true' for the legacy {'csv_data': [[...]], 'filename'} response
+          (builds the whole export in memory; avoid on large projects)
         """
+        from .csv_streaming import stream_csv, wants_gzip
+        
         project = self.get_project(project_id)
         
         # Check permission
@@ -247,56 +307,62 @@ class CompletionMatrixViewSet(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        matrix = CompletionMatrix(project)
-        data = matrix.get_complete_matrix()
+        rows = self._iter_csv_rows(CompletionMatrix(project))
         
-        # Format as CSV-friendly data
-        csv_data = self._format_for_csv(data)
+        if request.query_params.get('as_json', '').lower() == 'true':
+            return Response({
+                'csv_data': list(rows),
+                'filename': f'completion_matrix_{project.id}.csv'
+            })
         
-        return Response({
-            'csv_data': csv_data,
-            'filename': f'completion_matrix_{project.id}.csv'
-        })
+        return stream_csv(rows, f'completion_matrix_{project.id}', gzip=wants_gzip(request))
     
-    def _format_for_csv(self, matrix_data):
+    def _iter_csv_rows(self, matrix):
         """
-        Format matrix data for CSV export.
+        Yield completion matrix CSV rows (header first).
+        
+        Rows come from the chunked per-example iterators, so nothing beyond
+        the current chunk and the username map is held in memory.
         """
-        rows = []
+        from django.contrib.auth import get_user_model
+        from .models_separate import Assignment
+        
+        usernames = dict(
+            get_user_model().objects.filter(
+                Q(id__in=Assignment.objects.filter(project=matrix.project).values('assigned_to_id')) |
+                Q(id__in=ApproverCompletionStatus.objects.filter(project=matrix.project).values('approver_id'))
+            ).values_list('id', 'username')
+        )
         
         # Header
-        rows.append([
+        yield [
             'Type', 'User ID', 'Username', 'Example ID',
             'Status', 'Completed/Reviewed At', 'Notes'
-        ])
+        ]
         
         # Annotator rows
-        for annotator in matrix_data.get('annotators', []):
-            for example in annotator.get('examples', []):
-                rows.append([
-                    'Annotator',
-                    annotator['annotator_id'],
-                    annotator['annotator_username'],
-                    example['example_id'],
-                    example['status'],
-                    example.get('completed_at', ''),
-                    ''
-                ])
+        for example in matrix.annotator_examples():
+            yield [
+                'Annotator',
+                example['annotator_id'],
+                usernames.get(example['annotator_id'], ''),
+                example['example_id'],
+                example['status'],
+                example['completed_at'] or '',
+                ''
+            ]
         
         # Approver rows
-        for approver in matrix_data.get('approvers', []):
-            for example in approver.get('examples', []):
-                rows.append([
-                    'Approver',
-                    approver['approver_id'],
-                    approver['approver_username'],
-                    example['example_id'],
-                    example['status'],
-                    example.get('reviewed_at', ''),
-                    example.get('review_notes', '')
-                ])
-        
-        return rows
+        for example in matrix.approver_examples():
+            yield [
+                'Approver',
+                example['approver_id'],
+                usernames.get(example['approver_id'], ''),
+                example['example_id'],
+                example['status'],
+                example['reviewed_at'] or '',
+                example['review_notes'] or ''
+            ]
 
 
 class AnnotatorCompletionViewSet(viewsets.ViewSet):
@@ -410,14 +476,11 @@ class ApproverCompletionViewSet(viewsets.ViewSet):
     
     def _get_user_role(self, user, project):
         """Get user's role in the project."""
-        from projects.models import Member
+        from .role_service import get_role_name
         try:
-            member = Member.objects.filter(user=user, project=project).select_related('role').first()
-            if member and member.role:
-                return member.role.name.lower() if member.role.name else None
+            return get_role_name(user, project)
         except Exception:
-            pass
-        return None
+            return None
     
     def retrieve(self, request, project_id, example_id):
         """
@@ -506,11 +569,8 @@ class ApproverCompletionViewSet(viewsets.ViewSet):
                 state = ExampleState.objects.filter(example=example).first()
                 if state and state.confirmed_by:
                     # Verify confirmed_by is still a project member
-                    from projects.models import Member
-                    is_member = Member.objects.filter(
-                        user=state.confirmed_by,
-                        project=project
-                    ).exists()
+                    from .role_service import is_project_member
+                    is_member = is_project_member(state.confirmed_by, project)
                     if is_member or state.confirmed_by.is_superuser:
                         is_submitted = True
         
@@ -550,85 +610,17 @@ class ApproverCompletionViewSet(viewsets.ViewSet):
         - Each approver maintains their own approval record.
         Requires approver or higher role.
         """
-        from examples.models import Example
-        
         project = self.get_project(project_id)
-        example = get_object_or_404(Example, pk=example_id, project=project)
+        example = get_reviewable_example(project, example_id)
+        if example is None:
+            return Response({'error': 'Example not found'}, status=status.HTTP_404_NOT_FOUND)
         
         # Get user's role
         user_role = self._get_user_role(request.user, project)
         
-        # Check if example is submitted or confirmed (for annotation_approvers)
-        if user_role == ROLE_ANNOTATION_APPROVER:
-            # Check if example has been submitted or confirmed
-            is_submitted = False
-            
-            # Check AnnotationTracking status
-            from .simple_tracking import AnnotationTracking
-            tracking = AnnotationTracking.objects.filter(
-                project=project,
-                example=example
-            ).first()
-            
-            if tracking and tracking.status == 'submitted':
-                is_submitted = True
-            else:
-                # Also check Assignment status as fallback
-                from .models_separate import Assignment
-                assignment = Assignment.objects.filter(
-                    project=project,
-                    example=example,
-                    is_active=True
-                ).first()
-                
-                if assignment and assignment.status == 'submitted':
-                    is_submitted = True
-                else:
-                    # Also check ExampleState (confirmed via checkmark)
-                    from examples.models import ExampleState
-                    state = ExampleState.objects.filter(example=example).first()
-                    if state and state.confirmed_by:
-                        # Verify confirmed_by is still a project member
-                        from projects.models import Member
-                        is_member = Member.objects.filter(
-                            user=state.confirmed_by,
-                            project=project
-                        ).exists()
-                        if is_member or state.confirmed_by.is_superuser:
-                            is_submitted = True
-            
-            if not is_submitted:
-                return Response(
-                    {
-                        'error': 'Annotation approvers can only approve examples that have been submitted or confirmed by annotators.',
-                        'requires_submission': True
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        
-        # If user is project_admin, check if annotation_approver has approved
-        if user_role == ROLE_PROJECT_ADMIN:
-            # Get all approvals for this example
-            all_approvals = ApproverCompletionStatus.objects.filter(
-                example=example
-            ).select_related('approver').defer('assignment')
-            
-            # Check if any annotation_approver has approved
-            annotation_approver_approved = False
-            for ap in all_approvals:
-                approver_role = self._get_user_role(ap.approver, project)
-                if approver_role == ROLE_ANNOTATION_APPROVER and ap.status == 'approved':
-                    annotation_approver_approved = True
-                    break
-            
-            if not annotation_approver_approved:
-                return Response(
-                    {
-                        'error': 'Project admins can only approve examples that have been approved by an annotation approver first.',
-                        'requires_approver_approval': True
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
+        error = eligibility_error(example, user_role, 'approve')
+        if error:
+            return Response(error, status=status.HTTP_403_FORBIDDEN)
         
         notes = request.data.get('notes', '') or request.data.get('review_notes', '')
         
@@ -659,85 +651,17 @@ class ApproverCompletionViewSet(viewsets.ViewSet):
         - Each approver maintains their own approval record.
         Requires approver or higher role.
         """
-        from examples.models import Example
-        
         project = self.get_project(project_id)
-        example = get_object_or_404(Example, pk=example_id, project=project)
+        example = get_reviewable_example(project, example_id)
+        if example is None:
+            return Response({'error': 'Example not found'}, status=status.HTTP_404_NOT_FOUND)
         
         # Get user's role
         user_role = self._get_user_role(request.user, project)
         
-        # Check if example is submitted or confirmed (for annotation_approvers)
-        if user_role == ROLE_ANNOTATION_APPROVER:
-            # Check if example has been submitted or confirmed
-            is_submitted = False
-            
-            # Check AnnotationTracking status
-            from .simple_tracking import AnnotationTracking
-            tracking = AnnotationTracking.objects.filter(
-                project=project,
-                example=example
-            ).first()
-            
-            if tracking and tracking.status == 'submitted':
-                is_submitted = True
-            else:
-                # Also check Assignment status as fallback
-                from .models_separate import Assignment
-                assignment = Assignment.objects.filter(
-                    project=project,
-                    example=example,
-                    is_active=True
-                ).first()
-                
-                if assignment and assignment.status == 'submitted':
-                    is_submitted = True
-                else:
-                    # Also check ExampleState (confirmed via checkmark)
-                    from examples.models import ExampleState
-                    state = ExampleState.objects.filter(example=example).first()
-                    if state and state.confirmed_by:
-                        # Verify confirmed_by is still a project member
-                        from projects.models import Member
-                        is_member = Member.objects.filter(
-                            user=state.confirmed_by,
-                            project=project
-                        ).exists()
-                        if is_member or state.confirmed_by.is_superuser:
-                            is_submitted = True
-            
-            if not is_submitted:
-                return Response(
-                    {
-                        'error': 'Annotation approvers can only reject examples that have been submitted or confirmed by annotators.',
-                        'requires_submission': True
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        
-        # If user is project_admin, check if annotation_approver has approved
-        if user_role == ROLE_PROJECT_ADMIN:
-            # Get all approvals for this example
-            all_approvals = ApproverCompletionStatus.objects.filter(
-                example=example
-            ).select_related('approver').defer('assignment')
-            
-            # Check if any annotation_approver has approved
-            annotation_approver_approved = False
-            for ap in all_approvals:
-                approver_role = self._get_user_role(ap.approver, project)
-                if approver_role == ROLE_ANNOTATION_APPROVER and ap.status == 'approved':
-                    annotation_approver_approved = True
-                    break
-            
-            if not annotation_approver_approved:
-                return Response(
-                    {
-                        'error': 'Project admins can only reject examples that have been approved by an annotation approver first.',
-                        'requires_approver_approval': True
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
+        error = eligibility_error(example, user_role, 'reject')
+        if error:
+            return Response(error, status=status.HTTP_403_FORBIDDEN)
         
         notes = request.data.get('notes', '') or request.data.get('review_notes', '')
         
@@ -770,11 +694,12 @@ class ApproverCompletionViewSet(viewsets.ViewSet):
         Query params:
         - current_example_id: Current example ID (optional, for "next" navigation)
         - direction: 'next' or 'prev' (default: 'next')
+        - exact_counts: 'true' to COUNT the queue instead of using rollup estimates
+        
+        The next example is a single keyset query (see review_queue); counts are
+        approximate unless exact_counts is set or the project's rollups are not built yet.
         """
-        from examples.models import Example
-        from .simple_tracking import AnnotationTracking
-        from examples.models import ExampleState
-        from projects.models import Member
+        from .review_queue import review_queue, unreviewed_by, step, approximate_counts
         
         project = self.get_project(project_id)
         user = request.user
@@ -798,106 +723,49 @@ class ApproverCompletionViewSet(viewsets.ViewSet):
             current_example_id = None
         
         direction = request.query_params.get('direction', 'next')
+        exact_counts = request.query_params.get('exact_counts', '').lower() in ('1', 'true', 'yes')
         
-        # Get all submitted examples (status='submitted' in AnnotationTracking or ExampleState exists)
-        # Get examples with ExampleState (confirmed/submitted)
-        confirmed_examples = ExampleState.objects.filter(
-            example__project=project,
-            confirmed_by__isnull=False
-        ).select_related('example').values_list('example_id', flat=True)
-        
-        # Get tracking records for submitted examples
-        submitted_tracking = AnnotationTracking.objects.filter(
-            project=project,
-            status='submitted'
-        ).values_list('example_id', flat=True)
-        
-        # Combine: submitted = confirmed OR tracking status='submitted'
-        all_submitted_ids = set(confirmed_examples) | set(submitted_tracking)
-        
-        # Filter based on role requirements
-        if user_role == ROLE_PROJECT_ADMIN:
-            # Project admin can only review if annotation_approver has approved
-            # Get all annotation_approvers in the project
-            approver_members = Member.objects.filter(
-                project=project
-            ).select_related('role', 'user').filter(
-                role__name__iexact=ROLE_ANNOTATION_APPROVER
-            )
-            approver_users = [m.user for m in approver_members]
-            
-            # Get examples approved by annotation_approvers
-            approver_approved_ids = ApproverCompletionStatus.objects.filter(
-                project=project,
-                approver__in=approver_users,
-                status='approved'
-            ).values_list('example_id', flat=True).distinct()
-            
-            submitted_examples = list(all_submitted_ids & set(approver_approved_ids))
-        elif user_role == ROLE_ANNOTATION_APPROVER:
-            # Annotation approver can review any submitted example
-            submitted_examples = list(all_submitted_ids)
-        elif user_role == ROLE_PROJECT_MANAGER:
-            # Project manager can review any submitted example
-            submitted_examples = list(all_submitted_ids)
-        else:
-            # Other roles - return empty
-            submitted_examples = []
-        
-        if not submitted_examples:
+        # Role rules: project_admin only sees approver-approved examples,
+        # approvers/managers see every submitted example, others nothing
+        queue = review_queue(project, user_role)
+        if queue is None:
             return Response({
                 'next_example_id': None,
                 'message': 'No examples available for review'
             })
         
-        # Get examples that current user hasn't reviewed yet
-        reviewed_by_user = ApproverCompletionStatus.objects.filter(
-            project=project,
-            approver=user,
-            example_id__in=submitted_examples
-        ).values_list('example_id', flat=True)
-        
-        unreviewed_examples = [eid for eid in submitted_examples if eid not in reviewed_by_user]
-        
-        # If all submitted examples have been reviewed, show all submitted (for re-review)
-        if not unreviewed_examples:
-            unreviewed_examples = submitted_examples
-        
-        # Sort by example ID
-        unreviewed_examples = sorted(unreviewed_examples)
+        # Prefer examples the current user hasn't reviewed yet;
+        # if all have been reviewed, cycle through the whole queue (re-review)
+        unreviewed = unreviewed_by(queue, user)
+        next_example_id = step(unreviewed, current_example_id, direction)
+        re_review = next_example_id is None
+        if re_review:
+            next_example_id = step(queue, current_example_id, direction)
         
-        if not unreviewed_examples:
+        if next_example_id is None:
             return Response({
                 'next_example_id': None,
                 'message': 'No examples available for review'
             })
         
-        # Find next example
-        if current_example_id:
-            if direction == 'next':
-                # Find next example after current
-                next_examples = [eid for eid in unreviewed_examples if eid > current_example_id]
-                if next_examples:
-                    next_example_id = next_examples[0]
-                else:
-                    # Cycle back to first
-                    next_example_id = unreviewed_examples[0]
-            else:  # prev
-                # Find previous example before current
-                prev_examples = [eid for eid in unreviewed_examples if eid < current_example_id]
-                if prev_examples:
-                    next_example_id = prev_examples[-1]
-                else:
-                    # Cycle to last
-                    next_example_id = unreviewed_examples[-1]
+        approx = None if exact_counts else approximate_counts(project, user, user_role)
+        if approx is not None:
+            total_submitted, reviewed_count = approx
+            total_unreviewed = total_submitted if re_review else max(total_submitted - reviewed_count, 0)
+            # Both branches index into the active set (total_unreviewed); its
+            # position is unknown without counting, so report the head of it
+            current_index = 1 if total_unreviewed else None
         else:
-            # No current example - return first unreviewed
-            next_example_id = unreviewed_examples[0]
+            active = queue if re_review else unreviewed
+            total_submitted = queue.count()
+            total_unreviewed = active.count()
+            current_index = active.filter(id__lte=next_example_id).count()
         
         return Response({
             'next_example_id': next_example_id,
-            'total_unreviewed': len(unreviewed_examples),
-            'total_submitted': len(submitted_examples),
-            'current_index': unreviewed_examples.index(next_example_id) + 1 if next_example_id in unreviewed_examples else None
+            'total_unreviewed': total_unreviewed,
+            'total_submitted': total_submitted,
+            'current_index': current_index,
+            'counts_approximate': approx is not None
         })
 
@@ -14,9 +14,62 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q, Max, Case, When, Value, CharField, F
+from django.db.models import (
+    Count, Max, Case, When, Value, CharField, IntegerField, Exists, OuterRef, Subquery
+)
 from django.db.models.functions import Coalesce
 
+EXPORT_CHUNK_SIZE = 2000
+
+# Doccano label tables counted in annotation_count (Example reverse relations)
+ANNOTATION_RELATIONS = ['categories', 'spans', 'texts', 'bboxes', 'segmentations']
+
+
+def _count_subquery(queryset):
+    """COUNT(*) of a correlated queryset as an integer annotation (0 when empty)."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values('example_id').annotate(n=Count('*')).values('n')[:1],
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def _max_subquery(queryset, field):
+    return Subquery(
+        queryset.order_by().values('example_id').annotate(m=Max(field)).values('m')[:1]
+    )
+
+
+def _annotation_count(example_model, user=None):
+    """
+    Sum of per-table label counts for the label tables present in this
+    Doccano build (only the given user's labels if user is set).
+    """
+    from django.core.exceptions import FieldDoesNotExist
+    
+    total = None
+    for name in ANNOTATION_RELATIONS:
+        try:
+            relation = example_model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        labels = relation.related_model.objects.filter(example_id=OuterRef('pk'))
+        if user is not None:
+            labels = labels.filter(user=user)
+        count = _count_subquery(labels)
+        total = count if total is None else total + count
+    return total if total is not None else Value(0, output_field=IntegerField())
+
+
+def count_annotations(example, user=None):
+    """Labels on one example across the label tables (one query)."""
+    example_model = type(example)
+    return example_model.objects.filter(pk=example.pk).annotate(
+        n=_annotation_count(example_model, user=user)
+    ).values_list('n', flat=True).first() or 0
+
 
 class ComprehensiveExampleViewSet(viewsets.ViewSet):
     """
@@ -40,7 +93,10 @@ class ComprehensiveExampleViewSet(viewsets.ViewSet):
     def get_comprehensive_queryset(self, project):
         """
         Build a queryset that includes all completion metrics.
-        This uses Django ORM to efficiently join all related data.
+        
+        Every metric is a correlated Subquery / Exists on the example row,
+        so there is no fan-out join and no GROUP BY over example columns:
+        one output row per example, cheap to page through by id.
         """
         from examples.models import Example
         from assignment.models_separate import Assignment
@@ -49,62 +105,47 @@ class ComprehensiveExampleViewSet(viewsets.ViewSet):
             ApproverCompletionStatus
         )
         
-        queryset = Example.objects.filter(project=project)
+        active_assignment = Assignment.objects.filter(
+            example_id=OuterRef('pk'),
+            is_active=True
+        ).order_by('-assigned_at')
+        annotator_completions = AnnotatorCompletionStatus.objects.filter(example_id=OuterRef('pk'))
+        approver_completions = ApproverCompletionStatus.objects.filter(example_id=OuterRef('pk'))
         
-        # Annotate with assignment info
-        queryset = queryset.select_related('project').annotate(
-            # Assignment data
-            assignment_id=F('assignments__id'),
-            assignment_status=F('assignments__status'),
-            assigned_to_id=F('assignments__assigned_to_id'),
-            assigned_to_username=F('assignments__assigned_to__username'),
-            assigned_at=F('assignments__assigned_at'),
-            started_at=F('assignments__started_at'),
-            submitted_at=F('assignments__submitted_at'),
+        queryset = Example.objects.filter(project=project).select_related('project').annotate(
+            # Assignment data (the active assignment)
+            assignment_id=Subquery(active_assignment.values('id')[:1]),
+            assignment_status=Subquery(active_assignment.values('status')[:1]),
+            assigned_to_id=Subquery(active_assignment.values('assigned_to_id')[:1]),
+            assigned_to_username=Subquery(active_assignment.values('assigned_to__username')[:1]),
+            assigned_at=Subquery(active_assignment.values('assigned_at')[:1]),
+            started_at=Subquery(active_assignment.values('started_at')[:1]),
+            submitted_at=Subquery(active_assignment.values('submitted_at')[:1]),
             
             # Annotator completion aggregates
-            total_annotators=Count(
-                'annotator_completions',
-                distinct=True
-            ),
-            completed_by_annotators=Count(
-                'annotator_completions',
-                filter=Q(annotator_completions__is_completed=True),
-                distinct=True
-            ),
+            total_annotators=_count_subquery(annotator_completions),
+            completed_by_annotators=_count_subquery(annotator_completions.filter(is_completed=True)),
             
             # Approver completion aggregates
-            total_approvers=Count(
-                'approver_completions',
-                distinct=True
-            ),
-            approved_by=Count(
-                'approver_completions',
-                filter=Q(approver_completions__status='approved'),
-                distinct=True
-            ),
-            rejected_by=Count(
-                'approver_completions',
-                filter=Q(approver_completions__status='rejected'),
-                distinct=True
-            ),
-            pending_approvers=Count(
-                'approver_completions',
-                filter=Q(approver_completions__status='pending'),
-                distinct=True
-            ),
+            total_approvers=_count_subquery(approver_completions),
+            approved_by=_count_subquery(approver_completions.filter(status='approved')),
+            rejected_by=_count_subquery(approver_completions.filter(status='rejected')),
+            pending_approvers=_count_subquery(approver_completions.filter(status='pending')),
             
             # Timestamps
-            last_completed_at=Max('annotator_completions__completed_at'),
-            last_reviewed_at=Max('approver_completions__reviewed_at'),
+            last_completed_at=_max_subquery(annotator_completions, 'completed_at'),
+            last_reviewed_at=_max_subquery(approver_completions, 'reviewed_at'),
             
+            # Labels across Doccano's annotation tables
+            annotation_count=_annotation_count(Example),
+        ).annotate(
             # Overall status (computed)
             overall_status=Case(
-                When(approver_completions__status='approved', then=Value('approved')),
-                When(approver_completions__status='rejected', then=Value('rejected')),
-                When(annotator_completions__is_completed=True, then=Value('completed')),
-                When(assignments__status='in_progress', then=Value('in_progress')),
-                When(assignments__status__isnull=False, then=Value('assigned')),
+                When(Exists(approver_completions.filter(status='approved')), then=Value('approved')),
+                When(Exists(approver_completions.filter(status='rejected')), then=Value('rejected')),
+                When(Exists(annotator_completions.filter(is_completed=True)), then=Value('completed')),
+                When(assignment_status='in_progress', then=Value('in_progress')),
+                When(assignment_id__isnull=False, then=Value('assigned')),
                 default=Value('unassigned'),
                 output_field=CharField()
             )
@@ -112,6 +153,56 @@ class ComprehensiveExampleViewSet(viewsets.ViewSet):
         
         return queryset
     
+    @staticmethod
+    def _rates(example):
+        """Annotator completion and approver approval rates (percent, 1 decimal)."""
+        completion_rate = 0
+        if example.total_annotators > 0:
+            completion_rate = round(
+                (example.completed_by_annotators / example.total_annotators) * 100,
+                1
+            )
+        
+        approval_rate = 0
+        if example.total_approvers > 0:
+            approval_rate = round(
+                (example.approved_by / example.total_approvers) * 100,
+                1
+            )
+        
+        return {'completion_rate': completion_rate, 'approval_rate': approval_rate}
+    
+    def _serialize(self, example):
+        """
+        List/retrieve fields shared by both endpoints, plus the
+        completion_rate / approval_rate the callers nest in their summaries.
+        """
+        return {
+            **self._rates(example),
+            
+            # Original Example data
+            'id': example.id,
+            'uuid': str(example.uuid),
+            'text': example.text,
+            'meta': example.meta,
+            'filename': example.filename,
+            'project_id': example.project_id,
+            'project_name': example.project.name,
+            'created_at': example.created_at,
+            'updated_at': example.updated_at,
+            
+            # Assignment info
+            'assignment': {
+                'id': example.assignment_id,
+                'status': example.assignment_status,
+                'assigned_to_id': example.assigned_to_id,
+                'assigned_to_username': example.assigned_to_username,
+                'assigned_at': example.assigned_at,
+                'started_at': example.started_at,
+                'submitted_at': example.submitted_at,
+            },
+        }
+    
     def list(self, request, project_id):
         """
         List all examples with comprehensive completion metrics.
@@ -119,72 +210,66 @@ class ComprehensiveExampleViewSet(viewsets.ViewSet):
         Query Parameters:
         - status: Filter by overall status (approved, rejected, completed, etc.)
         - assigned_to: Filter by assigned user ID
-        - completion_rate_min: Filter by minimum completion rate (0-100)
-        - approval_rate_min: Filter by minimum approval rate (0-100)
-        - page: Page number
-        - page_size: Results per page (default: 50)
+        - cursor: Keyset cursor (example id) from the previous page's next_cursor
+        - page_size: Results per page (default: 50, max: 500)
+        - page: Legacy OFFSET pagination (slow on deep pages; prefer cursor)
+        - source: 'view' to filter on the materialized completion view's
+          indexed columns (may lag by one refresh interval)
+        
+        `count` is only computed on the first page.
         """
+        from .completion_view import ExampleCompletionSummary, view_available
+        
         project = self.get_project(project_id)
         queryset = self.get_comprehensive_queryset(project)
         
-        # Apply filters
         status_filter = request.query_params.get('status')
-        if status_filter:
-            queryset = queryset.filter(overall_status=status_filter)
-        
         assigned_to = request.query_params.get('assigned_to')
-        if assigned_to:
-            queryset = queryset.filter(assigned_to_id=assigned_to)
+        
+        # Apply filters
+        if request.query_params.get('source') == 'view' and view_available():
+            summaries = ExampleCompletionSummary.objects.filter(project_id=project.id)
+            if status_filter:
+                summaries = summaries.filter(overall_status=status_filter)
+            if assigned_to:
+                summaries = summaries.filter(assigned_annotator_id=assigned_to)
+            if status_filter or assigned_to:
+                queryset = queryset.filter(pk__in=summaries.values('example_id'))
+        else:
+            if status_filter:
+                queryset = queryset.filter(overall_status=status_filter)
+            if assigned_to:
+                queryset = queryset.filter(assigned_to_id=assigned_to)
         
         # Pagination
-        page_size = int(request.query_params.get('page_size', 50))
-        page = int(request.query_params.get('page', 1))
-        start = (page - 1) * page_size
-        end = start + page_size
+        try:
+            page_size = min(max(int(request.query_params.get('page_size', 50)), 1), 500)
+            cursor = int(request.query_params.get('cursor') or 0)
+            page = max(int(request.query_params['page']), 1) if request.query_params.get('page') else None
+        except ValueError:
+            return Response(
+                {'error': 'cursor, page and page_size must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        total = queryset.count()
-        results = queryset[start:end]
+        queryset = queryset.order_by('id')
+        total = queryset.count() if not cursor else None
+        if page is not None and not cursor:
+            start = (page - 1) * page_size
+            results = list(queryset[start:start + page_size + 1])
+        else:
+            results = list(queryset.filter(id__gt=cursor)[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
         
         # Serialize data
         data = []
         for example in results:
-            # Calculate rates
-            completion_rate = 0
-            if example.total_annotators > 0:
-                completion_rate = round(
-                    (example.completed_by_annotators / example.total_annotators) * 100,
-                    1
-                )
-            
-            approval_rate = 0
-            if example.total_approvers > 0:
-                approval_rate = round(
-                    (example.approved_by / example.total_approvers) * 100,
-                    1
-                )
-            
+            item = self._serialize(example)
+            completion_rate = item.pop('completion_rate')
+            approval_rate = item.pop('approval_rate')
             data.append({
-                # Original Example data
-                'id': example.id,
-                'uuid': str(example.uuid),
-                'text': example.text,
-                'meta': example.meta,
-                'filename': example.filename,
-                'project_id': example.project_id,
-                'project_name': example.project.name,
-                'created_at': example.created_at,
-                'updated_at': example.updated_at,
-                
-                # Assignment info
-                'assignment': {
-                    'id': example.assignment_id,
-                    'status': example.assignment_status,
-                    'assigned_to_id': example.assigned_to_id,
-                    'assigned_to_username': example.assigned_to_username,
-                    'assigned_at': example.assigned_at,
-                    'started_at': example.started_at,
-                    'submitted_at': example.submitted_at,
-                },
+                **item,
                 
                 # Completion metrics
                 'completion_metrics': {
@@ -206,15 +291,18 @@ class ComprehensiveExampleViewSet(viewsets.ViewSet):
                 },
                 
                 # Annotation count
-                'annotation_count': example.annotations.count() if hasattr(example, 'annotations') else 0,
+                'annotation_count': example.annotation_count,
             })
         
-        return Response({
+        response = {
             'count': total,
-            'page': page,
             'page_size': page_size,
+            'next_cursor': results[-1].id if has_more and results else None,
             'results': data
-        })
+        }
+        if page is not None and not cursor:
+            response['page'] = page
+        return Response(response)
     
     def retrieve(self, request, project_id, pk):
         """
@@ -232,65 +320,37 @@ class ComprehensiveExampleViewSet(viewsets.ViewSet):
             )
         
         # Get detailed annotator completion data
-        annotator_completions = []
-        for ac in example.annotator_completions.all():
-            annotator_completions.append({
+        from assignment.completion_tracking import (
+            AnnotatorCompletionStatus,
+            ApproverCompletionStatus
+        )
+        annotator_completions = [
+            {
                 'annotator_id': ac.annotator_id,
                 'annotator_username': ac.annotator.username,
                 'is_completed': ac.is_completed,
                 'completed_at': ac.completed_at,
                 'annotation_count': ac.annotation_count,
-            })
+            }
+            for ac in AnnotatorCompletionStatus.objects.filter(example=example).select_related('annotator')
+        ]
         
         # Get detailed approver completion data
-        approver_completions = []
-        for ap in example.approver_completions.all():
-            approver_completions.append({
+        approver_completions = [
+            {
                 'approver_id': ap.approver_id,
                 'approver_username': ap.approver.username,
                 'status': ap.status,
                 'reviewed_at': ap.reviewed_at,
                 'review_notes': ap.review_notes,
-            })
+            }
+            for ap in ApproverCompletionStatus.objects.filter(example=example).select_related('approver')
+        ]
         
-        # Calculate rates
-        completion_rate = 0
-        if example.total_annotators > 0:
-            completion_rate = round(
-                (example.completed_by_annotators / example.total_annotators) * 100,
-                1
-            )
-        
-        approval_rate = 0
-        if example.total_approvers > 0:
-            approval_rate = round(
-                (example.approved_by / example.total_approvers) * 100,
-                1
-            )
-        
-        data = {
-            # Original Example data
-            'id': example.id,
-            'uuid': str(example.uuid),
-            'text': example.text,
-            'meta': example.meta,
-            'filename': example.filename,
-            'project_id': example.project_id,
-            'project_name': example.project.name,
-            'created_at': example.created_at,
-            'updated_at': example.updated_at,
-            
-            # Assignment info
-            'assignment': {
-                'id': example.assignment_id,
-                'status': example.assignment_status,
-                'assigned_to_id': example.assigned_to_id,
-                'assigned_to_username': example.assigned_to_username,
-                'assigned_at': example.assigned_at,
-                'started_at': example.started_at,
-                'submitted_at': example.submitted_at,
-            },
-            
+        data = self._serialize(example)
+        completion_rate = data.pop('completion_rate')
+        approval_rate = data.pop('approval_rate')
+        data.update({
             # Detailed completion data
             'annotator_completions': annotator_completions,
             'approver_completions': approver_completions,
@@ -311,68 +371,59 @@ class ComprehensiveExampleViewSet(viewsets.ViewSet):
             },
             
             # Annotations
-            'annotation_count': example.annotations.count() if hasattr(example, 'annotations') else 0,
-        }
+            'annotation_count': example.annotation_count,
+        })
         
         return Response(data)
     
     @action(detail=False, methods=['get'])
     def export_csv(self, request, project_id):
         """
-        Export all examples with completion metrics as CSV.
+        Export all examples with completion metrics as a streamed CSV download.
+        
+        Query Parameters:
+        - gzip: 'true' to download examples_comprehensive_{id}.csv.gz
         """
-        import csv
-        from django.http import HttpResponse
+        from .csv_streaming import stream_csv, wants_gzip
         
         project = self.get_project(project_id)
-        queryset = self.get_comprehensive_queryset(project)
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="examples_comprehensive_{project_id}.csv"'
+        queryset = self.get_comprehensive_queryset(project).order_by('id')
         
-        writer = csv.writer(response)
-        writer.writerow([
+        return stream_csv(
+            self._iter_csv_rows(project, queryset),
+            f'examples_comprehensive_{project_id}',
+            gzip=wants_gzip(request)
+        )
+    
+    def _iter_csv_rows(self, project, queryset):
+        """Yield CSV rows (header first), reading examples through a server-side cursor."""
+        yield [
             'Example ID', 'Text', 'Filename', 'Project',
             'Assignment Status', 'Assigned To', 'Assigned At',
             'Total Annotators', 'Completed By', 'Completion Rate',
             'Total Approvers', 'Approved By', 'Rejected By', 'Approval Rate',
             'Overall Status', 'Last Completed', 'Last Reviewed'
-        ])
+        ]
         
-        for example in queryset:
-            completion_rate = 0
-            if example.total_annotators > 0:
-                completion_rate = round(
-                    (example.completed_by_annotators / example.total_annotators) * 100,
-                    1
-                )
+        for example in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            rates = self._rates(example)
             
-            approval_rate = 0
-            if example.total_approvers > 0:
-                approval_rate = round(
-                    (example.approved_by / example.total_approvers) * 100,
-                    1
-                )
-            
-            writer.writerow([
+            yield [
                 example.id,
                 example.text[:100] if example.text else '',
                 example.filename or '',
-                example.project.name,
+                project.name,
                 example.assignment_status or 'unassigned',
                 example.assigned_to_username or '',
                 example.assigned_at or '',
                 example.total_annotators,
                 example.completed_by_annotators,
-                f"{completion_rate}%",
+                f"{rates['completion_rate']}%",
                 example.total_approvers,
                 example.approved_by,
                 example.rejected_by,
-                f"{approval_rate}%",
+                f"{rates['approval_rate']}%",
                 example.overall_status,
                 example.last_completed_at or '',
                 example.last_reviewed_at or '',
-            ])
-        
-        return response
-
+            ]
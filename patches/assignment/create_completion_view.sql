@@ -3,6 +3,11 @@
 -- ============================================================================
 -- This view combines examples with all completion metrics in one query
 -- NO table modifications required - completely safe!
+--
+-- NOTE: superseded by migration 0013_completion_materialized_view, which
+-- creates example_completion_comprehensive as a MATERIALIZED VIEW
+-- (assignment/completion_view.py, refreshed by refresh_completion_view_task).
+-- Kept for reference / non-migrated setups.
 -- ============================================================================
 
 CREATE OR REPLACE VIEW example_completion_comprehensive AS
@@ -0,0 +1,104 @@
+"""
+ExampleList Visibility Filters
+
+Called from the get_queryset injected into Doccano's ExampleList by
+patches/backend/patch_example_list_reviewer_filter.py.
+
+All rules are correlated EXISTS subqueries on the example row, so
+PostgreSQL plans them as (anti-)joins instead of receiving large
+`id IN (...)` lists built in Python:
+
+Annotators see examples that
+- have an active Assignment to them or to nobody
+- are not skipped by them
+- are not submitted
+
+Reviewers (approver / manager / admin / superuser) see every example,
+except in the annotation workflow ("page" param without all_examples=true)
+where they see submitted examples they haven't reviewed plus rejected ones.
+"""
+
+from django.db.models import Exists, F, OuterRef, Q
+
+
+def is_reviewer(user, project):
+    """True for superusers and approver/manager/admin members."""
+    if user.is_superuser:
+        return True
+    try:
+        from .permissions import get_user_role
+        role_name, is_privileged = get_user_role(user, project.id)
+        return bool(is_privileged or (role_name and any(r in role_name for r in ['approver', 'manager', 'admin'])))
+    except Exception as e:
+        print(f'[Monlam ExampleList] Error checking user role: {e}')
+        return False
+
+
+def annotator_queryset(queryset, user, project):
+    """Assigned (or unassigned) examples, minus skipped and submitted ones."""
+    from .models_separate import Assignment
+    from .simple_tracking import SkippedExample, AnnotationTracking
+
+    return queryset.filter(
+        Exists(Assignment.objects.filter(
+            example_id=OuterRef('pk'),
+            is_active=True
+        ).filter(
+            Q(assigned_to=user) | Q(assigned_to__isnull=True)
+        ))
+    ).exclude(
+        Exists(SkippedExample.objects.filter(
+            project=project,
+            example_id=OuterRef('pk'),
+            skipped_by=user
+        ))
+    ).exclude(
+        Exists(AnnotationTracking.objects.filter(
+            project=project,
+            example_id=OuterRef('pk'),
+            status='submitted'
+        ))
+    )
+
+
+def review_workflow_queryset(queryset, user, project):
+    """Submitted examples not yet reviewed by the user, plus rejected examples."""
+    from .simple_tracking import AnnotationTracking
+
+    return queryset.filter(
+        Exists(AnnotationTracking.objects.filter(
+            project=project,
+            example_id=OuterRef('pk')
+        ).filter(
+            (Q(status='submitted') & ~Q(reviewed_by=user)) | Q(status='rejected')
+        ))
+    )
+
+
+def filter_examples_for_user(queryset, request, project):
+    """Apply the Monlam visibility rules and Doccano's ordering to an ExampleList queryset."""
+    user = request.user
+
+    if not is_reviewer(user, project):
+        try:
+            queryset = annotator_queryset(queryset, user, project)
+        except Exception as e:
+            print(f'[Monlam ExampleList] Error filtering examples for annotator: {e}')
+            # Fail secure for annotators
+            queryset = queryset.none()
+    else:
+        all_examples_param = request.GET.get('all_examples', '').lower() == 'true'
+        is_annotation_workflow = 'page' in request.GET
+        if is_annotation_workflow and not all_examples_param:
+            try:
+                queryset = review_workflow_queryset(queryset, user, project)
+            except Exception as e:
+                print(f'[Monlam ExampleList] Error filtering for reviewer: {e}')
+
+    # Original ordering logic
+    if project.random_order:
+        # Todo: fix the algorithm.
+        import random
+        value = random.Random(user.id).randrange(2, 20)
+        return queryset.annotate(sort_id=F("id") % value).order_by("sort_id", "id")
+    return queryset.order_by("created_at")
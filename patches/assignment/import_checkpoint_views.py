@@ -0,0 +1,75 @@
+"""
+Import Checkpoint Views
+
+- GET  /v1/projects/{project_id}/assignments/import-checkpoints/
+- POST /v1/projects/{project_id}/assignments/import-checkpoints/{id}/resume/
+"""
+
+from django.shortcuts import get_object_or_404
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .import_checkpoints import ImportCheckpoint
+from .roles import ProjectManagerMixin
+
+
+class ImportCheckpointViewSet(viewsets.ViewSet):
+    """
+    List import checkpoints and resume failed imports (project managers/admins).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_project(self, project_id):
+        from projects.models import Project
+        return get_object_or_404(Project, pk=project_id)
+
+    def list(self, request, project_id):
+        project = self.get_project(project_id)
+        if not ProjectManagerMixin.is_project_manager(request.user, project):
+            return Response(
+                {'error': 'Only project managers and admins can view imports'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        checkpoints = ImportCheckpoint.objects.filter(project=project)
+        status_filter = request.query_params.get('status')
+        if status_filter:
+            checkpoints = checkpoints.filter(status=status_filter)
+        return Response([c.to_dict() for c in checkpoints[:200]])
+
+    def resume(self, request, project_id, pk):
+        project = self.get_project(project_id)
+        if not ProjectManagerMixin.is_project_manager(request.user, project):
+            return Response(
+                {'error': 'Only project managers and admins can resume imports'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        checkpoint = get_object_or_404(ImportCheckpoint, pk=pk, project=project)
+        if checkpoint.status == 'completed':
+            return Response(
+                {'error': 'Import already completed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        from django_drf_filepond.models import TemporaryUpload
+        if not TemporaryUpload.objects.filter(upload_id=checkpoint.upload_id).exists():
+            return Response(
+                {'error': 'Uploaded file is no longer available; upload it again'},
+                status=status.HTTP_410_GONE
+            )
+
+        from data_import.celery_tasks import import_dataset
+        user_id = checkpoint.created_by_id or request.user.id
+        result = import_dataset.delay(
+            user_id=user_id,
+            project_id=project.id,
+            file_format=checkpoint.file_format,
+            upload_ids=[checkpoint.upload_id],
+            task=checkpoint.task,
+            **checkpoint.options
+        )
+        print(f'[Monlam Import] Resuming {checkpoint.upload_name} in project {project.id} from line {checkpoint.line_number}')
+        return Response({'task_id': result.task_id, 'checkpoint': checkpoint.to_dict()}, status=status.HTTP_202_ACCEPTED)
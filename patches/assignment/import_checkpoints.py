@@ -0,0 +1,151 @@
+"""
+Resumable Import Checkpoints
+
+Streaming JSONL imports (data_import.datasets.StreamingJsonlDataset) record
+a checkpoint per uploaded file after every committed batch: line number,
+byte offset and examples created. A retried or manually resumed
+import_dataset task seeks to the stored offset instead of starting over.
+
+Resuming is idempotent: example uuids are derived from (file, line), and
+rows whose uuid already exists are skipped.
+
+The list / resume API lives in import_checkpoint_views.py.
+"""
+
+from django.conf import settings
+from django.db import models
+
+
+class ImportCheckpoint(models.Model):
+    """Progress of one uploaded file in an import job."""
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+        ('completed', 'Completed'),
+    ]
+
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='import_checkpoints'
+    )
+    upload_id = models.CharField(max_length=255)
+    upload_name = models.CharField(max_length=512, blank=True)
+    generated_name = models.CharField(max_length=512, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_checkpoints'
+    )
+
+    # Original import_dataset arguments, for the resume API
+    file_format = models.CharField(max_length=64)
+    task = models.CharField(max_length=64)
+    options = models.JSONField(default=dict, blank=True)
+
+    line_number = models.IntegerField(default=0)
+    byte_offset = models.BigIntegerField(default=0)
+    examples_created = models.IntegerField(default=0)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running', db_index=True)
+    error = models.TextField(blank=True)
+    attempts = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'assignment_import_checkpoint'
+        unique_together = [('project', 'upload_id')]
+        ordering = ['-updated_at']
+
+    def __str__(self):
+        return f"Import {self.upload_name or self.upload_id} in Project {self.project_id}: line {self.line_number} ({self.status})"
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'upload_id': self.upload_id,
+            'upload_name': self.upload_name,
+            'status': self.status,
+            'line_number': self.line_number,
+            'byte_offset': self.byte_offset,
+            'examples_created': self.examples_created,
+            'attempts': self.attempts,
+            'error': self.error,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+def _json_options(options):
+    """Keep only JSON-serializable import options."""
+    return {
+        key: value for key, value in (options or {}).items()
+        if isinstance(value, (str, int, float, bool, type(None), list, dict))
+    }
+
+
+class ImportCheckpointer:
+    """
+    Checkpoint writer passed to StreamingJsonlDataset.save().
+
+    Usage (in import_dataset):
+        checkpoint = ImportCheckpointer(project, user, file_format, task, uploads, kwargs)
+        dataset.save(user, batch_size=..., checkpoint=checkpoint)
+        checkpoint.complete()
+    """
+
+    def __init__(self, project, user, file_format, task, uploads, options=None):
+        """
+        Args:
+            uploads: list of (upload_id, FileName) for the files being imported
+        """
+        self.by_name = {}
+        for upload_id, filename in uploads:
+            checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+                project=project,
+                upload_id=upload_id,
+                defaults={
+                    'upload_name': filename.upload_name,
+                    'generated_name': filename.generated_name,
+                    'created_by': user,
+                    'file_format': file_format,
+                    'task': task,
+                    'options': _json_options(options),
+                }
+            )
+            checkpoint.status = 'running'
+            checkpoint.error = ''
+            checkpoint.attempts += 1
+            checkpoint.save(update_fields=['status', 'error', 'attempts', 'updated_at'])
+            self.by_name[filename.generated_name] = checkpoint
+
+    def positions(self):
+        """{generated_name: (line_number, byte_offset)} to resume from."""
+        return {
+            name: (c.line_number, c.byte_offset)
+            for name, c in self.by_name.items()
+        }
+
+    def commit(self, generated_name, line_number, byte_offset, created):
+        """Record a committed batch (call inside the batch's transaction)."""
+        checkpoint = self.by_name.get(generated_name)
+        if checkpoint is None:
+            return
+        checkpoint.line_number = line_number
+        checkpoint.byte_offset = byte_offset
+        checkpoint.examples_created += created
+        checkpoint.save(update_fields=['line_number', 'byte_offset', 'examples_created', 'updated_at'])
+
+    def complete(self):
+        for checkpoint in self.by_name.values():
+            checkpoint.status = 'completed'
+            checkpoint.save(update_fields=['status', 'updated_at'])
+
+    def fail(self, error):
+        for checkpoint in self.by_name.values():
+            checkpoint.status = 'failed'
+            checkpoint.error = str(error)[:2000]
+            checkpoint.save(update_fields=['status', 'error', 'updated_at'])
@@ -0,0 +1,58 @@
+"""
+Django management command: backfill_activity_events
+
+Appends ActivityEvent rows for existing confirmations (ExampleState),
+submissions (AnnotationTracking) and reviews (ApproverCompletionStatus).
+Idempotent: events already recorded are skipped. Each backfilled project
+gets an ActivityBackfill mark.
+
+Usage:
+    python manage.py backfill_activity_events
+    python manage.py backfill_activity_events --project-id 123
+    python manage.py backfill_activity_events --pending
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from projects.models import Project
+from assignment.activity_events import backfill_activity_events, projects_pending_backfill
+
+
+class Command(BaseCommand):
+    help = 'Load existing confirm / submit / review history into the activity event table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project-id',
+            type=int,
+            help='Only backfill a specific project ID',
+        )
+        parser.add_argument(
+            '--pending',
+            action='store_true',
+            help='Only backfill projects without an ActivityBackfill mark',
+        )
+
+    def handle(self, *args, **options):
+        project_id = options.get('project_id')
+
+        self.stdout.write("=" * 80)
+        self.stdout.write("Backfilling activity events")
+        self.stdout.write("=" * 80)
+
+        projects = Project.objects.all()
+        if project_id:
+            projects = projects.filter(pk=project_id)
+        if options.get('pending'):
+            projects = projects_pending_backfill(projects)
+
+        total = 0
+        for project in projects:
+            started = time.monotonic()
+            rows = backfill_activity_events(project)
+            total += rows
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"  Project {project.id} ({project.name}): {rows} events offered in {elapsed:.2f}s")
+
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Activity events backfilled ({total} offered, duplicates skipped)"))
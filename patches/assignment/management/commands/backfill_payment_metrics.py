@@ -0,0 +1,60 @@
+"""
+Django management command: backfill_payment_metrics
+
+Fills ExamplePaymentMetrics (syllable count + audio minutes per example)
+for examples that have no row yet, or recomputes every row with --all.
+
+Usage:
+    python manage.py backfill_payment_metrics
+    python manage.py backfill_payment_metrics --project-id 123
+    python manage.py backfill_payment_metrics --all
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from examples.models import Example
+from projects.models import Project
+from assignment.payment_metrics import fill_missing_payment_metrics, refresh_payment_metrics
+
+
+class Command(BaseCommand):
+    help = 'Compute the precomputed syllable / audio-duration columns used for payment'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project-id',
+            type=int,
+            help='Only backfill a specific project ID',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every example, not only the ones without metrics',
+        )
+
+    def handle(self, *args, **options):
+        project_id = options.get('project_id')
+        recompute = options.get('all')
+
+        self.stdout.write("=" * 80)
+        self.stdout.write("Backfilling payment metrics" + (" (full recompute)" if recompute else ""))
+        self.stdout.write("=" * 80)
+
+        projects = Project.objects.all()
+        if project_id:
+            projects = projects.filter(pk=project_id)
+
+        total = 0
+        for project in projects:
+            started = time.monotonic()
+            examples = Example.objects.filter(project=project)
+            if recompute:
+                rows = refresh_payment_metrics(examples.values_list('id', flat=True))
+            else:
+                rows = fill_missing_payment_metrics(examples)
+            total += rows
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"  Project {project.id} ({project.name}): {rows} rows in {elapsed:.2f}s")
+
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Payment metrics written for {total} examples"))
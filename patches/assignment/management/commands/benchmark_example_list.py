@@ -0,0 +1,92 @@
+"""
+Django management command: benchmark_example_list
+
+Times the Monlam ExampleList queryset (assignment.example_filters) for an
+annotator and a reviewer of a project: COUNT(*) plus the first page, as
+the example list API would run them. Run it against projects of different
+sizes (e.g. 10k / 100k / 1M examples) to compare page latency.
+
+Usage:
+    python manage.py benchmark_example_list --project-id 123
+    python manage.py benchmark_example_list --project-id 123 --runs 10 --page-size 10
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from projects.models import Member, Project
+from assignment.example_filters import filter_examples_for_user
+from assignment.roles import ROLE_ANNOTATOR
+
+
+class Command(BaseCommand):
+    help = 'Measure annotator and reviewer ExampleList page latency for a project'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project-id',
+            type=int,
+            required=True,
+            help='Project to benchmark',
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='Timed runs per user (default: 5)',
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=10,
+            help='Examples fetched per page (default: 10)',
+        )
+
+    def handle(self, *args, **options):
+        from examples.models import Example
+
+        project = Project.objects.get(pk=options['project_id'])
+        runs = options['runs']
+        page_size = options['page_size']
+
+        self.stdout.write("=" * 80)
+        self.stdout.write(f"ExampleList benchmark: project {project.id} ({project.name})")
+        self.stdout.write(f"Examples: {Example.objects.filter(project=project).count()}")
+        self.stdout.write("=" * 80)
+
+        members = Member.objects.filter(project=project).select_related('user', 'role')
+        annotator = next((m.user for m in members if m.role and m.role.name.lower() == ROLE_ANNOTATOR), None)
+        reviewer = next((m.user for m in members if m.role and m.role.name.lower() != ROLE_ANNOTATOR), None)
+
+        factory = RequestFactory()
+        cases = [
+            ('annotator', annotator, {'page': '1'}),
+            ('reviewer (annotation workflow)', reviewer, {'page': '1'}),
+            ('reviewer (dataset table)', reviewer, {}),
+        ]
+        for label, user, params in cases:
+            if user is None:
+                self.stdout.write(self.style.WARNING(f"  {label}: no such member, skipped"))
+                continue
+
+            request = factory.get('/', params)
+            request.user = user
+            timings = []
+            count = 0
+            for _ in range(runs):
+                started = time.perf_counter()
+                queryset = filter_examples_for_user(
+                    Example.objects.filter(project=project), request, project
+                )
+                count = queryset.count()
+                list(queryset[:page_size])
+                timings.append((time.perf_counter() - started) * 1000)
+
+            self.stdout.write(
+                f"  {label} ({user.username}): {count} visible, "
+                f"median {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms over {runs} runs"
+            )
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Benchmark complete"))
@@ -0,0 +1,114 @@
+"""
+Django management command: benchmark_syllable_counter
+
+Checks that monlam_ui.payment_utils.count_tibetan_syllables_many returns
+exactly what the original per-string regex counter returned, then times
+both over a synthetic corpus of Tibetan segments.
+
+The equivalence pass uses random short strings mixing Tibetan letters,
+tsheg, shad, Unicode whitespace and Latin text, so the no-tsheg and
+non-Tibetan fallbacks are exercised too.
+
+Usage:
+    python manage.py benchmark_syllable_counter
+    python manage.py benchmark_syllable_counter --segments 1000000 --cases 200000
+"""
+
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from monlam_ui.payment_utils import count_tibetan_syllables_many
+
+SYLLABLES = ['བཀྲ', 'ཤིས', 'བདེ', 'ལེགས', 'ཁྱེད', 'རང', 'སྐུ', 'གཟུགས', 'པོ', 'ཡིན', 'པས', 'ང', 'ཚོ', 'ཀྱི']
+FUZZ_ALPHABET = [
+    'ཀ', 'ཁ', 'ག', 'ང', 'ི', 'ུ', '་', '་', '།', '༄', '༠',
+    ' ', '\n', '\r', '\t', '\xa0', '　', '\x1c', 'a', 'b', '1', '.',
+]
+
+
+def legacy_count(text):
+    """The per-string implementation count_tibetan_syllables_many must match."""
+    if not text or not isinstance(text, str):
+        return 0
+    text = text.strip()
+    if not text:
+        return 0
+    parts = re.split(r'[་\s\n\r]+', text)
+    syllables = [p for p in parts if p.strip()]
+    if len(syllables) == 1 and text:
+        if re.search(r'[\u0F00-\u0FFF]', text):
+            syllables = re.findall(r'[\u0F00-\u0FFF]+', text)
+        else:
+            syllables = text.split()
+    return len(syllables)
+
+
+class Command(BaseCommand):
+    help = 'Verify and time the batch Tibetan syllable counter'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--segments',
+            type=int,
+            default=1000000,
+            help='Synthetic corpus size for the timing run (default: 1000000)',
+        )
+        parser.add_argument(
+            '--cases',
+            type=int,
+            default=100000,
+            help='Random strings for the equivalence check (default: 100000)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed (default: 0)',
+        )
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+
+        self.stdout.write("=" * 80)
+        self.stdout.write("Tibetan syllable counter: equivalence + benchmark")
+        self.stdout.write("=" * 80)
+
+        cases = [None, '', '   ', '་', '།', 'abc', 'abc def', 'ཀཁག', 'ཀ་', '་ཀ་ཁ་', 5]
+        cases += [
+            ''.join(rnd.choice(FUZZ_ALPHABET) for _ in range(rnd.randint(0, 16)))
+            for _ in range(options['cases'])
+        ]
+        expected = [legacy_count(text) for text in cases]
+        actual = count_tibetan_syllables_many(cases)
+        mismatches = [
+            (text, want, got) for text, want, got in zip(cases, expected, actual) if want != got
+        ]
+        if mismatches:
+            for text, want, got in mismatches[:10]:
+                self.stdout.write(self.style.ERROR(f"  {text!r}: expected {want}, got {got}"))
+            raise CommandError(f"{len(mismatches)} mismatches against the per-string counter")
+        self.stdout.write(f"  Equivalence: {len(cases)} cases match")
+
+        corpus = []
+        for _ in range(options['segments']):
+            words = [rnd.choice(SYLLABLES) for _ in range(rnd.randint(3, 40))]
+            segment = '་'.join(words)
+            corpus.append(segment + ('།' if rnd.random() < 0.5 else ''))
+
+        started = time.perf_counter()
+        legacy_total = sum(legacy_count(text) for text in corpus)
+        legacy_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batch_total = sum(count_tibetan_syllables_many(corpus))
+        batch_seconds = time.perf_counter() - started
+
+        if legacy_total != batch_total:
+            raise CommandError(f"Totals differ: {legacy_total} vs {batch_total}")
+
+        self.stdout.write(f"  Corpus: {len(corpus)} segments, {batch_total} syllables")
+        self.stdout.write(f"  Per-string regex: {legacy_seconds:.2f}s")
+        self.stdout.write(f"  Batch:            {batch_seconds:.2f}s ({legacy_seconds / batch_seconds:.1f}x)")
+        self.stdout.write(self.style.SUCCESS("\n✅ Batch counter matches the per-string counter"))
@@ -0,0 +1,74 @@
+"""
+Django management command: check_assignment_serializer_queries
+
+Query-count regression check for AssignmentSerializer with
+build_assignment_context (the repo has no test suite, so this is the
+runnable check). Serializes N and 2N assignments of a project and fails
+unless both runs issue the same number of queries.
+
+Usage:
+    python manage.py check_assignment_serializer_queries --project-id 123
+    python manage.py check_assignment_serializer_queries --project-id 123 --rows 200
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from projects.models import Project
+from assignment.models_separate import Assignment
+from assignment.serializers import AssignmentSerializer, build_assignment_context
+
+
+class Command(BaseCommand):
+    help = 'Check that serializing assignments runs a constant number of queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project-id',
+            type=int,
+            required=True,
+            help='Project whose assignments are serialized',
+        )
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=50,
+            help='N: the check serializes N and 2N assignments (default: 50)',
+        )
+
+    def _count_queries(self, project, assignments):
+        with CaptureQueriesContext(connection) as captured:
+            AssignmentSerializer(
+                assignments,
+                many=True,
+                context=build_assignment_context(project, assignments)
+            ).data
+        return len(captured.captured_queries)
+
+    def handle(self, *args, **options):
+        project = Project.objects.get(pk=options['project_id'])
+
+        self.stdout.write("=" * 80)
+        self.stdout.write(f"AssignmentSerializer query count: project {project.id} ({project.name})")
+        self.stdout.write("=" * 80)
+
+        available = Assignment.objects.filter(project=project, is_active=True).count()
+        rows = min(max(options['rows'], 1), available // 2)
+        if rows < 1:
+            raise CommandError(f"Project {project.id} needs at least 2 active assignments ({available} found)")
+
+        # Evaluated up front so only the serializer's own queries are captured
+        assignments = list(
+            Assignment.objects.filter(project=project, is_active=True).select_related(
+                'assigned_to', 'reviewed_by'
+            ).order_by('id')[:rows * 2]
+        )
+        small = self._count_queries(project, assignments[:rows])
+        large = self._count_queries(project, assignments)
+
+        self.stdout.write(f"  {rows} assignments: {small} queries")
+        self.stdout.write(f"  {rows * 2} assignments: {large} queries")
+        if small != large:
+            raise CommandError(f"Query count grows with row count ({small} vs {large})")
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Query count is constant"))
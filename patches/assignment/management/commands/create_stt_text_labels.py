@@ -0,0 +1,63 @@
+"""
+Django management command: create_stt_text_labels
+
+Creates a TextLabel (text = Example.text) for every Speech2text example
+that has a transcript but no label yet, using the set-based
+data_import.stt_labels helper.
+
+Usage:
+    python manage.py create_stt_text_labels --dry-run
+    python manage.py create_stt_text_labels --project-id 123
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Create missing TextLabels for Speech2text examples'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project-id',
+            type=int,
+            help='Only process a specific project ID',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the labels that would be created',
+        )
+
+    def handle(self, *args, **options):
+        from data_import.stt_labels import create_text_labels_for_project
+
+        project_id = options.get('project_id')
+        dry_run = options.get('dry_run', False)
+
+        self.stdout.write("=" * 80)
+        self.stdout.write("Creating missing STT TextLabels")
+        if dry_run:
+            self.stdout.write(self.style.WARNING("DRY RUN MODE - No changes will be made"))
+        self.stdout.write("=" * 80)
+
+        projects = Project.objects.filter(project_type='Speech2text')
+        if project_id:
+            projects = projects.filter(pk=project_id)
+
+        User = get_user_model()
+        fallback_user = User.objects.filter(is_superuser=True).first()
+
+        total = 0
+        for project in projects:
+            user = project.created_by or fallback_user
+            if user is None:
+                self.stdout.write(self.style.WARNING(f"  Project {project.id}: no user to own labels, skipped"))
+                continue
+            count = create_text_labels_for_project(project, user, dry_run=dry_run)
+            total += count
+            verb = 'would create' if dry_run else 'created'
+            self.stdout.write(f"  Project {project.id} ({project.name}): {verb} {count} labels")
+
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Total: {total}"))
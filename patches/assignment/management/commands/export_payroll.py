@@ -0,0 +1,106 @@
+"""
+Django management command: export_payroll
+
+Month-end payroll for all projects in one pass: grouped SQL totals per
+(user, project prefix) priced with the payment_utils rates
+(assignment.payroll.compute_payroll), written as CSV.
+
+Usage:
+    python manage.py export_payroll                      # last month, to stdout
+    python manage.py export_payroll --month 2026-09 --output payroll_2026-09.csv
+    python manage.py export_payroll --start-date 2026-09-01 --end-date 2026-09-15
+    python manage.py export_payroll --project-id 123
+"""
+
+import csv
+import sys
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from projects.models import Project
+from assignment.payroll import (
+    compute_payroll,
+    iter_payroll_csv_rows,
+    month_dates,
+    period_bounds,
+    previous_month,
+)
+
+
+class Command(BaseCommand):
+    help = 'Export payroll (minutes, segments, syllables and rupees per user and project prefix) as CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month',
+            type=str,
+            help='Payroll month as YYYY-MM (default: last month)',
+        )
+        parser.add_argument(
+            '--start-date',
+            type=str,
+            help='Period start as YYYY-MM-DD (use with --end-date instead of --month)',
+        )
+        parser.add_argument(
+            '--end-date',
+            type=str,
+            help='Period end as YYYY-MM-DD (inclusive)',
+        )
+        parser.add_argument(
+            '--project-id',
+            type=int,
+            help='Only include a specific project ID',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='CSV file to write (default: stdout)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options.get('start_date') or options.get('end_date'):
+                if not (options.get('start_date') and options.get('end_date')):
+                    raise CommandError('--start-date and --end-date must be used together')
+                start_date = datetime.strptime(options['start_date'], '%Y-%m-%d').date()
+                end_date = datetime.strptime(options['end_date'], '%Y-%m-%d').date()
+            else:
+                start_date, end_date = month_dates(options.get('month') or previous_month())
+        except ValueError as e:
+            raise CommandError(f'Invalid month or date: {e}')
+
+        projects = Project.objects.all()
+        if options.get('project_id'):
+            projects = projects.filter(pk=options['project_id'])
+
+        output = options.get('output')
+        # Progress goes to stderr when the CSV itself is written to stdout
+        log = self.stdout if output else self.stderr
+
+        log.write("=" * 80)
+        log.write(f"Payroll {start_date} to {end_date}")
+        log.write("=" * 80)
+
+        started = time.monotonic()
+        start_datetime, end_datetime = period_bounds(start_date, end_date)
+        lines = compute_payroll(start_datetime, end_datetime, projects=projects)
+
+        if output:
+            with open(output, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows(iter_payroll_csv_rows(lines))
+        else:
+            csv.writer(sys.stdout).writerows(iter_payroll_csv_rows(lines))
+
+        unconfigured = sorted({line['username'] for line in lines if not line['configured']})
+        if unconfigured:
+            log.write(self.style.WARNING(
+                f"  ⚠️ Work in projects without a payment config (paid Rs. 0): {', '.join(unconfigured)}"
+            ))
+
+        total = round(sum(line['total_rupees'] for line in lines), 2)
+        elapsed = time.monotonic() - started
+        log.write(self.style.SUCCESS(
+            f"\n✅ {len(lines)} payroll lines, Rs. {total:.2f} total ({elapsed:.2f}s)"
+            + (f" -> {output}" if output else '')
+        ))
@@ -0,0 +1,46 @@
+"""
+Django management command: rebuild_rollups
+
+Recomputes ProjectStatusRollup and UserDailyRollup from ExampleState and
+ApproverCompletionStatus using grouped aggregate queries.
+
+Usage:
+    python manage.py rebuild_rollups
+    python manage.py rebuild_rollups --project-id 123
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from projects.models import Project
+from assignment.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-project status and per-user daily rollup tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project-id',
+            type=int,
+            help='Only rebuild rollups for a specific project ID',
+        )
+
+    def handle(self, *args, **options):
+        project_id = options.get('project_id')
+
+        self.stdout.write("=" * 80)
+        self.stdout.write("Rebuilding status rollups")
+        self.stdout.write("=" * 80)
+
+        projects = Project.objects.all()
+        if project_id:
+            projects = projects.filter(pk=project_id)
+
+        for project in projects:
+            started = time.monotonic()
+            rows = rebuild_rollups(project)
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"  Project {project.id} ({project.name}): {rows} rows in {elapsed:.2f}s")
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Rollups rebuilt"))
@@ -0,0 +1,62 @@
+"""
+Django management command: reconcile_dataset
+
+Incrementally reconciles ExampleState, AnnotationTracking and Assignment.
+Only examples whose rows changed since the last run are processed (per-project
+watermark), unless --full is given.
+
+Usage:
+    python manage.py reconcile_dataset
+    python manage.py reconcile_dataset --project-id 123
+    python manage.py reconcile_dataset --full --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+from projects.models import Project
+from assignment.reconciliation import DatasetReconciler
+
+
+class Command(BaseCommand):
+    help = 'Incrementally reconcile ExampleState, AnnotationTracking and Assignment data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project-id',
+            type=int,
+            help='Only reconcile a specific project ID',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore the stored watermark and check every example',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be done without making changes',
+        )
+
+    def handle(self, *args, **options):
+        project_id = options.get('project_id')
+        full = options['full']
+        dry_run = options['dry_run']
+
+        self.stdout.write("=" * 80)
+        self.stdout.write("Reconciling ExampleState, AnnotationTracking and Assignment")
+        if dry_run:
+            self.stdout.write(self.style.WARNING("DRY RUN MODE - No changes will be made"))
+        if full:
+            self.stdout.write("Full mode: ignoring watermark")
+        self.stdout.write("=" * 80)
+
+        projects = Project.objects.all()
+        if project_id:
+            projects = projects.filter(pk=project_id)
+
+        for project in projects:
+            stats = DatasetReconciler(project, full=full, dry_run=dry_run).run()
+            self.stdout.write(f"\nProject {project.id} ({project.name}):")
+            for key, value in stats.items():
+                self.stdout.write(f"  {key}: {value}")
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Reconciliation complete"))
@@ -0,0 +1,179 @@
+"""
+Bulk Assignment Materialization
+
+Privileged users (admins, managers, approvers) see every example of a
+project in the dataset table, which requires an active Assignment row per
+example. This module creates the missing rows set-based: examples without
+an active assignment are walked in id order (keyset chunks) and inserted
+with bulk_create, instead of one Example.get + Assignment.create per row.
+
+Runs on the Celery worker (materialize_assignments_task, queued by the
+dataset table through schedule_materialize) or from the Project admin
+action, never inside a request. Runs for the same project are serialized
+with a transaction-level advisory lock on PostgreSQL, so two of them can
+never both insert a full set of assignments.
+"""
+
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+
+# First key of the two-key pg_advisory_xact_lock (second key: project id)
+MATERIALIZE_LOCK_NAMESPACE = 0x4D41  # 'MA'
+
+_DEFAULT_REQUEUE_SECONDS = 60
+
+
+def assignment_status_for(tracking_status, is_confirmed):
+    """
+    Map tracking status / confirmed state to an Assignment status.
+
+    Args:
+        tracking_status: AnnotationTracking.status, or None if no tracking row
+        is_confirmed: True if ExampleState.confirmed_by is set
+    """
+    if tracking_status is None:
+        return 'submitted' if is_confirmed else 'assigned'
+    if tracking_status in ['submitted', 'approved', 'rejected']:
+        return tracking_status
+    if tracking_status == 'pending':
+        # Confirmed = submitted, pending but not confirmed = in progress
+        return 'submitted' if is_confirmed else 'in_progress'
+    return 'assigned'
+
+
+def materialize_assignments(project, tracking_map=None, state_map=None, chunk_size=2000):
+    """
+    Create an active Assignment for every example in the project that has none.
+
+    Args:
+        project: Project instance
+        tracking_map: Optional {example_id: AnnotationTracking} already loaded by the caller
+        state_map: Optional {example_id: ExampleState} already loaded by the caller
+        chunk_size: Number of examples inserted per bulk_create
+
+    Returns:
+        Dict with 'created' (rows inserted) and 'elapsed_seconds'
+    """
+    started = time.monotonic()
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT pg_advisory_xact_lock(%s, %s)',
+                    [MATERIALIZE_LOCK_NAMESPACE, project.id]
+                )
+        created = _materialize(project, tracking_map, state_map, chunk_size)
+
+    elapsed = round(time.monotonic() - started, 3)
+    if created:
+        # bulk_create sends no post_save: mark the completion view explicitly
+        from .completion_view import mark_project_dirty
+        mark_project_dirty(project.id)
+        print(f'[Monlam Materialize] Project {project.id}: created {created} assignments in {elapsed}s')
+    return {'created': created, 'elapsed_seconds': elapsed}
+
+
+def _materialize(project, tracking_map, state_map, chunk_size):
+    from examples.models import Example, ExampleState
+    from .models_separate import Assignment
+    from .simple_tracking import AnnotationTracking
+
+    created = 0
+    unassigned = Example.objects.filter(project=project).annotate(
+        has_assignment=Exists(
+            Assignment.objects.filter(example_id=OuterRef('pk'), is_active=True)
+        )
+    ).filter(has_assignment=False).order_by('id')
+
+    last_id = 0
+    while True:
+        example_ids = list(
+            unassigned.filter(id__gt=last_id).values_list('id', flat=True)[:chunk_size]
+        )
+        if not example_ids:
+            break
+        last_id = example_ids[-1]
+
+        if tracking_map is not None:
+            tracking = {
+                eid: (tracking_map[eid].status, tracking_map[eid].annotated_by_id)
+                for eid in example_ids if eid in tracking_map
+            }
+        else:
+            tracking = {
+                eid: (status, annotated_by_id)
+                for eid, status, annotated_by_id in AnnotationTracking.objects.filter(
+                    project=project, example_id__in=example_ids
+                ).values_list('example_id', 'status', 'annotated_by_id')
+            }
+
+        if state_map is not None:
+            confirmed = {
+                eid: state_map[eid].confirmed_by_id
+                for eid in example_ids
+                if eid in state_map and state_map[eid].confirmed_by_id
+            }
+        else:
+            confirmed = dict(
+                ExampleState.objects.filter(
+                    example_id__in=example_ids, confirmed_by__isnull=False
+                ).values_list('example_id', 'confirmed_by_id')
+            )
+
+        rows = []
+        for example_id in example_ids:
+            tracking_status, annotated_by_id = tracking.get(example_id, (None, None))
+            confirmed_by_id = confirmed.get(example_id)
+            if example_id in tracking:
+                assigned_to_id = annotated_by_id
+            else:
+                assigned_to_id = confirmed_by_id
+            rows.append(Assignment(
+                project=project,
+                example_id=example_id,
+                assigned_to_id=assigned_to_id,
+                status=assignment_status_for(tracking_status, confirmed_by_id is not None),
+                is_active=True
+            ))
+
+        Assignment.objects.bulk_create(rows)
+        created += len(rows)
+
+    return created
+
+
+def has_unassigned_examples(project):
+    """True if some example of the project has no active Assignment."""
+    from examples.models import Example
+    from .models_separate import Assignment
+
+    return Example.objects.filter(project=project).exclude(
+        Exists(Assignment.objects.filter(example_id=OuterRef('pk'), is_active=True))
+    ).exists()
+
+
+def schedule_materialize(project_id):
+    """
+    Queue materialize_assignments_task for a project, at most once per
+    settings.MONLAM_MATERIALIZE_REQUEUE_SECONDS (default 60s).
+
+    Returns:
+        True if a task was queued
+    """
+    from django.core.cache import cache
+
+    key = f'monlam:materialize-queued:{project_id}'
+    timeout = getattr(settings, 'MONLAM_MATERIALIZE_REQUEUE_SECONDS', _DEFAULT_REQUEUE_SECONDS)
+    if not cache.add(key, True, timeout=timeout):
+        return False
+    try:
+        from .celery_tasks import materialize_assignments_task
+        materialize_assignments_task.delay(project_id)
+    except Exception as e:
+        cache.delete(key)
+        print(f'[Monlam Materialize] ⚠️ Could not schedule materialization for project {project_id}: {e}')
+        return False
+    return True
@@ -0,0 +1,40 @@
+"""
+Add ReconcileWatermark.
+
+Stores the per-project high-water mark used by the incremental dataset
+reconciler (assignment.reconciliation).
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('assignment', '0007_remove_locking_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReconcileWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('last_state_id', models.BigIntegerField(default=0)),
+                ('last_tracking_id', models.BigIntegerField(default=0)),
+                ('last_assignment_id', models.BigIntegerField(default=0)),
+                ('last_approval_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='reconcile_watermark',
+                    to='projects.project'
+                )),
+            ],
+            options={
+                'db_table': 'assignment_reconcile_watermark',
+            },
+        ),
+    ]
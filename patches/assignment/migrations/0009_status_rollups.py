@@ -0,0 +1,86 @@
+"""
+Add ProjectStatusRollup and UserDailyRollup.
+
+Precomputed per-user counters read by the completion and analytics
+dashboards (see assignment.rollups). Populate existing data with:
+
+    python manage.py rebuild_rollups
+"""
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projects', '0001_initial'),
+        ('assignment', '0008_reconcile_watermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('annotated', models.IntegerField(default=0)),
+                ('annotated_approved', models.IntegerField(default=0)),
+                ('annotated_rejected', models.IntegerField(default=0)),
+                ('reviewed_approved', models.IntegerField(default=0)),
+                ('reviewed_rejected', models.IntegerField(default=0)),
+                ('final_approved', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='status_rollups',
+                    to='projects.project'
+                )),
+                ('user', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='status_rollups',
+                    to=settings.AUTH_USER_MODEL
+                )),
+            ],
+            options={
+                'db_table': 'assignment_project_status_rollup',
+                'unique_together': {('project', 'user')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UserDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('confirmed', models.IntegerField(default=0)),
+                ('annotated_approved', models.IntegerField(default=0)),
+                ('annotated_rejected', models.IntegerField(default=0)),
+                ('approved', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('final_approved', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='daily_rollups',
+                    to='projects.project'
+                )),
+                ('user', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='daily_rollups',
+                    to=settings.AUTH_USER_MODEL
+                )),
+            ],
+            options={
+                'db_table': 'assignment_user_daily_rollup',
+                'unique_together': {('project', 'user', 'date')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='userdailyrollup',
+            index=models.Index(fields=['project', 'date'], name='daily_rollup_proj_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userdailyrollup',
+            index=models.Index(fields=['date', 'user'], name='daily_rollup_date_user_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+"""
+Add ImportCheckpoint.
+
+Per-file progress of streaming JSONL imports so retried or resumed
+import_dataset tasks continue from the last committed batch
+(see assignment.import_checkpoints).
+"""
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projects', '0001_initial'),
+        ('assignment', '0009_status_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_id', models.CharField(max_length=255)),
+                ('upload_name', models.CharField(blank=True, max_length=512)),
+                ('generated_name', models.CharField(blank=True, max_length=512)),
+                ('file_format', models.CharField(max_length=64)),
+                ('task', models.CharField(max_length=64)),
+                ('options', models.JSONField(blank=True, default=dict)),
+                ('line_number', models.IntegerField(default=0)),
+                ('byte_offset', models.BigIntegerField(default=0)),
+                ('examples_created', models.IntegerField(default=0)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('failed', 'Failed'), ('completed', 'Completed')], db_index=True, default='running', max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_checkpoints', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_checkpoints', to='projects.project')),
+            ],
+            options={
+                'db_table': 'assignment_import_checkpoint',
+                'ordering': ['-updated_at'],
+                'unique_together': {('project', 'upload_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+"""
+Add claim lease fields to Assignment.
+
+lease_owner / lease_expires_at back the claim-next allocator
+(assignment.claims): an annotator leases the next eligible example with
+SELECT ... FOR UPDATE SKIP LOCKED, so concurrent annotators never get the
+same example.
+"""
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('assignment', '0010_import_checkpoints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='lease_owner',
+            field=models.ForeignKey(blank=True, help_text='Annotator currently holding the claim on this example', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assignment_leases', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['project', 'is_active', 'example'], name='assignment_claim_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+"""
+Composite indexes for the ExampleList EXISTS filters.
+
+assignment.example_filters correlates on the example id:
+- Assignment(example, is_active, assigned_to): annotator visibility
+- AnnotationTracking(example, status, reviewed_by): submitted / reviewed /
+  rejected checks, answered from the index alone
+SkippedExample is already covered by its (project, example, skipped_by)
+unique constraint.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignment', '0011_assignment_claim_lease'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['example', 'is_active', 'assigned_to'], name='assignment_ex_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='annotationtracking',
+            index=models.Index(fields=['example', 'status', 'reviewed_by'], name='anno_track_ex_status_idx'),
+        ),
+    ]
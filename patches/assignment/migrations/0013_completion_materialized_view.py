@@ -0,0 +1,178 @@
+"""
+Materialized example_completion_comprehensive view.
+
+- CompletionViewDirtyProject: projects changed since the last refresh
+- ExampleCompletionSummary: unmanaged model over the view
+- Creates the MATERIALIZED VIEW and its unique index (PostgreSQL only;
+  replaces the plain view from create_completion_view.sql if present)
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+# Inlined (not imported from assignment.completion_view) so later edits to
+# the app code cannot change what this migration creates
+# Per-example aggregates are correlated subqueries: no fan-out join and no
+# GROUP BY over the example columns. annotation_count covers Doccano's
+# category / span / text label tables.
+CREATE_VIEW_SQL = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS example_completion_comprehensive AS
+SELECT
+    e.id AS example_id,
+    e.uuid,
+    e.filename,
+    e.project_id,
+    e.created_at AS example_created_at,
+    e.updated_at AS example_updated_at,
+
+    a.id AS assignment_id,
+    a.assigned_to_id AS assigned_annotator_id,
+    au.username AS assigned_annotator_username,
+    a.status AS assignment_status,
+    a.assigned_at,
+    a.started_at,
+    a.submitted_at,
+
+    COALESCE(ac.total, 0) AS total_annotators,
+    COALESCE(ac.completed, 0) AS completed_by_annotators,
+    COALESCE(ap.total, 0) AS total_approvers,
+    COALESCE(ap.approved, 0) AS approved_by_approvers,
+    COALESCE(ap.rejected, 0) AS rejected_by_approvers,
+    COALESCE(ap.pending, 0) AS pending_approvers,
+
+    CASE
+        WHEN COALESCE(ap.approved, 0) > 0 THEN 'approved'
+        WHEN COALESCE(ap.rejected, 0) > 0 THEN 'rejected'
+        WHEN COALESCE(ac.completed, 0) > 0 THEN 'completed'
+        WHEN a.status = 'in_progress' THEN 'in_progress'
+        WHEN a.status IS NOT NULL THEN 'assigned'
+        ELSE 'unassigned'
+    END AS overall_status,
+
+    ac.last_completed_at,
+    ap.last_reviewed_at,
+
+    (SELECT COUNT(*) FROM labels_category c WHERE c.example_id = e.id)
+      + (SELECT COUNT(*) FROM labels_span s WHERE s.example_id = e.id)
+      + (SELECT COUNT(*) FROM labels_textlabel t WHERE t.example_id = e.id) AS annotation_count
+FROM examples_example e
+LEFT JOIN LATERAL (
+    SELECT id, assigned_to_id, status, assigned_at, started_at, submitted_at
+    FROM assignment_assignment
+    WHERE example_id = e.id AND is_active = true
+    ORDER BY assigned_at DESC
+    LIMIT 1
+) a ON true
+LEFT JOIN auth_user au ON au.id = a.assigned_to_id
+LEFT JOIN LATERAL (
+    SELECT COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE is_completed) AS completed,
+           MAX(completed_at) AS last_completed_at
+    FROM assignment_annotatorcompletionstatus
+    WHERE example_id = e.id
+) ac ON true
+LEFT JOIN LATERAL (
+    SELECT COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE status = 'approved') AS approved,
+           COUNT(*) FILTER (WHERE status = 'rejected') AS rejected,
+           COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+           MAX(reviewed_at) AS last_reviewed_at
+    FROM assignment_approvercompletionstatus
+    WHERE example_id = e.id
+) ap ON true
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS example_completion_comprehensive_example_uniq ON example_completion_comprehensive (example_id);
+CREATE INDEX IF NOT EXISTS example_completion_comprehensive_project_status_idx ON example_completion_comprehensive (project_id, overall_status);
+CREATE INDEX IF NOT EXISTS example_completion_comprehensive_project_annotator_idx ON example_completion_comprehensive (project_id, assigned_annotator_id);
+"""
+
+DROP_VIEW_SQL = "DROP MATERIALIZED VIEW IF EXISTS example_completion_comprehensive;"
+
+
+def create_view(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP VIEW IF EXISTS example_completion_comprehensive;')
+    schema_editor.execute(CREATE_VIEW_SQL)
+
+
+def drop_view(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_VIEW_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignment', '0012_example_list_indexes'),
+        ('examples', '0001_initial'),
+        ('projects', '0001_initial'),
+        ('labels', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompletionViewDirtyProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('marked_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('project', models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='completion_view_dirty',
+                    to='projects.project'
+                )),
+            ],
+            options={
+                'db_table': 'assignment_completion_view_dirty',
+            },
+        ),
+        migrations.CreateModel(
+            name='ExampleCompletionSummary',
+            fields=[
+                ('example', models.OneToOneField(
+                    db_column='example_id',
+                    on_delete=django.db.models.deletion.DO_NOTHING,
+                    primary_key=True,
+                    related_name='completion_summary',
+                    serialize=False,
+                    to='examples.example'
+                )),
+                ('uuid', models.UUIDField()),
+                ('filename', models.CharField(max_length=1024, null=True)),
+                ('example_created_at', models.DateTimeField()),
+                ('example_updated_at', models.DateTimeField()),
+                ('assignment_id', models.BigIntegerField(null=True)),
+                ('assigned_annotator_id', models.IntegerField(null=True)),
+                ('assigned_annotator_username', models.CharField(max_length=150, null=True)),
+                ('assignment_status', models.CharField(max_length=20, null=True)),
+                ('assigned_at', models.DateTimeField(null=True)),
+                ('started_at', models.DateTimeField(null=True)),
+                ('submitted_at', models.DateTimeField(null=True)),
+                ('total_annotators', models.IntegerField()),
+                ('completed_by_annotators', models.IntegerField()),
+                ('total_approvers', models.IntegerField()),
+                ('approved_by_approvers', models.IntegerField()),
+                ('rejected_by_approvers', models.IntegerField()),
+                ('pending_approvers', models.IntegerField()),
+                ('overall_status', models.CharField(max_length=20)),
+                ('last_completed_at', models.DateTimeField(null=True)),
+                ('last_reviewed_at', models.DateTimeField(null=True)),
+                ('annotation_count', models.IntegerField()),
+                ('project', models.ForeignKey(
+                    db_column='project_id',
+                    on_delete=django.db.models.deletion.DO_NOTHING,
+                    related_name='+',
+                    to='projects.project'
+                )),
+            ],
+            options={
+                'db_table': 'example_completion_comprehensive',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_view, drop_view),
+    ]
@@ -0,0 +1,35 @@
+"""
+Precomputed payment metrics.
+
+- ExamplePaymentMetrics: syllable count and audio duration per example,
+  summed by the payment aggregation instead of re-counting transcripts.
+  Existing examples are filled by `python manage.py backfill_payment_metrics`.
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignment', '0013_completion_materialized_view'),
+        ('examples', '0001_initial'),
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamplePaymentMetrics',
+            fields=[
+                ('example', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='payment_metrics', serialize=False, to='examples.example')),
+                ('syllables', models.PositiveIntegerField(default=0)),
+                ('duration_minutes', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project')),
+            ],
+            options={
+                'db_table': 'assignment_example_payment_metrics',
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+"""
+Database-backed payment rates.
+
+- PaymentRate: rates per project-name prefix with effective-date ranges
+- Seeds the rates previously hard-coded in monlam_ui.payment_utils
+  (open-ended, no start date)
+"""
+
+from django.db import migrations, models
+
+INITIAL_RATES = [
+    # AM_AB_A and KH_AB_A: Rs. 5 × Total Audio Minutes + Rs. 2 per audio segment
+    ('AM_AB_A', 5.0, 2.0, None),
+    ('KH_AB_A', 5.0, 2.0, None),
+    # KH_MV_A, KH_MV_B, AM_MV_B, AM_MV_A: Rs. 5 × Total Audio Minutes + Rs. 0.35 per reviewed syllable
+    ('KH_MV_A', 5.0, None, 0.35),
+    ('KH_MV_B', 5.0, None, 0.35),
+    ('AM_MV_B', 5.0, None, 0.35),
+    ('AM_MV_A', 5.0, None, 0.35),
+    # STT_TEACHING_A: Rs. 5 × Total Audio Minutes + Rs. 0.3 per reviewed syllable
+    ('STT_TEACHING_A', 5.0, None, 0.3),
+]
+
+
+def seed_rates(apps, schema_editor):
+    PaymentRate = apps.get_model('assignment', 'PaymentRate')
+    for prefix, audio_minute_rate, segment_rate, syllable_rate in INITIAL_RATES:
+        if not PaymentRate.objects.filter(prefix=prefix).exists():
+            PaymentRate.objects.create(
+                prefix=prefix,
+                audio_minute_rate=audio_minute_rate,
+                segment_rate=segment_rate,
+                syllable_rate=syllable_rate,
+                notes='Initial rate'
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignment', '0014_example_payment_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(db_index=True, max_length=100)),
+                ('audio_minute_rate', models.FloatField(default=0.0)),
+                ('segment_rate', models.FloatField(blank=True, null=True)),
+                ('syllable_rate', models.FloatField(blank=True, null=True)),
+                ('effective_from', models.DateField(blank=True, help_text='Empty = since always', null=True)),
+                ('effective_to', models.DateField(blank=True, help_text='Inclusive; empty = open-ended', null=True)),
+                ('notes', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'assignment_payment_rate',
+                'ordering': ['prefix', '-effective_from'],
+            },
+        ),
+        migrations.RunPython(seed_rates, migrations.RunPython.noop),
+    ]
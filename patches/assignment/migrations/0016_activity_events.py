@@ -0,0 +1,55 @@
+"""
+Append-only activity events.
+
+- ActivityEvent: one row per confirm / submit / approve / reject with the
+  local day, audio minutes and syllables at write time. Indexed on
+  (day, project, event_type) so analytics date ranges are index range
+  scans. Existing history is loaded by
+  `python manage.py backfill_activity_events` (or the Celery beat task).
+"""
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('assignment', '0015_payment_rates'),
+        ('examples', '0001_initial'),
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('confirm', 'Confirmed'), ('submit', 'Submitted'), ('approve', 'Approved'), ('reject', 'Rejected')], max_length=10)),
+                ('occurred_at', models.DateTimeField()),
+                ('day', models.DateField()),
+                ('minutes', models.FloatField(default=0.0)),
+                ('syllables', models.PositiveIntegerField(default=0)),
+                ('example', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='examples.example')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'assignment_activity_event',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='activityevent',
+            index=models.Index(fields=['day', 'project', 'event_type'], name='activity_day_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activityevent',
+            index=models.Index(fields=['project', 'occurred_at'], name='activity_project_time_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='activityevent',
+            constraint=models.UniqueConstraint(fields=('event_type', 'example', 'user', 'occurred_at'), name='activity_event_uniq'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+"""
+Add RollupBuild.
+
+Marks projects whose status rollups were rebuilt from the raw tables.
+Readers used "any rollup row exists" as that signal, which the first
+counter bump after deploy already satisfies. Existing projects are
+rebuilt by `python manage.py rebuild_rollups`, or queued on the worker
+by the first completion dashboard load.
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('assignment', '0016_activity_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupBuild',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queued_at', models.DateTimeField(blank=True, null=True)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+                ('project', models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='rollup_build',
+                    to='projects.project'
+                )),
+            ],
+            options={
+                'db_table': 'assignment_rollup_build',
+            },
+        ),
+    ]
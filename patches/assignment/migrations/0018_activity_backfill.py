@@ -0,0 +1,39 @@
+"""
+Add ActivityBackfill.
+
+Marks projects whose existing confirm / submit / review history was
+loaded into ActivityEvent. The analytics API used "the project has no
+events" as that signal, which the first event written by the signals
+after deploy already breaks. Projects without a mark are backfilled by
+`python manage.py backfill_activity_events` or the
+backfill_pending_activity_events_task beat task.
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('assignment', '0017_rollup_build'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityBackfill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('backfilled_at', models.DateTimeField()),
+                ('project', models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='activity_backfill',
+                    to='projects.project'
+                )),
+            ],
+            options={
+                'db_table': 'assignment_activity_backfill',
+            },
+        ),
+    ]
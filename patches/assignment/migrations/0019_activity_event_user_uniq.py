@@ -0,0 +1,33 @@
+"""
+Make activity_event_uniq apply to events with a user only.
+
+PostgreSQL treats NULLs as distinct in a unique index, so the original
+(event_type, example, user, occurred_at) constraint never deduplicated
+user-less events. Writers now skip rows without a user; the constraint
+becomes a partial unique index over rows with one (rows whose user was
+deleted later keep their history without blocking anything).
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignment', '0018_activity_backfill'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='activityevent',
+            name='activity_event_uniq',
+        ),
+        migrations.AddConstraint(
+            model_name='activityevent',
+            constraint=models.UniqueConstraint(
+                fields=('event_type', 'example', 'user', 'occurred_at'),
+                condition=models.Q(user__isnull=False),
+                name='activity_event_uniq'
+            ),
+        ),
+    ]
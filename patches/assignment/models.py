@@ -9,7 +9,28 @@ This allows ForeignKey references like 'assignment.Assignment' to work correctly
 
 # Import all models from models_separate so they're available as assignment.models.*
 from .models_separate import Assignment, AssignmentBatch
+from .reconciliation import ReconcileWatermark
+from .rollups import ProjectStatusRollup, UserDailyRollup, RollupBuild
+from .import_checkpoints import ImportCheckpoint
+from .completion_view import ExampleCompletionSummary, CompletionViewDirtyProject
+from .payment_metrics import ExamplePaymentMetrics
+from .payment_rates import PaymentRate
+from .activity_events import ActivityEvent, ActivityBackfill
 
 # Make them available at the module level for Django's model resolution
-__all__ = ['Assignment', 'AssignmentBatch']
+__all__ = [
+    'Assignment',
+    'AssignmentBatch',
+    'ReconcileWatermark',
+    'ProjectStatusRollup',
+    'UserDailyRollup',
+    'RollupBuild',
+    'ImportCheckpoint',
+    'ExampleCompletionSummary',
+    'CompletionViewDirtyProject',
+    'ExamplePaymentMetrics',
+    'PaymentRate',
+    'ActivityEvent',
+    'ActivityBackfill',
+]
 
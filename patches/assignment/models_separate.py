@@ -98,12 +98,25 @@ class Assignment(models.Model):
     # Is this the current/active assignment?
     is_active = models.BooleanField(default=True, db_index=True)
     
+    # Claim lease (claim-next allocator): who is working on it right now
+    lease_owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='assignment_leases',
+        help_text='Annotator currently holding the claim on this example'
+    )
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    
     class Meta:
         ordering = ['-assigned_at']
         indexes = [
             models.Index(fields=['project', 'status']),
             models.Index(fields=['assigned_to', 'status']),
             models.Index(fields=['example', 'is_active']),
+            models.Index(fields=['project', 'is_active', 'example'], name='assignment_claim_idx'),
+            models.Index(fields=['example', 'is_active', 'assigned_to'], name='assignment_ex_owner_idx'),
         ]
     
     def __str__(self):
@@ -178,7 +191,11 @@ class Assignment(models.Model):
             )
             for ex in examples
         ]
-        return cls.objects.bulk_create(assignments)
+        created = cls.objects.bulk_create(assignments)
+        # bulk_create sends no post_save: mark the completion view explicitly
+        from .completion_view import mark_project_dirty
+        mark_project_dirty(project.id)
+        return created
 
 
 class AssignmentBatch(models.Model):
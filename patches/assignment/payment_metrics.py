@@ -0,0 +1,224 @@
+"""
+Precomputed Payment Metrics
+
+One row per example holding the two inputs of the payment formulas
+(monlam_ui.payment_utils.calculate_payment):
+
+- syllables: count_tibetan_syllables() of the transcript
+- duration_minutes: meta 'duration' / 'audio_duration' (seconds) / 60
+
+The transcript is the example's latest TextLabel, or Example.text when it
+has none (right after import the two are the same).
+
+Rows are written:
+- at import time by Speech2TextJsonlDataset.save_batch (record_imported_examples)
+- when a TextLabel is saved/deleted or an Example is saved (signals)
+- by fill_missing_payment_metrics() for anything still missing
+  (`python manage.py backfill_payment_metrics` after deploying); readers
+  never fill gaps themselves, they only SUM
+
+Payment aggregation is then a grouped SUM over the join, e.g.:
+
+    ApproverCompletionStatus.objects.filter(project=p, status='approved')
+        .values('approver_id').annotate(**payment_sums())
+"""
+
+from django.db import models, transaction
+from django.db.models import Count, Exists, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+METRICS_CHUNK_SIZE = 2000
+
+UPDATE_FIELDS = ['project', 'syllables', 'duration_minutes', 'updated_at']
+
+
+class ExamplePaymentMetrics(models.Model):
+    """Syllable count and audio duration of one example."""
+    example = models.OneToOneField(
+        'examples.Example',
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='payment_metrics'
+    )
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    syllables = models.PositiveIntegerField(default=0)
+    duration_minutes = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'assignment_example_payment_metrics'
+
+    def __str__(self):
+        return f"Payment metrics for Example {self.example_id}: {self.syllables} syllables, {self.duration_minutes:.2f} min"
+
+
+def duration_minutes(meta):
+    """Audio duration in minutes from example meta (seconds under 'duration' or 'audio_duration')."""
+    if not meta or not isinstance(meta, dict):
+        return 0.0
+    duration = meta.get('duration', meta.get('audio_duration', 0.0))
+    if duration and isinstance(duration, (int, float)):
+        return float(duration) / 60.0
+    return 0.0
+
+
+def _metrics_rows(items):
+    """items: (example_id, project_id, transcript, meta) tuples."""
+    from monlam_ui.payment_utils import count_tibetan_syllables_many
+    items = list(items)
+    counts = count_tibetan_syllables_many(text for _, _, text, _ in items)
+    return [
+        ExamplePaymentMetrics(
+            example_id=example_id,
+            project_id=project_id,
+            syllables=syllables,
+            duration_minutes=duration_minutes(meta)
+        )
+        for (example_id, project_id, _, meta), syllables in zip(items, counts)
+    ]
+
+
+def _save(rows):
+    from .upserts import upsert
+    upsert(ExamplePaymentMetrics, rows, ['example'], UPDATE_FIELDS)
+    return len(rows)
+
+
+def refresh_payment_metrics(example_ids):
+    """
+    Recompute the metrics of the given examples from their current
+    transcript and meta. Returns the number of rows written.
+    """
+    from examples.models import Example
+    from labels.models import TextLabel
+
+    example_ids = sorted({pk for pk in example_ids if pk})
+    written = 0
+    for i in range(0, len(example_ids), METRICS_CHUNK_SIZE):
+        label_text = TextLabel.objects.filter(
+            example_id=OuterRef('pk')
+        ).order_by('-updated_at', '-id').values('text')[:1]
+        rows = Example.objects.filter(
+            pk__in=example_ids[i:i + METRICS_CHUNK_SIZE]
+        ).annotate(
+            label_text=Subquery(label_text)
+        ).values_list('id', 'project_id', 'label_text', 'text', 'meta')
+        written += _save(_metrics_rows(
+            (example_id, project_id, label or text, meta)
+            for example_id, project_id, label, text, meta in rows
+        ))
+    return written
+
+
+def record_imported_examples(examples):
+    """
+    Write metrics for freshly imported Example objects (no TextLabel yet,
+    so the transcript is Example.text). Ids are read back by uuid since
+    bulk_create does not set them on every backend.
+    """
+    from examples.models import Example
+
+    if not examples:
+        return 0
+    ids = dict(
+        Example.objects.filter(uuid__in=[e.uuid for e in examples]).values_list('uuid', 'id')
+    )
+    return _save(_metrics_rows(
+        (ids[e.uuid], e.project_id, e.text, e.meta)
+        for e in examples if e.uuid in ids
+    ))
+
+
+def fill_missing_payment_metrics(examples, chunk_size=METRICS_CHUNK_SIZE):
+    """
+    Compute metrics for examples in the queryset that have none
+    (anti-join, keyset chunks). Returns the number of rows written.
+    """
+    missing = examples.annotate(
+        has_metrics=Exists(ExamplePaymentMetrics.objects.filter(example_id=OuterRef('pk')))
+    ).filter(has_metrics=False)
+
+    written = 0
+    last_id = 0
+    while True:
+        ids = list(
+            missing.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        last_id = ids[-1]
+        written += refresh_payment_metrics(ids)
+    return written
+
+
+def payment_sums(example_path='example'):
+    """
+    Aggregate kwargs for .values(...).annotate(**payment_sums()) over rows
+    that point at an example: segments (row count), audio_minutes, syllables.
+    """
+    prefix = f'{example_path}__payment_metrics__'
+    return {
+        'segments': Count('pk'),
+        'audio_minutes': Coalesce(
+            Sum(f'{prefix}duration_minutes'), Value(0.0), output_field=models.FloatField()
+        ),
+        'syllables': Coalesce(
+            Sum(f'{prefix}syllables'), Value(0), output_field=models.IntegerField()
+        ),
+    }
+
+
+# ============================================================================
+# Signals
+# ============================================================================
+
+def _refresh_one(example_id):
+    # Savepoint: a failure must not abort the caller's transaction
+    try:
+        with transaction.atomic():
+            refresh_payment_metrics([example_id])
+    except Exception as e:
+        print(f'[Monlam Payment] ⚠️ Could not refresh metrics for example {example_id}: {e}')
+
+
+def _transcript_saved(sender, instance, **kwargs):
+    _refresh_one(instance.example_id)
+
+
+def _transcript_deleted(sender, instance, origin=None, **kwargs):
+    # Cascades from an Example / Project delete take the metrics row with them
+    origin_model = getattr(origin, 'model', type(origin))
+    if origin is not None and origin_model is not sender:
+        return
+    _refresh_one(instance.example_id)
+
+
+def _example_saved(sender, instance, **kwargs):
+    _refresh_one(instance.pk)
+
+
+def connect_payment_metrics_signals():
+    """Recompute an example's metrics when its TextLabel or meta/text changes."""
+    from django.db.models.signals import post_save, post_delete
+    from examples.models import Example
+    from labels.models import TextLabel
+
+    post_save.connect(
+        _transcript_saved,
+        sender=TextLabel,
+        dispatch_uid='monlam_payment_metrics_textlabel_saved'
+    )
+    post_delete.connect(
+        _transcript_deleted,
+        sender=TextLabel,
+        dispatch_uid='monlam_payment_metrics_textlabel_deleted'
+    )
+    post_save.connect(
+        _example_saved,
+        sender=Example,
+        dispatch_uid='monlam_payment_metrics_example_saved'
+    )
@@ -0,0 +1,154 @@
+"""
+Payment Rates
+
+Per project-name-prefix payment rates with effective-date ranges, editable
+in the Django admin (no deploy for a new project variant). Migration 0015
+seeds the rates that used to be hard-coded in monlam_ui.payment_utils.
+
+Lookups go through RateMatcher, built once from the table and kept in a
+process cache:
+- prefixes are indexed by length, so the longest-prefix match is one dict
+  probe per distinct prefix length (no re-sorting per call)
+- rates of a prefix are sorted newest first for the effective-date check
+- invalidated on PaymentRate post_save / post_delete in this process;
+  other processes converge within settings.MONLAM_PAYMENT_RATE_CACHE_TTL
+  (default 300s)
+- built lazily by the first lookup (not from AppConfig.ready(), which
+  also runs for migrate and every other manage.py command)
+
+An exact project name is just the longest possible prefix, so exact
+matches still win.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+_DEFAULT_TTL = 5 * 60
+
+_cache = {'matcher': None, 'expires': 0.0}
+_cache_lock = threading.Lock()
+
+
+class PaymentRate(models.Model):
+    """Rates for projects whose name starts with prefix, valid from/to the given dates."""
+    prefix = models.CharField(max_length=100, db_index=True)
+    audio_minute_rate = models.FloatField(default=0.0)
+    segment_rate = models.FloatField(null=True, blank=True)
+    syllable_rate = models.FloatField(null=True, blank=True)
+    effective_from = models.DateField(null=True, blank=True, help_text='Empty = since always')
+    effective_to = models.DateField(null=True, blank=True, help_text='Inclusive; empty = open-ended')
+    notes = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'assignment_payment_rate'
+        ordering = ['prefix', '-effective_from']
+
+    def __str__(self):
+        return f"{self.prefix} ({self.effective_from or '…'} - {self.effective_to or '…'})"
+
+    def as_config(self):
+        """The dict shape payment_utils.calculate_payment works with."""
+        return {
+            'id': self.id,
+            'prefix': self.prefix,
+            'audio_minute_rate': self.audio_minute_rate,
+            'segment_rate': self.segment_rate,
+            'syllable_rate': self.syllable_rate,
+            'effective_from': self.effective_from,
+            'effective_to': self.effective_to,
+        }
+
+
+def _effective(config, on):
+    return (
+        (config['effective_from'] is None or config['effective_from'] <= on) and
+        (config['effective_to'] is None or on <= config['effective_to'])
+    )
+
+
+class RateMatcher:
+    """Longest-prefix, effective-date rate lookup over a snapshot of PaymentRate."""
+
+    def __init__(self, configs):
+        self._by_prefix = {}
+        for config in configs:
+            self._by_prefix.setdefault(config['prefix'], []).append(config)
+        for rates in self._by_prefix.values():
+            # Newest first; open-start ranges last
+            rates.sort(key=lambda c: (c['effective_from'] is not None, c['effective_from']), reverse=True)
+        self._lengths = sorted({len(prefix) for prefix in self._by_prefix}, reverse=True)
+
+    def __len__(self):
+        return sum(len(rates) for rates in self._by_prefix.values())
+
+    def lookup(self, project_name, on=None):
+        """
+        Rate config for a project name on a date (default: today).
+
+        Tries prefixes longest first and returns the first one with a rate
+        effective on that date, or None.
+        """
+        if not project_name:
+            return None
+        if on is None:
+            on = timezone.localdate()
+        for length in self._lengths:
+            if length > len(project_name):
+                continue
+            rates = self._by_prefix.get(project_name[:length])
+            if not rates:
+                continue
+            for config in rates:
+                if _effective(config, on):
+                    return config
+        return None
+
+    def prefix(self, project_name):
+        """Longest configured prefix of the name (ignoring dates), or None."""
+        if not project_name:
+            return None
+        for length in self._lengths:
+            if length <= len(project_name) and project_name[:length] in self._by_prefix:
+                return project_name[:length]
+        return None
+
+
+def _ttl():
+    return getattr(settings, 'MONLAM_PAYMENT_RATE_CACHE_TTL', _DEFAULT_TTL)
+
+
+def get_matcher():
+    """The cached RateMatcher, rebuilt from the table when missing or expired."""
+    now = time.monotonic()
+    matcher = _cache['matcher']
+    if matcher is not None and _cache['expires'] > now:
+        return matcher
+    with _cache_lock:
+        if _cache['matcher'] is None or _cache['expires'] <= now:
+            _cache['matcher'] = RateMatcher(rate.as_config() for rate in PaymentRate.objects.all())
+            _cache['expires'] = now + _ttl()
+        return _cache['matcher']
+
+
+def invalidate_rate_cache():
+    with _cache_lock:
+        _cache['matcher'] = None
+        _cache['expires'] = 0.0
+
+
+def _rate_changed(sender, instance, **kwargs):
+    invalidate_rate_cache()
+
+
+def connect_rate_cache_signals():
+    """Drop the cached matcher whenever a rate is saved or deleted."""
+    from django.db.models.signals import post_save, post_delete
+
+    post_save.connect(_rate_changed, sender=PaymentRate, dispatch_uid='monlam_payment_rate_saved')
+    post_delete.connect(_rate_changed, sender=PaymentRate, dispatch_uid='monlam_payment_rate_deleted')
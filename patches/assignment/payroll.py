@@ -0,0 +1,282 @@
+"""
+Payroll
+
+Payment totals computed with grouped SQL over the precomputed per-example
+metrics (payment_metrics.ExamplePaymentMetrics, kept complete by import,
+signals and `manage.py backfill_payment_metrics`), then priced with the
+monlam_ui.payment_utils rates.
+
+Same rules as the analytics dashboard:
+- Annotators are paid for examples they submitted in the period
+  (AnnotationTracking.annotated_at in range, status submitted / reviewed / rejected)
+- Reviewers are paid for approvals made in the period
+  (ApproverCompletionStatus approved in range) on examples whose tracking
+  was reviewed in the period
+
+Rates are per project-name prefix and linear, so totals are summed per
+(user, prefix, effective rate) before pricing. Used by the analytics API
+(price_per_project), the payroll CSV export (GET /monlam/analytics/payroll/)
+and `python manage.py export_payroll`.
+"""
+
+from datetime import datetime, time, timedelta
+
+ANNOTATOR = 'annotator'
+REVIEWER = 'reviewer'
+
+CSV_HEADER = [
+    'username', 'role', 'project_prefix', 'projects',
+    'audio_minutes', 'segments', 'syllables',
+    'audio_payment', 'segment_payment', 'syllable_payment', 'total_rupees',
+]
+
+
+def period_bounds(start_date, end_date):
+    """Aware datetimes covering start_date 00:00 to end_date 23:59:59.999999."""
+    from django.utils import timezone
+    return (
+        timezone.make_aware(datetime.combine(start_date, time.min)),
+        timezone.make_aware(datetime.combine(end_date, time.max)),
+    )
+
+
+def month_dates(month):
+    """('YYYY-MM') -> (first day, last day) of that month."""
+    first = datetime.strptime(month, '%Y-%m').date()
+    next_month = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first, next_month - timedelta(days=1)
+
+
+def previous_month(today=None):
+    """'YYYY-MM' of the month before today (the default payroll period)."""
+    from django.utils import timezone
+    today = today or timezone.localdate()
+    return (today.replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
+
+
+def _rows(queryset, user_field, date_field, by_day):
+    from django.db.models.functions import TruncDate
+    from .payment_metrics import payment_sums
+
+    group = [user_field, 'example__project__name']
+    if by_day:
+        queryset = queryset.annotate(day=TruncDate(date_field))
+        group.append('day')
+    return [
+        {
+            'username': row[user_field],
+            'project_name': row['example__project__name'],
+            'day': row.get('day'),
+            'segments': row['segments'],
+            'audio_minutes': row['audio_minutes'],
+            'syllables': row['syllables'],
+        }
+        for row in queryset.values(*group).annotate(**payment_sums()).order_by()
+    ]
+
+
+def annotator_totals(projects, start, end, by_day=False):
+    """
+    Submitted work per (annotator, project[, day]) in [start, end].
+
+    Returns:
+        Rows {'username', 'project_name', 'day', 'segments', 'audio_minutes', 'syllables'}
+        ('day' is None unless by_day)
+    """
+    from .simple_tracking import AnnotationTracking
+
+    return _rows(
+        AnnotationTracking.objects.filter(
+            project__in=projects,
+            annotated_by__isnull=False,
+            annotated_at__gte=start,
+            annotated_at__lte=end,
+            status__in=['submitted', 'reviewed', 'rejected']
+        ),
+        'annotated_by__username', 'annotated_at', by_day
+    )
+
+
+def reviewer_totals(projects, start, end, by_day=False):
+    """
+    Approved reviews per (reviewer, project[, day]) in [start, end].
+
+    Returns:
+        Rows {'username', 'project_name', 'day', 'segments', 'audio_minutes', 'syllables'}
+        ('day' is None unless by_day)
+    """
+    from .simple_tracking import AnnotationTracking
+    from .completion_tracking import ApproverCompletionStatus
+
+    reviewed_in_range = AnnotationTracking.objects.filter(
+        project__in=projects,
+        status='reviewed',
+        reviewed_at__gte=start,
+        reviewed_at__lte=end
+    ).values('example_id')
+    return _rows(
+        ApproverCompletionStatus.objects.filter(
+            example_id__in=reviewed_in_range,
+            status='approved',  # ApproverCompletionStatus still uses 'approved'
+            reviewed_at__gte=start,
+            reviewed_at__lte=end
+        ),
+        'approver__username', 'reviewed_at', by_day
+    )
+
+
+def _by_prefix(rows, role):
+    """Group per-day rows by (user, prefix), and within that by the rate effective that day."""
+    from monlam_ui.payment_utils import get_project_payment_config
+
+    grouped = {}
+    for row in rows:
+        config = get_project_payment_config(row['project_name'], on=row['day'])
+        prefix = config['prefix'] if config else None
+        entry = grouped.setdefault((row['username'], prefix), {
+            'username': row['username'],
+            'role': role,
+            'project_prefix': prefix,
+            'projects': set(),
+            'rates': {},
+        })
+        entry['projects'].add(row['project_name'])
+        bucket = entry['rates'].setdefault(config['id'] if config else None, {
+            'config': config,
+            'segments': 0,
+            'audio_minutes': 0.0,
+            'syllables': 0,
+        })
+        bucket['segments'] += row['segments']
+        bucket['audio_minutes'] += row['audio_minutes']
+        bucket['syllables'] += row['syllables']
+    return grouped.values()
+
+
+def price_per_project(rows):
+    """
+    Price per-day rows the way compute_payroll does (each day at the rate
+    effective on it) and sum them per (user, project).
+
+    Returns:
+        {username: {project_name: {'audio_minutes', 'segments', 'syllables',
+        'total_rupees', 'configured', 'breakdown'}}}
+    """
+    from monlam_ui.payment_utils import calculate_payment, get_project_payment_config
+
+    buckets = {}
+    for row in rows:
+        config = get_project_payment_config(row['project_name'], on=row['day'])
+        bucket = buckets.setdefault((row['username'], row['project_name'], config['id'] if config else None), {
+            'config': config,
+            'segments': 0,
+            'audio_minutes': 0.0,
+            'syllables': 0,
+        })
+        bucket['segments'] += row['segments']
+        bucket['audio_minutes'] += row['audio_minutes']
+        bucket['syllables'] += row['syllables']
+
+    priced = {}
+    for (username, project_name, _), bucket in buckets.items():
+        payment = calculate_payment(
+            project_name=project_name,
+            total_audio_minutes=bucket['audio_minutes'],
+            approved_segments=bucket['segments'],
+            reviewed_syllables=bucket['syllables'],
+            is_reviewer=False,  # Reviewers get the same rates as annotators
+            config=bucket['config']
+        )
+        entry = priced.setdefault(username, {}).setdefault(project_name, {
+            'audio_minutes': 0.0,
+            'segments': 0,
+            'syllables': 0,
+            'total_rupees': 0.0,
+            'configured': False,
+            'breakdowns': [],
+        })
+        for key in ('audio_minutes', 'segments', 'syllables'):
+            entry[key] += bucket[key]
+        entry['total_rupees'] += payment['total_rupees']
+        if payment['configured']:
+            entry['configured'] = True
+            entry['breakdowns'].append(payment['breakdown'])
+
+    for projects in priced.values():
+        for entry in projects.values():
+            entry['breakdown'] = ' | '.join(entry.pop('breakdowns'))
+    return priced
+
+
+def compute_payroll(start, end, projects=None):
+    """
+    Payroll lines for every user and project prefix in [start, end].
+
+    Totals are grouped per day so each day is priced with the rate
+    effective on it (a rate change mid-month splits the line into one
+    priced bucket per rate).
+
+    Args:
+        start, end: Aware datetimes (inclusive)
+        projects: Project queryset (default: all projects)
+
+    Returns:
+        List of dicts with CSV_HEADER keys plus 'configured' and 'breakdown',
+        sorted by username, role and prefix. Projects without a payment
+        config appear with project_prefix None and zero payment.
+    """
+    from projects.models import Project
+    from monlam_ui.payment_utils import calculate_payment
+
+    if projects is None:
+        projects = Project.objects.all()
+
+    lines = []
+    for role, rows in (
+        (ANNOTATOR, annotator_totals(projects, start, end, by_day=True)),
+        (REVIEWER, reviewer_totals(projects, start, end, by_day=True)),
+    ):
+        for entry in _by_prefix(rows, role):
+            line = {
+                'username': entry['username'],
+                'role': role,
+                'project_prefix': entry['project_prefix'],
+                'projects': len(entry['projects']),
+                'audio_minutes': 0.0,
+                'segments': 0,
+                'syllables': 0,
+                'audio_payment': 0.0,
+                'segment_payment': 0.0,
+                'syllable_payment': 0.0,
+                'total_rupees': 0.0,
+                'configured': entry['project_prefix'] is not None,
+            }
+            breakdowns = []
+            for bucket in entry['rates'].values():
+                payment = calculate_payment(
+                    project_name=entry['project_prefix'],
+                    total_audio_minutes=bucket['audio_minutes'],
+                    approved_segments=bucket['segments'],
+                    reviewed_syllables=bucket['syllables'],
+                    is_reviewer=False,  # Reviewers get the same rates as annotators
+                    config=bucket['config']
+                )
+                for key in ('audio_minutes', 'segments', 'syllables'):
+                    line[key] += bucket[key]
+                for key in ('audio_payment', 'segment_payment', 'syllable_payment', 'total_rupees'):
+                    line[key] += payment[key]
+                breakdowns.append(payment['breakdown'])
+            for key in ('audio_minutes', 'audio_payment', 'segment_payment', 'syllable_payment', 'total_rupees'):
+                line[key] = round(line[key], 2)
+            line['breakdown'] = ' | '.join(breakdowns)
+            lines.append(line)
+
+    lines.sort(key=lambda line: (line['username'], line['role'], line['project_prefix'] or ''))
+    return lines
+
+
+def iter_payroll_csv_rows(lines):
+    """CSV rows (header first) for compute_payroll() output."""
+    yield CSV_HEADER
+    for line in lines:
+        yield [line[key] for key in CSV_HEADER]
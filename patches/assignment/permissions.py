@@ -28,13 +28,11 @@ def get_user_role(user, project_id):
         return ('superuser', True)
     
     try:
-        from projects.models import Member
-        member = Member.objects.filter(user=user, project_id=project_id).first()
-        if not member or not member.role:
+        from .role_service import get_role_name
+        role_name = get_role_name(user, project_id)
+        if not role_name:
             return (None, False)
         
-        role_name = member.role.name.lower() if member.role.name else ''
-        
         # Check for privileged roles
         is_privileged = any(r in role_name for r in ['admin', 'manager', 'approver'])
         
@@ -0,0 +1,396 @@
+"""
+Incremental Dataset Reconciliation
+
+Keeps ExampleState, AnnotationTracking and Assignment consistent with each
+other. This used to run inline on every GET of the dataset table
+(api_dataset_assignments "SYNC DIRECTION 1-4"); it now runs in the
+background (Celery task / management command) and only looks at examples
+whose rows changed since the last run for that project.
+
+Rules (same as the old inline sync):
+1. ExampleState confirmed -> AnnotationTracking has annotated_by -> Assignment submitted
+2. AnnotationTracking annotated -> ExampleState confirmed -> Assignment exists
+3. ExampleState with null confirmed_by picks it up from AnnotationTracking
+4. Assignment.status matches finished state + ApproverCompletionStatus
+"""
+
+import time
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+
+class ReconcileWatermark(models.Model):
+    """
+    Per-project high-water mark for the reconciler.
+
+    A row changed "since the last run" if its id is above the stored max id
+    or one of its timestamps is at/after last_run_at.
+    """
+    project = models.OneToOneField(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='reconcile_watermark'
+    )
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_state_id = models.BigIntegerField(default=0)
+    last_tracking_id = models.BigIntegerField(default=0)
+    last_assignment_id = models.BigIntegerField(default=0)
+    last_approval_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'assignment_reconcile_watermark'
+
+    def __str__(self):
+        return f"Reconcile watermark for Project {self.project_id} @ {self.last_run_at}"
+
+
+class DatasetReconciler:
+    """
+    Set-based reconciler for one project.
+
+    Usage:
+        result = DatasetReconciler(project).run()
+        result = DatasetReconciler(project, full=True, dry_run=True).run()
+    """
+
+    CHUNK_SIZE = 2000
+
+    def __init__(self, project, full=False, dry_run=False, chunk_size=None):
+        self.project = project
+        self.full = full
+        self.dry_run = dry_run
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.stats = {
+            'examples_checked': 0,
+            'tracking_created': 0,
+            'tracking_updated': 0,
+            'states_created': 0,
+            'states_updated': 0,
+            'assignments_created': 0,
+            'assignments_updated': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Change detection
+    # ------------------------------------------------------------------
+
+    def _max_id(self, queryset):
+        return queryset.aggregate(m=models.Max('id'))['m'] or 0
+
+    def changed_example_ids(self, watermark):
+        """Example ids in the project touched since the watermark."""
+        from examples.models import Example, ExampleState
+        from .simple_tracking import AnnotationTracking
+        from .models_separate import Assignment
+        from .completion_tracking import ApproverCompletionStatus
+
+        if self.full or watermark.last_run_at is None:
+            return set(
+                Example.objects.filter(project=self.project).values_list('id', flat=True)
+            )
+
+        since = watermark.last_run_at
+        ids = set()
+        ids.update(ExampleState.objects.filter(
+            example__project=self.project
+        ).filter(
+            Q(id__gt=watermark.last_state_id) | Q(confirmed_at__gte=since)
+        ).values_list('example_id', flat=True))
+        ids.update(AnnotationTracking.objects.filter(
+            project=self.project
+        ).filter(
+            Q(id__gt=watermark.last_tracking_id) |
+            Q(annotated_at__gte=since) |
+            Q(reviewed_at__gte=since)
+        ).values_list('example_id', flat=True))
+        ids.update(Assignment.objects.filter(
+            project=self.project
+        ).filter(
+            Q(id__gt=watermark.last_assignment_id) |
+            Q(started_at__gte=since) |
+            Q(submitted_at__gte=since) |
+            Q(reviewed_at__gte=since)
+        ).values_list('example_id', flat=True))
+        ids.update(ApproverCompletionStatus.objects.filter(
+            project=self.project
+        ).filter(
+            Q(id__gt=watermark.last_approval_id) | Q(reviewed_at__gte=since)
+        ).values_list('example_id', flat=True))
+        return ids
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def run(self):
+        from examples.models import ExampleState
+        from .simple_tracking import AnnotationTracking
+        from .models_separate import Assignment
+        from .completion_tracking import ApproverCompletionStatus
+
+        started = time.monotonic()
+        run_started_at = timezone.now()
+
+        watermark, _ = ReconcileWatermark.objects.get_or_create(project=self.project)
+
+        # Capture the id high-water marks before reading so rows inserted
+        # while we run are picked up next time
+        new_marks = {
+            'last_state_id': self._max_id(ExampleState.objects.filter(example__project=self.project)),
+            'last_tracking_id': self._max_id(AnnotationTracking.objects.filter(project=self.project)),
+            'last_assignment_id': self._max_id(Assignment.objects.filter(project=self.project)),
+            'last_approval_id': self._max_id(ApproverCompletionStatus.objects.filter(project=self.project)),
+        }
+
+        example_ids = sorted(self.changed_example_ids(watermark))
+        for i in range(0, len(example_ids), self.chunk_size):
+            self._reconcile_chunk(example_ids[i:i + self.chunk_size])
+
+        if not self.dry_run:
+            watermark.last_run_at = run_started_at
+            for field, value in new_marks.items():
+                setattr(watermark, field, value)
+            watermark.save()
+
+        self.stats['elapsed_seconds'] = round(time.monotonic() - started, 3)
+        return self.stats
+
+    def _reconcile_chunk(self, example_ids):
+        from examples.models import ExampleState
+        from .simple_tracking import AnnotationTracking
+        from .models_separate import Assignment
+        from .completion_tracking import ApproverCompletionStatus
+
+        project = self.project
+        now = timezone.now()
+        self.stats['examples_checked'] += len(example_ids)
+
+        states = {
+            s.example_id: s
+            for s in ExampleState.objects.filter(example_id__in=example_ids)
+        }
+        tracking_map = {
+            t.example_id: t
+            for t in AnnotationTracking.objects.filter(project=project, example_id__in=example_ids)
+        }
+        assignment_map = {
+            a.example_id: a
+            for a in Assignment.objects.filter(
+                project=project, is_active=True, example_id__in=example_ids
+            ).order_by('id')
+        }
+        approver_statuses = {}
+        for example_id, status in ApproverCompletionStatus.objects.filter(
+            project=project, example_id__in=example_ids
+        ).values_list('example_id', 'status'):
+            approver_statuses.setdefault(example_id, set()).add(status)
+
+        tracking_create, tracking_update = [], {}
+        state_create, state_update = [], {}
+        assignment_create, assignment_update = [], {}
+
+        def sync_assignment(example_id, tracking, annotator, create_status, create_submitted_at):
+            assignment = assignment_map.get(example_id)
+            if assignment:
+                if assignment.status in ['assigned', 'in_progress', 'pending'] and tracking.status == 'submitted':
+                    assignment.status = 'submitted'
+                    assignment.submitted_at = tracking.annotated_at or now
+                    if not assignment.assigned_to_id:
+                        assignment.assigned_to_id = annotator
+                    assignment_update[assignment.example_id] = assignment
+            elif annotator:
+                assignment = Assignment(
+                    project=project,
+                    example_id=example_id,
+                    assigned_to_id=annotator,
+                    status=create_status,
+                    submitted_at=create_submitted_at,
+                    is_active=True
+                )
+                assignment_map[example_id] = assignment
+                assignment_create.append(assignment)
+
+        # DIRECTION 1: ExampleState -> AnnotationTracking -> Assignment
+        for example_id, state in states.items():
+            if not state.confirmed_by_id:
+                continue
+            tracking = tracking_map.get(example_id)
+            if not tracking:
+                tracking = AnnotationTracking(
+                    project=project,
+                    example_id=example_id,
+                    annotated_by_id=state.confirmed_by_id,
+                    annotated_at=state.confirmed_at or now,
+                    status='submitted'
+                )
+                tracking_map[example_id] = tracking
+                tracking_create.append(tracking)
+            elif not tracking.annotated_by_id:
+                tracking.annotated_by_id = state.confirmed_by_id
+                tracking.annotated_at = state.confirmed_at or tracking.annotated_at or now
+                if tracking.status == 'pending':
+                    tracking.status = 'submitted'
+                tracking_update[example_id] = tracking
+            sync_assignment(
+                example_id, tracking, tracking.annotated_by_id,
+                'submitted', tracking.annotated_at or now
+            )
+
+        # DIRECTION 2 + 3: AnnotationTracking -> ExampleState -> Assignment
+        for example_id, tracking in tracking_map.items():
+            if not tracking.annotated_by_id:
+                continue
+            state = states.get(example_id)
+            if not state:
+                state = ExampleState(
+                    example_id=example_id,
+                    confirmed_by_id=tracking.annotated_by_id,
+                    confirmed_at=tracking.annotated_at or now
+                )
+                states[example_id] = state
+                state_create.append(state)
+            elif not state.confirmed_by_id:
+                state.confirmed_by_id = tracking.annotated_by_id
+                state.confirmed_at = tracking.annotated_at or state.confirmed_at or now
+                state_update[example_id] = state
+            submitted = tracking.status == 'submitted'
+            sync_assignment(
+                example_id, tracking, tracking.annotated_by_id,
+                'submitted' if submitted else 'in_progress',
+                tracking.annotated_at if submitted else None
+            )
+
+        # DIRECTION 4: Assignment.status matches finished state + approvals
+        for example_id, assignment in assignment_map.items():
+            state = states.get(example_id)
+            is_finished = state is not None and state.confirmed_by_id is not None
+            if not is_finished:
+                if assignment.status in ['approved', 'rejected', 'submitted']:
+                    original_status = assignment.status
+                    assignment.status = 'in_progress' if assignment.started_at else 'assigned'
+                    if original_status == 'submitted':
+                        assignment.submitted_at = None
+                    if original_status in ['approved', 'rejected']:
+                        assignment.reviewed_by_id = None
+                        assignment.reviewed_at = None
+                        assignment.review_notes = ''
+                    if assignment.pk:
+                        assignment_update[example_id] = assignment
+                continue
+
+            statuses = approver_statuses.get(example_id, set())
+            if 'rejected' in statuses:
+                expected_status = 'rejected'
+            elif 'approved' in statuses:
+                expected_status = 'approved'
+            else:
+                expected_status = 'submitted'
+            if assignment.status != expected_status:
+                assignment.status = expected_status
+                if expected_status == 'submitted' and not assignment.submitted_at:
+                    assignment.submitted_at = state.confirmed_at or now
+                if assignment.pk:
+                    assignment_update[example_id] = assignment
+
+        self.stats['tracking_created'] += len(tracking_create)
+        self.stats['tracking_updated'] += len(tracking_update)
+        self.stats['states_created'] += len(state_create)
+        self.stats['states_updated'] += len(state_update)
+        self.stats['assignments_created'] += len(assignment_create)
+        self.stats['assignments_updated'] += len(assignment_update)
+
+        if self.dry_run:
+            return
+
+        from .rollups import record_confirmation
+        from .upserts import inserted_rows
+        from .activity_events import ActivityEvent, record_bulk_events
+
+        inserted_tracking, inserted_states = [], []
+        with transaction.atomic():
+            if tracking_create:
+                AnnotationTracking.objects.bulk_create(tracking_create, ignore_conflicts=True)
+                inserted_tracking = inserted_rows(
+                    AnnotationTracking, tracking_create, ['example_id', 'annotated_by_id', 'annotated_at']
+                )
+            if tracking_update:
+                AnnotationTracking.objects.bulk_update(
+                    tracking_update.values(), ['annotated_by', 'annotated_at', 'status']
+                )
+            if state_create:
+                ExampleState.objects.bulk_create(state_create, ignore_conflicts=True)
+                inserted_states = inserted_rows(
+                    ExampleState, state_create, ['example_id', 'confirmed_by_id', 'confirmed_at']
+                )
+            if state_update:
+                ExampleState.objects.bulk_update(
+                    state_update.values(), ['confirmed_by', 'confirmed_at']
+                )
+            if assignment_create:
+                Assignment.objects.bulk_create(assignment_create)
+            if assignment_update:
+                Assignment.objects.bulk_update(
+                    assignment_update.values(),
+                    ['status', 'assigned_to', 'submitted_at', 'reviewed_by', 'reviewed_at', 'review_notes']
+                )
+
+        # bulk writes skip post_save: count the new confirmations in the rollups
+        # (created rows that won the insert + states that had no confirmed_by)
+        new_confirmations = inserted_states + list(state_update.values())
+        for state in new_confirmations:
+            try:
+                record_confirmation(project.id, state.confirmed_by_id, state.example_id, when=state.confirmed_at)
+            except Exception as e:
+                print(f'[Monlam Reconcile] ⚠️ Could not record confirmation for example {state.example_id}: {e}')
+
+        # ... and write the activity events the signals would have
+        record_bulk_events(ActivityEvent.CONFIRM, [
+            (project.id, s.example_id, s.confirmed_by_id, s.confirmed_at) for s in new_confirmations
+        ])
+        record_bulk_events(ActivityEvent.SUBMIT, [
+            (project.id, t.example_id, t.annotated_by_id, t.annotated_at)
+            for t in inserted_tracking + list(tracking_update.values())
+            if t.status == 'submitted'
+        ])
+
+
+_DEFAULT_REQUEUE_SECONDS = 60
+
+
+def schedule_reconcile(project_id):
+    """
+    Queue reconcile_project_task for a project, at most once per
+    settings.MONLAM_RECONCILE_REQUEUE_SECONDS (default 60s): dataset table
+    refreshes must not pile redundant reconciles onto the worker queue.
+
+    Returns:
+        True if a task was queued
+    """
+    from django.core.cache import cache
+
+    key = f'monlam:reconcile-queued:{project_id}'
+    timeout = getattr(settings, 'MONLAM_RECONCILE_REQUEUE_SECONDS', _DEFAULT_REQUEUE_SECONDS)
+    if not cache.add(key, True, timeout=timeout):
+        return False
+    try:
+        from .celery_tasks import reconcile_project_task
+        reconcile_project_task.delay(project_id)
+    except Exception as e:
+        cache.delete(key)
+        print(f'[Monlam Reconcile] ⚠️ Could not schedule reconcile for project {project_id}: {e}')
+        return False
+    return True
+
+
+def reconcile_project(project, full=False, dry_run=False):
+    """Run the reconciler for a single project and log a one-line summary."""
+    stats = DatasetReconciler(project, full=full, dry_run=dry_run).run()
+    if not dry_run and (stats['assignments_created'] or stats['assignments_updated']):
+        from .completion_view import mark_project_dirty
+        mark_project_dirty(project.id)
+    print(f'[Monlam Reconcile] Project {project.id}: {stats}')
+    return stats
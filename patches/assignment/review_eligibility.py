@@ -0,0 +1,114 @@
+"""
+Review Eligibility
+
+Shared approve/reject rules for AnnotationTrackingViewSet (tracking_api.py)
+and ApproverCompletionViewSet (completion_views.py):
+
+- Annotation approvers may review only submitted examples
+- Project admins may review only examples an annotation approver has approved
+- Project managers (and anyone else allowed by the view) are not restricted
+
+An example counts as submitted when its AnnotationTracking is 'submitted',
+its active Assignment is 'submitted', or it was confirmed (ExampleState) by
+a current project member or superuser.
+
+get_reviewable_example() loads the example with both answers annotated as
+EXISTS subqueries (joined to member roles), so a review click costs one
+query here instead of a tracking -> Assignment -> ExampleState -> Member
+chain plus one role lookup per existing approval.
+"""
+
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+
+from .roles import ROLE_ANNOTATION_APPROVER, ROLE_PROJECT_ADMIN
+
+
+def annotate_eligibility(queryset, project):
+    """Annotate an Example queryset with `is_submitted` and `annotation_approver_approved`."""
+    from examples.models import ExampleState
+    from projects.models import Member
+    from .models_separate import Assignment
+    from .simple_tracking import AnnotationTracking
+    from .completion_tracking import ApproverCompletionStatus
+
+    confirmed_by_member = ExampleState.objects.filter(
+        example_id=OuterRef('pk'),
+        confirmed_by__isnull=False
+    ).filter(
+        Q(confirmed_by__is_superuser=True) |
+        Q(Exists(Member.objects.filter(
+            project=project,
+            user_id=OuterRef('confirmed_by_id')
+        )))
+    )
+
+    approver_ids = Member.objects.filter(
+        project=project,
+        role__name__iexact=ROLE_ANNOTATION_APPROVER
+    ).values('user_id')
+
+    return queryset.annotate(
+        is_submitted=ExpressionWrapper(
+            Exists(AnnotationTracking.objects.filter(
+                project=project,
+                example_id=OuterRef('pk'),
+                status='submitted'
+            )) |
+            Exists(Assignment.objects.filter(
+                project=project,
+                example_id=OuterRef('pk'),
+                is_active=True,
+                status='submitted'
+            )) |
+            Exists(confirmed_by_member),
+            output_field=BooleanField()
+        ),
+        annotation_approver_approved=Exists(ApproverCompletionStatus.objects.filter(
+            example_id=OuterRef('pk'),
+            approver_id__in=approver_ids,
+            status='approved'
+        ))
+    )
+
+
+def get_reviewable_example(project, example_id):
+    """
+    Example annotated with `is_submitted` and `annotation_approver_approved`.
+
+    Returns:
+        Example instance, or None if it does not exist in the project
+    """
+    from examples.models import Example
+
+    example = annotate_eligibility(
+        Example.objects.filter(pk=example_id, project=project),
+        project
+    ).first()
+
+    if example is not None:
+        # Avoid a lazy project lookup in CompletionMatrixUpdater
+        example.project = project
+    return example
+
+
+def eligibility_error(example, user_role, verb='approve'):
+    """
+    Check the role-specific review rules for an example from get_reviewable_example().
+
+    Args:
+        verb: 'approve' or 'reject' (used in the error message)
+
+    Returns:
+        Error payload for a 403 response, or None if the user may review the example
+    """
+    if user_role == ROLE_ANNOTATION_APPROVER and not example.is_submitted:
+        return {
+            'error': f'Annotation approvers can only {verb} examples that have been submitted or confirmed by annotators.',
+            'requires_submission': True
+        }
+    if user_role == ROLE_PROJECT_ADMIN and not example.annotation_approver_approved:
+        return {
+            'error': f'Project admins can only {verb} examples that have been approved by an annotation approver first.',
+            'requires_approver_approval': True
+        }
+    return None
@@ -0,0 +1,124 @@
+"""
+Review Queue
+
+Per-role review queue as SQL querysets, used by next_for_review.
+Instead of building Python sets of every submitted example on each click,
+the next example is one keyset query:
+
+    WHERE project = ? AND <submitted> AND <role rule>
+      AND NOT EXISTS (approval by this reviewer)
+      AND id > current
+    ORDER BY id LIMIT 1
+
+backed by the examples pk, ExampleState(example) unique index and the
+ApproverCompletionStatus(example, approver) unique index.
+
+Counts for the position indicator come from ProjectStatusRollup (cheap,
+approximate); exact COUNT queries are only run on request.
+"""
+
+from django.db.models import Exists, OuterRef, Q, Sum
+
+from .roles import ROLE_ANNOTATION_APPROVER, ROLE_PROJECT_ADMIN, ROLE_PROJECT_MANAGER
+
+
+def submitted_examples(project):
+    """Examples that are confirmed (ExampleState) or submitted (AnnotationTracking)."""
+    from examples.models import Example, ExampleState
+    from .simple_tracking import AnnotationTracking
+
+    return Example.objects.filter(project=project).filter(
+        Q(Exists(ExampleState.objects.filter(
+            example_id=OuterRef('pk'),
+            confirmed_by__isnull=False
+        ))) |
+        Q(Exists(AnnotationTracking.objects.filter(
+            project=project,
+            example_id=OuterRef('pk'),
+            status='submitted'
+        )))
+    )
+
+
+def review_queue(project, role):
+    """
+    Examples a reviewer with this role may review (None for roles that cannot review).
+
+    - annotation_approver / project_manager: any submitted example
+    - project_admin: submitted examples an annotation_approver has approved
+    """
+    from projects.models import Member
+    from .completion_tracking import ApproverCompletionStatus
+
+    queue = submitted_examples(project)
+    if role == ROLE_PROJECT_ADMIN:
+        approver_ids = Member.objects.filter(
+            project=project,
+            role__name__iexact=ROLE_ANNOTATION_APPROVER
+        ).values('user_id')
+        return queue.filter(Exists(ApproverCompletionStatus.objects.filter(
+            example_id=OuterRef('pk'),
+            approver_id__in=approver_ids,
+            status='approved'
+        )))
+    if role in (ROLE_ANNOTATION_APPROVER, ROLE_PROJECT_MANAGER):
+        return queue
+    return None
+
+
+def unreviewed_by(queue, user):
+    """Restrict a queue to examples the user has not approved/rejected yet."""
+    from .completion_tracking import ApproverCompletionStatus
+
+    return queue.exclude(Exists(ApproverCompletionStatus.objects.filter(
+        example_id=OuterRef('pk'),
+        approver=user
+    )))
+
+
+def step(queue, current_example_id=None, direction='next'):
+    """
+    Keyset navigation with wrap-around.
+
+    Returns:
+        Next (or previous) example id after current_example_id, or None if the queue is empty
+    """
+    ids = queue.values_list('id', flat=True)
+    if current_example_id:
+        if direction == 'prev':
+            found = ids.filter(id__lt=current_example_id).order_by('-id').first()
+        else:
+            found = ids.filter(id__gt=current_example_id).order_by('id').first()
+        if found is not None:
+            return found
+    # Wrap around (or start at the beginning)
+    if direction == 'prev' and current_example_id:
+        return ids.order_by('-id').first()
+    return ids.order_by('id').first()
+
+
+def approximate_counts(project, user, role):
+    """
+    Queue size and this reviewer's progress from the status rollups.
+
+    Returns:
+        (total_in_queue, reviewed_by_user) or None if the project's rollups
+        have not been built yet
+    """
+    from .rollups import ProjectStatusRollup, rollups_built
+
+    if not rollups_built(project):
+        return None
+    rollups = ProjectStatusRollup.objects.filter(project=project)
+    totals = rollups.aggregate(
+        annotated=Sum('annotated'),
+        annotated_approved=Sum('annotated_approved'),
+    )
+    if totals['annotated'] is None:
+        return None
+
+    total = totals['annotated_approved'] if role == ROLE_PROJECT_ADMIN else totals['annotated']
+    mine = rollups.filter(user=user).values_list(
+        'reviewed_approved', 'reviewed_rejected'
+    ).first() or (0, 0)
+    return (total or 0, sum(mine))
@@ -0,0 +1,172 @@
+"""
+Role Resolution Service
+
+Single place to answer "is this user a member of this project, and with
+which role?". Permissions, tracking signals, review endpoints and the
+ExampleList patch all resolve the same (user, project) pair several times
+per request; this service answers it with at most one Member query.
+
+Two cache layers:
+- Per-request memo: thread-local, only active between Django's
+  request_started / request_finished signals.
+- Process cache: (user_id, project_id) -> role with a TTL
+  (settings.MONLAM_ROLE_CACHE_TTL, default 60s). Invalidated on
+  Member / Role post_save and post_delete in this process; other
+  processes converge within the TTL.
+
+role_cache_stats() reports hits/misses per layer.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+
+_DEFAULT_TTL = 60
+
+_local = threading.local()
+_process_cache = {}
+_process_lock = threading.Lock()
+_stats = {
+    'request_hits': 0,
+    'process_hits': 0,
+    'misses': 0,
+    'invalidations': 0,
+}
+
+
+def _ttl():
+    return getattr(settings, 'MONLAM_ROLE_CACHE_TTL', _DEFAULT_TTL)
+
+
+def _key(user, project):
+    user_id = getattr(user, 'id', user)
+    project_id = getattr(project, 'id', project)
+    return (int(user_id), int(project_id))
+
+
+def _request_memo():
+    return getattr(_local, 'memo', None)
+
+
+def _load(user_id, project_id):
+    """Query the Member row: returns (is_member, role_name_lower_or_None)."""
+    from projects.models import Member
+
+    row = Member.objects.filter(
+        user_id=user_id,
+        project_id=project_id
+    ).values_list('id', 'role__name').first()
+    if row is None:
+        return (False, None)
+    role_name = row[1]
+    return (True, role_name.lower().strip() if role_name else None)
+
+
+def resolve(user, project):
+    """
+    Resolve a user's membership and role in a project.
+
+    Args:
+        user: User instance or user id
+        project: Project instance or project id
+
+    Returns:
+        tuple: (is_member, role_name) - role_name is lowercased, or None
+    """
+    if user is None or project is None:
+        return (False, None)
+    key = _key(user, project)
+
+    memo = _request_memo()
+    if memo is not None and key in memo:
+        _stats['request_hits'] += 1
+        return memo[key]
+
+    now = time.monotonic()
+    cached = _process_cache.get(key)
+    if cached is not None and cached[1] > now:
+        _stats['process_hits'] += 1
+        value = cached[0]
+    else:
+        _stats['misses'] += 1
+        value = _load(*key)
+        with _process_lock:
+            _process_cache[key] = (value, now + _ttl())
+
+    if memo is not None:
+        memo[key] = value
+    return value
+
+
+def get_role_name(user, project):
+    """Lowercased role name of the user in the project, or None."""
+    return resolve(user, project)[1]
+
+
+def is_project_member(user, project):
+    """True if the user has a Member row in the project."""
+    return resolve(user, project)[0]
+
+
+def invalidate(user_id=None, project_id=None):
+    """Drop cached roles for a user/project pair (or everything if both are None)."""
+    _stats['invalidations'] += 1
+    with _process_lock:
+        if user_id is None and project_id is None:
+            _process_cache.clear()
+        else:
+            for key in list(_process_cache.keys()):
+                if (user_id is None or key[0] == user_id) and (project_id is None or key[1] == project_id):
+                    _process_cache.pop(key, None)
+    memo = _request_memo()
+    if memo is not None:
+        memo.clear()
+
+
+def role_cache_stats():
+    """Hit/miss counters for this process."""
+    lookups = _stats['request_hits'] + _stats['process_hits'] + _stats['misses']
+    hits = _stats['request_hits'] + _stats['process_hits']
+    return {
+        **_stats,
+        'lookups': lookups,
+        'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+        'cached_entries': len(_process_cache),
+        'ttl_seconds': _ttl(),
+    }
+
+
+# ============================================================================
+# Signals
+# ============================================================================
+
+def _start_request_memo(sender, **kwargs):
+    _local.memo = {}
+
+
+def _end_request_memo(sender, **kwargs):
+    _local.memo = None
+
+
+def _member_changed(sender, instance, **kwargs):
+    invalidate(user_id=instance.user_id, project_id=instance.project_id)
+
+
+def _role_changed(sender, instance, **kwargs):
+    invalidate()
+
+
+def connect_role_cache_signals():
+    """Connect request memo lifecycle and Member/Role invalidation receivers."""
+    from django.core.signals import request_started, request_finished
+    from django.db.models.signals import post_save, post_delete
+    from projects.models import Member
+    from roles.models import Role
+
+    request_started.connect(_start_request_memo, dispatch_uid='monlam_role_memo_start')
+    request_finished.connect(_end_request_memo, dispatch_uid='monlam_role_memo_end')
+    post_save.connect(_member_changed, sender=Member, dispatch_uid='monlam_role_cache_member_saved')
+    post_delete.connect(_member_changed, sender=Member, dispatch_uid='monlam_role_cache_member_deleted')
+    post_save.connect(_role_changed, sender=Role, dispatch_uid='monlam_role_cache_role_saved')
+    post_delete.connect(_role_changed, sender=Role, dispatch_uid='monlam_role_cache_role_deleted')
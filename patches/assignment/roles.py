@@ -34,25 +34,17 @@ class ProjectManagerMixin:
     @staticmethod
     def _get_member_role(user, project):
         """
-        Get user's Member record and role name.
+        Get user's membership and role name (via the shared role service).
         
         Returns:
-            tuple: (member, role_name) or (None, None)
+            tuple: (is_member, role_name) or (False, None)
         """
         try:
-            from projects.models import Member
-            project_id = project.id if hasattr(project, 'id') else project
-            member = Member.objects.filter(
-                project_id=project_id, 
-                user=user
-            ).select_related('role').first()
-            
-            if member and member.role:
-                return (member, member.role.name.lower() if member.role.name else '')
-            return (member, None)
+            from .role_service import resolve
+            return resolve(user, project)
         except Exception as e:
             print(f'[Monlam Roles] Error getting member role: {e}')
-            return (None, None)
+            return (False, None)
     
     @staticmethod
     def is_project_manager(user, project):
@@ -0,0 +1,518 @@
+"""
+Status Rollups
+
+Precomputed per-user counters so the completion and analytics dashboards
+read O(users) / O(users x days) rows instead of scanning ExampleState,
+AnnotationTracking and ApproverCompletionStatus on every request.
+
+- ProjectStatusRollup: all-time counters per (project, user)
+- UserDailyRollup: per-day counters per (project, user, date)
+
+Counters are kept current with atomic F() increments from:
+- ExampleState post_save (created) / post_delete  -> confirmations
+- CompletionMatrixUpdater.update_approver_status  -> approvals / rejections
+
+`python manage.py rebuild_rollups` recomputes everything from the raw
+tables (use after deploying, or if counters ever drift). Each rebuild
+stamps RollupBuild.built_at; until a project has been built its counters
+only cover changes made since deploy, so readers check rollups_built()
+(not "any rollup row exists": the first bump after deploy creates one)
+and ensure_rollups() queues the rebuild on rebuild_rollups_task.
+
+An example's review status is 'approved' if any approver approved it,
+else 'rejected' if any approver rejected it (same precedence as the
+completion dashboard).
+"""
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class ProjectStatusRollup(models.Model):
+    """All-time counters for one user in one project."""
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='status_rollups'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='status_rollups'
+    )
+
+    # As annotator (examples confirmed by this user)
+    annotated = models.IntegerField(default=0)
+    annotated_approved = models.IntegerField(default=0)
+    annotated_rejected = models.IntegerField(default=0)
+
+    # As approver (ApproverCompletionStatus rows owned by this user)
+    reviewed_approved = models.IntegerField(default=0)
+    reviewed_rejected = models.IntegerField(default=0)
+    final_approved = models.IntegerField(default=0)  # approvals while project_admin
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'assignment_project_status_rollup'
+        unique_together = [('project', 'user')]
+
+    def __str__(self):
+        return f"Rollup for {self.user_id} in Project {self.project_id}"
+
+
+class UserDailyRollup(models.Model):
+    """Per-day counters for one user in one project."""
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='daily_rollups'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='daily_rollups'
+    )
+    date = models.DateField(db_index=True)
+
+    # As annotator
+    confirmed = models.IntegerField(default=0)
+    annotated_approved = models.IntegerField(default=0)  # credited on the review day
+    annotated_rejected = models.IntegerField(default=0)
+
+    # As approver
+    approved = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    final_approved = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'assignment_user_daily_rollup'
+        unique_together = [('project', 'user', 'date')]
+        indexes = [
+            models.Index(fields=['project', 'date'], name='daily_rollup_proj_date_idx'),
+            models.Index(fields=['date', 'user'], name='daily_rollup_date_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"Daily rollup for {self.user_id} in Project {self.project_id} on {self.date}"
+
+
+class RollupBuild(models.Model):
+    """Marks a project whose rollups were rebuilt from the raw tables."""
+    project = models.OneToOneField(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='rollup_build'
+    )
+    queued_at = models.DateTimeField(null=True, blank=True)
+    built_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'assignment_rollup_build'
+
+    def __str__(self):
+        return f"Rollup build for Project {self.project_id} @ {self.built_at}"
+
+
+# ============================================================================
+# Incremental updates
+# ============================================================================
+
+def _bump(model, keys, **deltas):
+    """Atomically add deltas to the row identified by keys, creating it if missing."""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    increments = {field: F(field) + value for field, value in deltas.items()}
+    if model.objects.filter(**keys).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **deltas)
+    except IntegrityError:
+        # Lost a race with a concurrent create - the row exists now
+        model.objects.filter(**keys).update(**increments)
+
+
+def _bump_user(project_id, user_id, when=None, rollup=None, daily=None):
+    if not user_id:
+        return
+    if rollup:
+        _bump(ProjectStatusRollup, {'project_id': project_id, 'user_id': user_id}, **rollup)
+    if daily:
+        day = timezone.localdate(when or timezone.now())
+        _bump(UserDailyRollup, {'project_id': project_id, 'user_id': user_id, 'date': day}, **daily)
+
+
+def example_review_status(example_id):
+    """'approved', 'rejected' or None for an example (approved takes precedence)."""
+    from .completion_tracking import ApproverCompletionStatus
+
+    statuses = set(
+        ApproverCompletionStatus.objects.filter(
+            example_id=example_id,
+            status__in=['approved', 'rejected']
+        ).values_list('status', flat=True)
+    )
+    return _review_status(statuses)
+
+
+def _review_status(statuses):
+    if 'approved' in statuses:
+        return 'approved'
+    if 'rejected' in statuses:
+        return 'rejected'
+    return None
+
+
+def example_review_statuses(example_ids):
+    """{example_id: 'approved' / 'rejected'} for many examples in one query (unreviewed ones omitted)."""
+    from .completion_tracking import ApproverCompletionStatus
+
+    statuses = {}
+    for example_id, status in ApproverCompletionStatus.objects.filter(
+        example_id__in=example_ids,
+        status__in=['approved', 'rejected']
+    ).values_list('example_id', 'status'):
+        statuses.setdefault(example_id, set()).add(status)
+    return {example_id: _review_status(s) for example_id, s in statuses.items()}
+
+
+def _is_project_admin(user_id, project_id):
+    from .role_service import get_role_name
+    from .roles import ROLE_PROJECT_ADMIN
+
+    return get_role_name(user_id, project_id) == ROLE_PROJECT_ADMIN
+
+
+def _annotator_id(example_id):
+    from examples.models import ExampleState
+
+    return ExampleState.objects.filter(
+        example_id=example_id,
+        confirmed_by__isnull=False
+    ).values_list('confirmed_by_id', flat=True).first()
+
+
+def record_confirmation(project_id, user_id, example_id, when=None, delta=1):
+    """Count (delta=1) or un-count (delta=-1) an ExampleState confirmation."""
+    rollup = {'annotated': delta}
+    current = example_review_status(example_id)
+    if current == 'approved':
+        rollup['annotated_approved'] = delta
+    elif current == 'rejected':
+        rollup['annotated_rejected'] = delta
+    _bump_user(project_id, user_id, when, rollup=rollup, daily={'confirmed': delta})
+
+
+def record_review(example, approver, previous_status, new_status, example_status_before, when=None):
+    """
+    Apply the counter changes caused by one ApproverCompletionStatus write.
+
+    Args:
+        example: Example instance
+        approver: User who approved/rejected
+        previous_status: that approver's status before the write (None if new)
+        new_status: 'approved', 'rejected' or 'pending'
+        example_status_before: example_review_status() before the write
+    """
+    if previous_status == new_status:
+        return
+    project_id = example.project_id
+    when = when or timezone.now()
+
+    # Approver side
+    is_admin = _is_project_admin(approver.id, project_id)
+    rollup, daily = {}, {}
+    for status, sign in ((previous_status, -1), (new_status, 1)):
+        if status == 'approved':
+            rollup['reviewed_approved'] = rollup.get('reviewed_approved', 0) + sign
+            daily['approved'] = daily.get('approved', 0) + sign
+            if is_admin:
+                rollup['final_approved'] = rollup.get('final_approved', 0) + sign
+                daily['final_approved'] = daily.get('final_approved', 0) + sign
+        elif status == 'rejected':
+            rollup['reviewed_rejected'] = rollup.get('reviewed_rejected', 0) + sign
+            daily['rejected'] = daily.get('rejected', 0) + sign
+    _bump_user(project_id, approver.id, when, rollup=rollup, daily=daily)
+
+    # Annotator side (example-level status transition)
+    example_status_after = example_review_status(example.id)
+    if example_status_after == example_status_before:
+        return
+    annotator_id = _annotator_id(example.id)
+    rollup, daily = {}, {}
+    for status, sign in ((example_status_before, -1), (example_status_after, 1)):
+        if status in ('approved', 'rejected'):
+            field = f'annotated_{status}'
+            rollup[field] = rollup.get(field, 0) + sign
+            daily[field] = daily.get(field, 0) + sign
+    _bump_user(project_id, annotator_id, when, rollup=rollup, daily=daily)
+
+
+def record_reviews(project_id, approver, previous_statuses, new_status, statuses_before, statuses_after, when=None):
+    """
+    Set-based record_review() for one approver reviewing many examples.
+
+    Args:
+        previous_statuses: {example_id: approver's status before the write (None if new)}
+        new_status: status written for every example
+        statuses_before / statuses_after: example_review_statuses() around the write
+    """
+    from examples.models import ExampleState
+
+    when = when or timezone.now()
+
+    # Approver side
+    is_admin = _is_project_admin(approver.id, project_id)
+    rollup, daily = {}, {}
+    for previous_status in previous_statuses.values():
+        if previous_status == new_status:
+            continue
+        for status, sign in ((previous_status, -1), (new_status, 1)):
+            if status == 'approved':
+                rollup['reviewed_approved'] = rollup.get('reviewed_approved', 0) + sign
+                daily['approved'] = daily.get('approved', 0) + sign
+                if is_admin:
+                    rollup['final_approved'] = rollup.get('final_approved', 0) + sign
+                    daily['final_approved'] = daily.get('final_approved', 0) + sign
+            elif status == 'rejected':
+                rollup['reviewed_rejected'] = rollup.get('reviewed_rejected', 0) + sign
+                daily['rejected'] = daily.get('rejected', 0) + sign
+    _bump_user(project_id, approver.id, when, rollup=rollup, daily=daily)
+
+    # Annotator side (example-level status transitions)
+    changed = [
+        example_id for example_id in previous_statuses
+        if statuses_before.get(example_id) != statuses_after.get(example_id)
+    ]
+    if not changed:
+        return
+    per_annotator = {}
+    for example_id, annotator_id in ExampleState.objects.filter(
+        example_id__in=changed,
+        confirmed_by__isnull=False
+    ).values_list('example_id', 'confirmed_by_id'):
+        counts = per_annotator.setdefault(annotator_id, {})
+        for status, sign in ((statuses_before.get(example_id), -1), (statuses_after.get(example_id), 1)):
+            if status in ('approved', 'rejected'):
+                field = f'annotated_{status}'
+                counts[field] = counts.get(field, 0) + sign
+    for annotator_id, counts in per_annotator.items():
+        _bump_user(project_id, annotator_id, when, rollup=counts, daily=counts)
+
+
+# ============================================================================
+# Signals
+# ============================================================================
+
+def _example_state_saved(sender, instance, created, **kwargs):
+    if not created or not instance.confirmed_by_id:
+        return
+    try:
+        record_confirmation(
+            instance.example.project_id,
+            instance.confirmed_by_id,
+            instance.example_id,
+            when=instance.confirmed_at
+        )
+    except Exception as e:
+        print(f'[Monlam Rollup] ⚠️ Could not record confirmation: {e}')
+
+
+def _example_state_deleted(sender, instance, **kwargs):
+    if not instance.confirmed_by_id:
+        return
+    try:
+        record_confirmation(
+            instance.example.project_id,
+            instance.confirmed_by_id,
+            instance.example_id,
+            when=instance.confirmed_at,
+            delta=-1
+        )
+    except Exception as e:
+        print(f'[Monlam Rollup] ⚠️ Could not record un-confirmation: {e}')
+
+
+def connect_rollup_signals():
+    """Connect ExampleState receivers that keep the rollups current."""
+    from django.db.models.signals import post_save, post_delete
+    from examples.models import ExampleState
+
+    post_save.connect(
+        _example_state_saved,
+        sender=ExampleState,
+        dispatch_uid='monlam_rollup_example_state_saved'
+    )
+    post_delete.connect(
+        _example_state_deleted,
+        sender=ExampleState,
+        dispatch_uid='monlam_rollup_example_state_deleted'
+    )
+
+
+# ============================================================================
+# Rebuild
+# ============================================================================
+
+def rebuild_rollups(project):
+    """
+    Recompute both rollup tables for a project from the raw tables.
+
+    Uses grouped aggregate queries; returns the number of rows written.
+    """
+    from django.db.models import Count, OuterRef, Q, Subquery
+    from django.db.models.functions import Coalesce, TruncDate
+    from examples.models import ExampleState
+    from projects.models import Member
+    from .completion_tracking import ApproverCompletionStatus
+    from .roles import ROLE_PROJECT_ADMIN
+
+    admin_ids = set(
+        Member.objects.filter(
+            project=project,
+            role__name__iexact=ROLE_PROJECT_ADMIN
+        ).values_list('user_id', flat=True)
+    )
+
+    approvals = ApproverCompletionStatus.objects.filter(project=project)
+    approved_examples = approvals.filter(status='approved').values('example_id')
+    rejected_examples = approvals.filter(status='rejected').values('example_id')
+
+    states = ExampleState.objects.filter(
+        example__project=project,
+        confirmed_by__isnull=False
+    )
+
+    totals = {}
+    daily = {}
+
+    def row(user_id):
+        return totals.setdefault(user_id, {})
+
+    def day_row(user_id, day):
+        return daily.setdefault((user_id, day), {})
+
+    # Annotator totals
+    for r in states.values('confirmed_by_id').annotate(
+        annotated=Count('id'),
+        annotated_approved=Count('id', filter=Q(example_id__in=approved_examples)),
+        annotated_rejected=Count(
+            'id',
+            filter=Q(example_id__in=rejected_examples) & ~Q(example_id__in=approved_examples)
+        ),
+    ):
+        row(r['confirmed_by_id']).update(
+            annotated=r['annotated'],
+            annotated_approved=r['annotated_approved'],
+            annotated_rejected=r['annotated_rejected'],
+        )
+
+    # Annotator daily confirmations
+    for r in states.filter(confirmed_at__isnull=False).annotate(
+        day=TruncDate('confirmed_at')
+    ).values('confirmed_by_id', 'day').annotate(n=Count('id')):
+        day_row(r['confirmed_by_id'], r['day'])['confirmed'] = r['n']
+
+    # Approver totals and daily
+    for r in approvals.values('approver_id').annotate(
+        reviewed_approved=Count('id', filter=Q(status='approved')),
+        reviewed_rejected=Count('id', filter=Q(status='rejected')),
+    ):
+        row(r['approver_id']).update(
+            reviewed_approved=r['reviewed_approved'],
+            reviewed_rejected=r['reviewed_rejected'],
+            final_approved=r['reviewed_approved'] if r['approver_id'] in admin_ids else 0,
+        )
+
+    for r in approvals.filter(reviewed_at__isnull=False).annotate(
+        day=TruncDate('reviewed_at')
+    ).values('approver_id', 'day').annotate(
+        approved=Count('id', filter=Q(status='approved')),
+        rejected=Count('id', filter=Q(status='rejected')),
+    ):
+        d = day_row(r['approver_id'], r['day'])
+        d['approved'] = r['approved']
+        d['rejected'] = r['rejected']
+        if r['approver_id'] in admin_ids:
+            d['final_approved'] = r['approved']
+
+    # Annotator side of reviews, credited on the day of the deciding review:
+    # the latest approval if any (approved takes precedence), else the latest rejection
+    def latest(status):
+        return Subquery(
+            approvals.filter(
+                example_id=OuterRef('example_id'),
+                status=status,
+                reviewed_at__isnull=False
+            ).order_by('-reviewed_at').values('reviewed_at')[:1]
+        )
+
+    for r in states.annotate(
+        approved_at=latest('approved'),
+        rejected_at=latest('rejected')
+    ).filter(
+        Q(approved_at__isnull=False) | Q(rejected_at__isnull=False)
+    ).annotate(
+        day=TruncDate(Coalesce('approved_at', 'rejected_at'))
+    ).values('confirmed_by_id', 'day').annotate(
+        approved=Count('id', filter=Q(approved_at__isnull=False)),
+        rejected=Count('id', filter=Q(approved_at__isnull=True)),
+    ).order_by():
+        d = day_row(r['confirmed_by_id'], r['day'])
+        for status in ('approved', 'rejected'):
+            if r[status]:
+                field = f'annotated_{status}'
+                d[field] = d.get(field, 0) + r[status]
+
+    with transaction.atomic():
+        ProjectStatusRollup.objects.filter(project=project).delete()
+        UserDailyRollup.objects.filter(project=project).delete()
+        ProjectStatusRollup.objects.bulk_create([
+            ProjectStatusRollup(project=project, user_id=user_id, **counts)
+            for user_id, counts in totals.items() if user_id
+        ], batch_size=1000)
+        UserDailyRollup.objects.bulk_create([
+            UserDailyRollup(project=project, user_id=user_id, date=day, **counts)
+            for (user_id, day), counts in daily.items() if user_id and day
+        ], batch_size=1000)
+        RollupBuild.objects.update_or_create(project=project, defaults={'built_at': timezone.now()})
+
+    return len(totals) + len(daily)
+
+
+def rollups_built(project):
+    """True once rebuild_rollups() has run for the project."""
+    return RollupBuild.objects.filter(project=project, built_at__isnull=False).exists()
+
+
+REBUILD_REQUEUE_SECONDS = 15 * 60
+
+
+def ensure_rollups(project):
+    """
+    True if the project's rollups are built; otherwise queue a rebuild on
+    the Celery worker (at most once per REBUILD_REQUEUE_SECONDS) and
+    return False. Never rebuilds inline.
+    """
+    from datetime import timedelta
+
+    build = RollupBuild.objects.filter(project=project).first()
+    if build is not None and build.built_at:
+        return True
+    now = timezone.now()
+    if build is not None and build.queued_at and build.queued_at > now - timedelta(seconds=REBUILD_REQUEUE_SECONDS):
+        return False
+    if build is None:
+        RollupBuild.objects.get_or_create(project=project, defaults={'queued_at': now})
+    else:
+        RollupBuild.objects.filter(pk=build.pk).update(queued_at=now)
+    try:
+        from .celery_tasks import rebuild_rollups_task
+        rebuild_rollups_task.delay(project.id)
+    except Exception as e:
+        print(f'[Monlam Rollup] ⚠️ Could not queue rollup rebuild for project {project.id}: {e}')
+    return False
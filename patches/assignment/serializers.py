@@ -48,6 +48,86 @@ class AssignmentSerializer(serializers.Serializer):
     final_approval_at = serializers.SerializerMethodField()
     has_final_approval = serializers.SerializerMethodField()
     
+    # ------------------------------------------------------------------
+    # Lookup helpers
+    #
+    # When the serializer is given a batch context (see
+    # build_assignment_context), every lookup is a dict read. Without it,
+    # each helper falls back to a per-row query so single-object use keeps
+    # working unchanged.
+    # ------------------------------------------------------------------
+
+    def _batch(self):
+        return self.context.get('batch')
+
+    def _get_state(self, obj):
+        """ExampleState for the assignment's example (or None)."""
+        batch = self._batch()
+        if batch is not None:
+            return batch['states'].get(obj.example_id)
+        from examples.models import ExampleState
+        return ExampleState.objects.filter(
+            example_id=obj.example_id
+        ).select_related('confirmed_by').first()
+
+    def _get_tracking(self, obj):
+        """AnnotationTracking for the assignment's example (or None)."""
+        batch = self._batch()
+        if batch is not None:
+            return batch['tracking'].get(obj.example_id)
+        from assignment.simple_tracking import AnnotationTracking
+        return AnnotationTracking.objects.filter(
+            project_id=obj.project_id,
+            example_id=obj.example_id
+        ).select_related('annotated_by').first()
+
+    def _get_approver_statuses(self, obj):
+        """All ApproverCompletionStatus rows for the example, newest review first."""
+        batch = self._batch()
+        if batch is not None:
+            return batch['approvals'].get(obj.example_id, [])
+        from assignment.completion_tracking import ApproverCompletionStatus
+        return list(ApproverCompletionStatus.objects.filter(
+            example_id=obj.example_id,
+            project_id=obj.project_id
+        ).select_related('approver').order_by('-reviewed_at'))
+
+    def _get_role(self, user_id, project_id):
+        """Lowercased role name of a user in the project (or None)."""
+        if user_id is None:
+            return None
+        batch = self._batch()
+        if batch is not None:
+            return batch['member_roles'].get(user_id)
+        from assignment.role_service import get_role_name
+        return get_role_name(user_id, project_id)
+
+    def _get_approval_by_role(self, obj, role):
+        """First 'approved' ApproverCompletionStatus whose approver has the given role."""
+        for approval in self._get_approver_statuses(obj):
+            if approval.status != 'approved':
+                continue
+            if self._get_role(approval.approver_id, obj.project_id) == role:
+                return approval
+        return None
+
+    def _get_annotator(self, obj):
+        """Who actually annotated: tracking, then ExampleState, then assignee."""
+        try:
+            tracking = self._get_tracking(obj)
+            if tracking and tracking.annotated_by:
+                return tracking.annotated_by
+            
+            # Fallback: check ExampleState if no tracking
+            state = self._get_state(obj)
+            if state and state.confirmed_by:
+                return state.confirmed_by
+        except Exception:
+            pass
+        
+        # Final fallback: use assigned_to
+        return obj.assigned_to
+
     def get_status(self, obj):
         """
         Compute status based on:
@@ -58,169 +138,67 @@ class AssignmentSerializer(serializers.Serializer):
         """
         try:
             # First check if example is finished (ExampleState.confirmed_by exists)
-            from examples.models import ExampleState
-            example_state = ExampleState.objects.filter(
-                example=obj.example
-            ).select_related('confirmed_by').first()
-            
-            is_finished = example_state and example_state.confirmed_by is not None
-            
-            # Debug logging for specific examples that show the issue
-            if obj.example_id in [615, 616, 617, 618, 619]:
-                print(f'[Serializer Debug] Example {obj.example_id}: is_finished={is_finished}, ExampleState.confirmed_by={example_state.confirmed_by.username if example_state and example_state.confirmed_by else "NULL"}, Assignment.status={obj.status}')
+            example_state = self._get_state(obj)
+            is_finished = example_state is not None and example_state.confirmed_by_id is not None
             
             # If not finished, return annotator progress status (never show submitted/approved/rejected)
             if not is_finished:
                 # Unfinished examples can only be 'assigned' or 'in_progress'
                 # Never 'submitted', 'approved', or 'rejected' because those require the example to be finished
-                if obj.status in ['approved', 'rejected', 'submitted']:
-                    # If assignment says approved/rejected/submitted but example isn't finished, fix it
-                    if obj.started_at:
-                        return 'in_progress'
-                    else:
-                        return 'assigned'
-                # If status is already 'assigned' or 'in_progress', return it
                 if obj.status in ['assigned', 'in_progress']:
                     return obj.status
-                # Fallback: determine based on whether work has started
+                # Assignment says approved/rejected/submitted (or something unknown)
+                # but the example isn't finished - derive from whether work has started
                 if obj.started_at:
                     return 'in_progress'
-                else:
-                    return 'assigned'
+                return 'assigned'
             
             # Example is finished - check ApproverCompletionStatus for approval status
-            from assignment.completion_tracking import ApproverCompletionStatus
-            
-            # Check for rejections first (rejected takes precedence)
-            has_rejection = ApproverCompletionStatus.objects.filter(
-                example=obj.example,
-                project=obj.project,
-                status='rejected'
-            ).exists()
+            statuses = {a.status for a in self._get_approver_statuses(obj)}
             
-            if has_rejection:
+            # Rejected takes precedence
+            if 'rejected' in statuses:
                 return 'rejected'
-            
-            # Check for approvals
-            has_approval = ApproverCompletionStatus.objects.filter(
-                example=obj.example,
-                project=obj.project,
-                status='approved'
-            ).exists()
-            
-            if has_approval:
+            if 'approved' in statuses:
                 return 'approved'
             
             # Finished but not yet approved/rejected = submitted
             return 'submitted'
             
-        except Exception as e:
+        except Exception:
             # Fallback to assignment status if there's an error
             return obj.status
     
     def get_annotated_by_id(self, obj):
         """Get who actually annotated this example (from AnnotationTracking)."""
-        try:
-            from assignment.simple_tracking import AnnotationTracking
-            tracking = AnnotationTracking.objects.filter(
-                project=obj.project,
-                example=obj.example
-            ).select_related('annotated_by').first()
-            
-            if tracking and tracking.annotated_by:
-                return tracking.annotated_by.id
-            
-            # Fallback: check ExampleState if no tracking
-            from examples.models import ExampleState
-            state = ExampleState.objects.filter(
-                example=obj.example
-            ).select_related('confirmed_by').first()
-            
-            if state and state.confirmed_by:
-                return state.confirmed_by.id
-        except Exception:
-            pass
-        
-        # Final fallback: use assigned_to
-        return obj.assigned_to.id if obj.assigned_to else None
+        annotator = self._get_annotator(obj)
+        return annotator.id if annotator else None
     
     def get_annotated_by_username(self, obj):
         """Get username of who actually annotated this example (from AnnotationTracking)."""
+        annotator = self._get_annotator(obj)
+        return annotator.username if annotator else None
+    
+    def _get_reviewer_approval(self, obj):
+        from assignment.roles import ROLE_ANNOTATION_APPROVER
         try:
-            from assignment.simple_tracking import AnnotationTracking
-            tracking = AnnotationTracking.objects.filter(
-                project=obj.project,
-                example=obj.example
-            ).select_related('annotated_by').first()
-            
-            if tracking and tracking.annotated_by:
-                return tracking.annotated_by.username
-            
-            # Fallback: check ExampleState if no tracking
-            from examples.models import ExampleState
-            state = ExampleState.objects.filter(
-                example=obj.example
-            ).select_related('confirmed_by').first()
-            
-            if state and state.confirmed_by:
-                return state.confirmed_by.username
+            return self._get_approval_by_role(obj, ROLE_ANNOTATION_APPROVER)
         except Exception:
-            pass
-        
-        # Final fallback: use assigned_to
-        return obj.assigned_to.username if obj.assigned_to else None
+            return None
     
     def get_reviewed_by_id(self, obj):
         """Get annotation_approver who reviewed (not project_admin)."""
-        try:
-            from assignment.completion_tracking import ApproverCompletionStatus
-            from projects.models import Member
-            from assignment.roles import ROLE_ANNOTATION_APPROVER
-            
-            # Find annotation_approver approval for this example
-            approvals = ApproverCompletionStatus.objects.filter(
-                example=obj.example,
-                project=obj.project,
-                status='approved'
-            ).select_related('approver')
-            
-            for approval in approvals:
-                member = Member.objects.filter(
-                    user=approval.approver,
-                    project=obj.project
-                ).select_related('role').first()
-                
-                if member and member.role and member.role.name.lower() == ROLE_ANNOTATION_APPROVER:
-                    return approval.approver.id
-        except Exception:
-            pass
+        approval = self._get_reviewer_approval(obj)
+        if approval:
+            return approval.approver_id
         # Fallback to Assignment.reviewed_by if no annotation_approver found
-        return obj.reviewed_by.id if obj.reviewed_by else None
+        return obj.reviewed_by_id
     
     def get_reviewed_by_username(self, obj):
         """Get annotation_approver username who reviewed (not project_admin)."""
-        try:
-            from assignment.completion_tracking import ApproverCompletionStatus
-            from projects.models import Member
-            from assignment.roles import ROLE_ANNOTATION_APPROVER
-            
-            # Find annotation_approver approval for this example
-            approvals = ApproverCompletionStatus.objects.filter(
-                example=obj.example,
-                project=obj.project,
-                status='approved'
-            ).select_related('approver')
-            
-            for approval in approvals:
-                member = Member.objects.filter(
-                    user=approval.approver,
-                    project=obj.project
-                ).select_related('role').first()
-                
-                if member and member.role and member.role.name.lower() == ROLE_ANNOTATION_APPROVER:
-                    return approval.approver.username
-        except Exception:
-            pass
+        approval = self._get_reviewer_approval(obj)
+        if approval:
+            return approval.approver.username
         # Fallback to Assignment.reviewed_by if no annotation_approver found
         return obj.reviewed_by.username if obj.reviewed_by else None
     
@@ -229,129 +207,115 @@ class AssignmentSerializer(serializers.Serializer):
         Get the role of the reviewer (annotation_approver, not project_admin).
         This shows who did the initial review.
         """
-        try:
-            from assignment.completion_tracking import ApproverCompletionStatus
-            from projects.models import Member
-            from assignment.roles import ROLE_ANNOTATION_APPROVER
-            
-            # Find annotation_approver approval for this example
-            approvals = ApproverCompletionStatus.objects.filter(
-                example=obj.example,
-                project=obj.project,
-                status='approved'
-            ).select_related('approver')
-            
-            for approval in approvals:
-                member = Member.objects.filter(
-                    user=approval.approver,
-                    project=obj.project
-                ).select_related('role').first()
-                
-                if member and member.role and member.role.name.lower() == ROLE_ANNOTATION_APPROVER:
-                    return ROLE_ANNOTATION_APPROVER
-        except Exception:
-            pass
+        from assignment.roles import ROLE_ANNOTATION_APPROVER, ROLE_PROJECT_ADMIN
+        
+        if self._get_reviewer_approval(obj):
+            return ROLE_ANNOTATION_APPROVER
         
         # Fallback: check Assignment.reviewed_by if no annotation_approver found
-        if obj.reviewed_by:
+        if obj.reviewed_by_id:
             try:
-                from projects.models import Member
-                member = Member.objects.filter(
-                    user=obj.reviewed_by,
-                    project=obj.project
-                ).select_related('role').first()
-                
-                if member and member.role:
-                    role_name = member.role.name.lower()
-                    # Only return if it's NOT project_admin (project_admin goes in final approval)
-                    if role_name != 'project_admin':
-                        return role_name
+                role_name = self._get_role(obj.reviewed_by_id, obj.project_id)
+                # Only return if it's NOT project_admin (project_admin goes in final approval)
+                if role_name and role_name != ROLE_PROJECT_ADMIN:
+                    return role_name
             except Exception:
                 pass
         
         return None
     
-    def get_final_approval_by_id(self, obj):
-        """Get project_admin who gave final approval."""
+    def _get_final_approval(self, obj):
+        from assignment.roles import ROLE_PROJECT_ADMIN
         try:
-            from assignment.completion_tracking import ApproverCompletionStatus
-            from projects.models import Member
-            from assignment.roles import ROLE_PROJECT_ADMIN
-            
-            # Find project_admin approval for this example
-            approvals = ApproverCompletionStatus.objects.filter(
-                example=obj.example,
-                project=obj.project,
-                status='approved'
-            ).select_related('approver')
-            
-            for approval in approvals:
-                member = Member.objects.filter(
-                    user=approval.approver,
-                    project=obj.project
-                ).select_related('role').first()
-                
-                if member and member.role and member.role.name.lower() == ROLE_PROJECT_ADMIN:
-                    return approval.approver.id
+            return self._get_approval_by_role(obj, ROLE_PROJECT_ADMIN)
         except Exception:
-            pass
-        return None
+            return None
+    
+    def get_final_approval_by_id(self, obj):
+        """Get project_admin who gave final approval."""
+        approval = self._get_final_approval(obj)
+        return approval.approver_id if approval else None
     
     def get_final_approval_by_username(self, obj):
         """Get project_admin username who gave final approval."""
-        try:
-            from assignment.completion_tracking import ApproverCompletionStatus
-            from projects.models import Member
-            from assignment.roles import ROLE_PROJECT_ADMIN
-            
-            # Find project_admin approval for this example
-            approvals = ApproverCompletionStatus.objects.filter(
-                example=obj.example,
-                project=obj.project,
-                status='approved'
-            ).select_related('approver')
-            
-            for approval in approvals:
-                member = Member.objects.filter(
-                    user=approval.approver,
-                    project=obj.project
-                ).select_related('role').first()
-                
-                if member and member.role and member.role.name.lower() == ROLE_PROJECT_ADMIN:
-                    return approval.approver.username
-        except Exception:
-            pass
-        return None
+        approval = self._get_final_approval(obj)
+        return approval.approver.username if approval else None
     
     def get_final_approval_at(self, obj):
         """Get when project_admin gave final approval."""
-        try:
-            from assignment.completion_tracking import ApproverCompletionStatus
-            from projects.models import Member
-            from assignment.roles import ROLE_PROJECT_ADMIN
-            
-            # Find project_admin approval for this example
-            approvals = ApproverCompletionStatus.objects.filter(
-                example=obj.example,
-                project=obj.project,
-                status='approved'
-            ).select_related('approver').order_by('-reviewed_at')
-            
-            for approval in approvals:
-                member = Member.objects.filter(
-                    user=approval.approver,
-                    project=obj.project
-                ).select_related('role').first()
-                
-                if member and member.role and member.role.name.lower() == ROLE_PROJECT_ADMIN:
-                    return approval.reviewed_at
-        except Exception:
-            pass
-        return None
+        approval = self._get_final_approval(obj)
+        return approval.reviewed_at if approval else None
     
     def get_has_final_approval(self, obj):
         """Check if example has final approval from project_admin."""
-        return self.get_final_approval_by_id(obj) is not None
+        return self._get_final_approval(obj) is not None
+
+
+def build_assignment_context(project, assignments):
+    """
+    Preload everything AssignmentSerializer needs for a set of assignments.
+    
+    Runs a fixed number of queries (states, tracking, approver statuses,
+    member roles) regardless of how many assignments are serialized, and
+    returns a serializer context:
+    
+        serializer = AssignmentSerializer(
+            assignments, many=True,
+            context=build_assignment_context(project, assignments)
+        )
+    
+    `assignments` may be a queryset (used as a subquery, not evaluated) or
+    an iterable of Assignment instances.
+    """
+    from examples.models import ExampleState
+    from projects.models import Member
+    from assignment.simple_tracking import AnnotationTracking
+    from assignment.completion_tracking import ApproverCompletionStatus
+    
+    if hasattr(assignments, 'values'):
+        example_ids = assignments.values('example_id')
+    else:
+        example_ids = [a.example_id for a in assignments]
+    
+    states = {
+        s.example_id: s
+        for s in ExampleState.objects.filter(
+            example__project=project,
+            example_id__in=example_ids
+        ).select_related('confirmed_by')
+    }
+    
+    tracking = {
+        t.example_id: t
+        for t in AnnotationTracking.objects.filter(
+            project=project,
+            example_id__in=example_ids
+        ).select_related('annotated_by')
+    }
+    
+    approvals = {}
+    for approval in ApproverCompletionStatus.objects.filter(
+        project=project,
+        example_id__in=example_ids
+    ).select_related('approver').order_by('-reviewed_at'):
+        approvals.setdefault(approval.example_id, []).append(approval)
+    
+    member_roles = {
+        user_id: role_name.lower()
+        for user_id, role_name in Member.objects.filter(
+            project=project,
+            role__isnull=False
+        ).values_list('user_id', 'role__name')
+    }
+    
+    return {
+        'batch': {
+            'states': states,
+            'tracking': tracking,
+            'approvals': approvals,
+            'member_roles': member_roles,
+        }
+    }
 
 
 class BulkAssignmentSerializer(serializers.Serializer):
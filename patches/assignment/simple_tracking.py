@@ -84,6 +84,7 @@ class AnnotationTracking(models.Model):
             models.Index(fields=['project', 'status']),
             models.Index(fields=['annotated_by']),
             models.Index(fields=['reviewed_by']),
+            models.Index(fields=['example', 'status', 'reviewed_by'], name='anno_track_ex_status_idx'),
         ]
     
     def __str__(self):
@@ -22,8 +22,8 @@ from django.utils import timezone
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from .simple_tracking import AnnotationTracking, SkippedExample
-from .completion_tracking import ApproverCompletionStatus
-from .roles import ROLE_PROJECT_ADMIN, ROLE_ANNOTATION_APPROVER, ROLE_PROJECT_MANAGER
+from .review_eligibility import get_reviewable_example, eligibility_error
+from .upserts import upsert_tracking
 
 
 def has_approve_permission(user, project_id):
@@ -40,13 +40,11 @@ def has_approve_permission(user, project_id):
         return True
     
     try:
-        from projects.models import Member
-        member = Member.objects.filter(user=user, project_id=project_id).first()
-        if not member or not member.role:
+        from .role_service import get_role_name
+        role_name = get_role_name(user, project_id)
+        if not role_name:
             return False
         
-        role_name = member.role.name.lower() if member.role.name else ''
-        
         # These roles can approve/reject
         if any(r in role_name for r in ['admin', 'approver', 'manager']):
             return True
@@ -59,15 +57,12 @@ def has_approve_permission(user, project_id):
 
 def _get_user_role(user, project):
     """Get user's role in the project."""
-    from projects.models import Member
+    from .role_service import get_role_name
     try:
-        member = Member.objects.filter(user=user, project=project).select_related('role').first()
-        if member and member.role:
-            role_name = member.role.name.lower() if member.role.name else None
-            # Normalize: replace spaces with underscores for consistency
-            if role_name:
-                role_name = role_name.replace(' ', '_')
-            return role_name
+        role_name = get_role_name(user, project)
+        # Normalize: replace spaces with underscores for consistency
+        if role_name:
+            return role_name.replace(' ', '_')
     except Exception as e:
         print(f'[Monlam Tracking] Error getting user role: {e}')
     return None
@@ -126,13 +121,11 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
         
         try:
             # Validate that user is a project member
-            from projects.models import Member, Project
+            from projects.models import Project
+            from .role_service import is_project_member
             project = Project.objects.get(pk=project_id)
             
-            is_member = Member.objects.filter(
-                user=request.user,
-                project_id=project_id
-            ).exists()
+            is_member = is_project_member(request.user, project_id)
             
             if not is_member and not request.user.is_superuser:
                 return Response(
@@ -259,7 +252,6 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
         - Project managers can always approve
         Requires: project_admin, annotation_approver, or project_manager role
         """
-        from examples.models import Example
         from projects.models import Project
         
         # Check permission
@@ -270,11 +262,13 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get project and example
+        # Get project and example (annotated with the review eligibility checks)
         try:
             project = Project.objects.get(pk=project_id)
-            example = Example.objects.get(pk=pk, project=project)
-        except (Project.DoesNotExist, Example.DoesNotExist):
+        except Project.DoesNotExist:
+            project = None
+        example = get_reviewable_example(project, pk) if project else None
+        if example is None:
             return Response(
                 {'error': 'Project or example not found'},
                 status=status.HTTP_404_NOT_FOUND
@@ -290,101 +284,24 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Project managers can always approve (no restrictions)
-        if user_role == ROLE_PROJECT_MANAGER:
-            # Skip validation, allow approval
-            pass
-        # Check if example is submitted or confirmed (for annotation_approvers)
-        elif user_role == ROLE_ANNOTATION_APPROVER:
-            # Check if example has been submitted or confirmed
-            is_submitted = False
-            
-            # Check AnnotationTracking status
-            tracking_check = AnnotationTracking.objects.filter(
-                project=project,
-                example=example
-            ).first()
-            
-            if tracking_check and tracking_check.status == 'submitted':
-                is_submitted = True
-            else:
-                # Also check Assignment status as fallback
-                from .models_separate import Assignment
-                assignment = Assignment.objects.filter(
-                    project=project,
-                    example=example,
-                    is_active=True
-                ).first()
-                
-                if assignment and assignment.status == 'submitted':
-                    is_submitted = True
-                else:
-                    # Also check ExampleState (confirmed via checkmark)
-                    from examples.models import ExampleState
-                    from projects.models import Member
-                    state = ExampleState.objects.filter(example=example).first()
-                    if state and state.confirmed_by:
-                        # Verify confirmed_by is still a project member
-                        is_member = Member.objects.filter(
-                            user=state.confirmed_by,
-                            project=project
-                        ).exists()
-                        if is_member or state.confirmed_by.is_superuser:
-                            is_submitted = True
-            
-            if not is_submitted:
-                return Response(
-                    {
-                        'error': 'Annotation approvers can only approve examples that have been submitted or confirmed by annotators.',
-                        'requires_submission': True
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        
-        # If user is project_admin, check if annotation_approver has approved
-        elif user_role == ROLE_PROJECT_ADMIN:
-            # Get all approvals for this example
-            all_approvals = ApproverCompletionStatus.objects.filter(
-                example=example
-            ).select_related('approver').defer('assignment')
-            
-            # Check if any annotation_approver has approved
-            annotation_approver_approved = False
-            for ap in all_approvals:
-                approver_role = _get_user_role(ap.approver, project)
-                if approver_role == ROLE_ANNOTATION_APPROVER and ap.status == 'approved':
-                    annotation_approver_approved = True
-                    break
-            
-            if not annotation_approver_approved:
-                return Response(
-                    {
-                        'error': 'Project admins can only approve examples that have been approved by an annotation approver first.',
-                        'requires_approver_approval': True
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
+        # Annotation approvers need a submitted example, project admins an
+        # annotation approver's approval; project managers can always approve
+        error = eligibility_error(example, user_role, 'approve')
+        if error:
+            return Response(error, status=status.HTTP_403_FORBIDDEN)
         
         try:
             with transaction.atomic():
-                # Update AnnotationTracking (track reviewed_by in backend for comprehensive metrics)
-                tracking, created = AnnotationTracking.objects.get_or_create(
-                    project_id=project_id,
-                    example_id=pk,
-                    defaults={
-                        'status': 'reviewed',  # Changed from 'approved' to 'reviewed'
-                        'reviewed_by': request.user,  # Track who reviewed (for metrics, not exposed in API)
-                        'reviewed_at': timezone.now(),
-                        'review_notes': request.data.get('review_notes', '')
-                    }
+                # Upsert AnnotationTracking (track reviewed_by in backend for comprehensive metrics)
+                tracking = AnnotationTracking(
+                    project=project,
+                    example_id=example.id,
+                    status='reviewed',  # Changed from 'approved' to 'reviewed'
+                    reviewed_by=request.user,  # Track who reviewed (for metrics, not exposed in API)
+                    reviewed_at=timezone.now(),
+                    review_notes=request.data.get('review_notes', '')
                 )
-                
-                if not created:
-                    tracking.status = 'reviewed'  # Changed from 'approved' to 'reviewed'
-                    tracking.reviewed_by = request.user  # Track who reviewed (for metrics, not exposed in API)
-                    tracking.reviewed_at = timezone.now()
-                    tracking.review_notes = request.data.get('review_notes', '')
-                    tracking.save()
+                upsert_tracking([tracking])
                 
                 # Also update ApproverCompletionStatus for consistency
                 from .completion_tracking import CompletionMatrixUpdater
@@ -423,7 +340,6 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
         - Project managers can always reject
         Requires: project_admin, annotation_approver, or project_manager role
         """
-        from examples.models import Example
         from projects.models import Project
         
         # Check permission
@@ -434,11 +350,13 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get project and example
+        # Get project and example (annotated with the review eligibility checks)
         try:
             project = Project.objects.get(pk=project_id)
-            example = Example.objects.get(pk=pk, project=project)
-        except (Project.DoesNotExist, Example.DoesNotExist):
+        except Project.DoesNotExist:
+            project = None
+        example = get_reviewable_example(project, pk) if project else None
+        if example is None:
             return Response(
                 {'error': 'Project or example not found'},
                 status=status.HTTP_404_NOT_FOUND
@@ -454,104 +372,27 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Project managers can always reject (no restrictions)
-        if user_role == ROLE_PROJECT_MANAGER:
-            # Skip validation, allow rejection
-            pass
-        # Check if example is submitted or confirmed (for annotation_approvers)
-        elif user_role == ROLE_ANNOTATION_APPROVER:
-            # Check if example has been submitted or confirmed
-            is_submitted = False
-            
-            # Check AnnotationTracking status
-            tracking_check = AnnotationTracking.objects.filter(
-                project=project,
-                example=example
-            ).first()
-            
-            if tracking_check and tracking_check.status == 'submitted':
-                is_submitted = True
-            else:
-                # Also check Assignment status as fallback
-                from .models_separate import Assignment
-                assignment = Assignment.objects.filter(
-                    project=project,
-                    example=example,
-                    is_active=True
-                ).first()
-                
-                if assignment and assignment.status == 'submitted':
-                    is_submitted = True
-                else:
-                    # Also check ExampleState (confirmed via checkmark)
-                    from examples.models import ExampleState
-                    from projects.models import Member
-                    state = ExampleState.objects.filter(example=example).first()
-                    if state and state.confirmed_by:
-                        # Verify confirmed_by is still a project member
-                        is_member = Member.objects.filter(
-                            user=state.confirmed_by,
-                            project=project
-                        ).exists()
-                        if is_member or state.confirmed_by.is_superuser:
-                            is_submitted = True
-            
-            if not is_submitted:
-                return Response(
-                    {
-                        'error': 'Annotation approvers can only reject examples that have been submitted or confirmed by annotators.',
-                        'requires_submission': True
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        
-        # If user is project_admin, check if annotation_approver has approved
-        elif user_role == ROLE_PROJECT_ADMIN:
-            # Get all approvals for this example
-            all_approvals = ApproverCompletionStatus.objects.filter(
-                example=example
-            ).select_related('approver').defer('assignment')
-            
-            # Check if any annotation_approver has approved
-            annotation_approver_approved = False
-            for ap in all_approvals:
-                approver_role = _get_user_role(ap.approver, project)
-                if approver_role == ROLE_ANNOTATION_APPROVER and ap.status == 'approved':
-                    annotation_approver_approved = True
-                    break
-            
-            if not annotation_approver_approved:
-                return Response(
-                    {
-                        'error': 'Project admins can only reject examples that have been approved by an annotation approver first.',
-                        'requires_approver_approval': True
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
+        # Annotation approvers need a submitted example, project admins an
+        # annotation approver's approval; project managers can always reject
+        error = eligibility_error(example, user_role, 'reject')
+        if error:
+            return Response(error, status=status.HTTP_403_FORBIDDEN)
         
         review_notes = request.data.get('review_notes', '')
         # Notes are now optional for rejection
         
         try:
             with transaction.atomic():
-                # Update AnnotationTracking (track reviewed_by in backend for comprehensive metrics)
-                tracking, created = AnnotationTracking.objects.get_or_create(
-                    project_id=project_id,
-                    example_id=pk,
-                    defaults={
-                        'status': 'rejected',
-                        'reviewed_by': request.user,  # Track who reviewed (for metrics, not exposed in API)
-                        'reviewed_at': timezone.now(),
-                        'review_notes': review_notes
-                    }
+                # Upsert AnnotationTracking (track reviewed_by in backend for comprehensive metrics)
+                tracking = AnnotationTracking(
+                    project=project,
+                    example_id=example.id,
+                    status='rejected',
+                    reviewed_by=request.user,  # Track who reviewed (for metrics, not exposed in API)
+                    reviewed_at=timezone.now(),
+                    review_notes=review_notes
                 )
-                
-                if not created:
-                    tracking.status = 'rejected'
-                    tracking.reviewed_by = request.user  # Track who reviewed (for metrics, not exposed in API)
-                    tracking.reviewed_at = timezone.now()
-                    tracking.review_notes = review_notes
-                    tracking.save()
+                upsert_tracking([tracking])
                 
                 # Also update ApproverCompletionStatus for consistency
                 from .completion_tracking import CompletionMatrixUpdater
@@ -575,6 +416,88 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['post'], url_path='bulk-review')
+    def bulk_review(self, request, project_id=None):
+        """
+        Approve or reject many examples at once
+        
+        POST /v1/projects/{project_id}/tracking/bulk-review/
+        {
+            "action": "approve" | "reject",
+            "example_ids": [1, 2, 3],      // or "from_queue": true
+            "limit": 5000,                 // with from_queue
+            "review_notes": "optional"
+        }
+        
+        Same rules as approve/reject, checked per example. Ineligible ids are
+        skipped and reported with a reason; the rest are written in one transaction.
+        Requires: project_admin, annotation_approver, or project_manager role
+        """
+        from projects.models import Project
+        from .bulk_review import MAX_BULK_REVIEW, bulk_review, queued_example_ids
+        
+        if not has_approve_permission(request.user, project_id):
+            return Response(
+                {'error': 'You do not have permission to review annotations. '
+                         'Only Approvers, Project Managers, and Admins can approve or reject.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        decision = {'approve': 'approved', 'reject': 'rejected'}.get(request.data.get('action'))
+        if not decision:
+            return Response(
+                {'error': "action must be 'approve' or 'reject'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        project = get_object_or_404(Project, pk=project_id)
+        user_role = _get_user_role(request.user, project)
+        if not user_role:
+            return Response(
+                {'error': 'Unable to determine your role. Please contact an administrator.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            limit = min(int(request.data.get('limit', MAX_BULK_REVIEW)), MAX_BULK_REVIEW)
+            if request.data.get('from_queue'):
+                example_ids = queued_example_ids(project, request.user, user_role, limit)
+            else:
+                example_ids = [int(i) for i in request.data.get('example_ids') or []]
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'example_ids must be a list of integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not example_ids:
+            return Response(
+                {'error': 'No examples to review (provide example_ids or from_queue)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(example_ids) > MAX_BULK_REVIEW:
+            return Response(
+                {'error': f'At most {MAX_BULK_REVIEW} examples per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            result = bulk_review(
+                project,
+                request.user,
+                user_role,
+                example_ids,
+                decision,
+                notes=request.data.get('review_notes', '')
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        return Response({'success': True, **result})
+    
     @action(detail=True, methods=['get'], url_path='status')
     def get_status(self, request, project_id=None, pk=None):
         """
@@ -595,15 +518,12 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
             confirmed_by = None
             try:
                 from examples.models import ExampleState
-                from projects.models import Member
+                from .role_service import is_project_member
                 
                 state = ExampleState.objects.filter(example_id=pk).select_related('confirmed_by').first()
                 if state and state.confirmed_by:
                     # Only show confirmed_by if they're still a project member
-                    is_member = Member.objects.filter(
-                        user=state.confirmed_by,
-                        project_id=project_id
-                    ).exists()
+                    is_member = is_project_member(state.confirmed_by, project_id)
                     
                     if is_member or state.confirmed_by.is_superuser:
                         is_confirmed = True
@@ -641,22 +561,16 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
             # Get annotated_by username (who submitted/confirmed)
             annotated_by_username = None
             if tracking.annotated_by:
-                from projects.models import Member
-                is_member = Member.objects.filter(
-                    user=tracking.annotated_by,
-                    project_id=project_id
-                ).exists()
+                from .role_service import is_project_member
+                is_member = is_project_member(tracking.annotated_by, project_id)
                 if is_member or tracking.annotated_by.is_superuser:
                     annotated_by_username = tracking.annotated_by.username
             
             # Get reviewed_by username (who approved/rejected)
             reviewed_by_username = None
             if tracking.reviewed_by:
-                from projects.models import Member
-                is_member = Member.objects.filter(
-                    user=tracking.reviewed_by,
-                    project_id=project_id
-                ).exists()
+                from .role_service import is_project_member
+                is_member = is_project_member(tracking.reviewed_by, project_id)
                 if is_member or tracking.reviewed_by.is_superuser:
                     reviewed_by_username = tracking.reviewed_by.username
             
@@ -819,7 +733,8 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
         
         Safe to call frequently - uses efficient database queries with indexes.
         """
-        from projects.models import Project, Member
+        from projects.models import Project
+        from .role_service import is_project_member
         
         try:
             project = Project.objects.get(pk=project_id)
@@ -831,10 +746,7 @@ class AnnotationTrackingViewSet(viewsets.ViewSet):
         
         # Check access - user must be a project member
         if not request.user.is_superuser:
-            is_member = Member.objects.filter(
-                user=request.user,
-                project_id=project_id
-            ).exists()
+            is_member = is_project_member(request.user, project_id)
             if not is_member:
                 return Response(
                     {'error': 'Permission denied'},
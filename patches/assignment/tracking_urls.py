@@ -20,6 +20,11 @@ urlpatterns = [
          AnnotationTrackingViewSet.as_view({'get': 'review_stats'}), 
          name='tracking-review-stats'),
     
+    # Approve/reject many examples at once
+    path('bulk-review/', 
+         AnnotationTrackingViewSet.as_view({'post': 'bulk_review'}), 
+         name='tracking-bulk-review'),
+    
     # Get status of specific example
     path('<int:pk>/status/', 
          AnnotationTrackingViewSet.as_view({'get': 'get_status'}), 
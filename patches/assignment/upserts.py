@@ -0,0 +1,77 @@
+"""
+Upserts
+
+Single-statement INSERT ... ON CONFLICT DO UPDATE writes (Django
+bulk_create(update_conflicts=True), PostgreSQL) for the per-example status
+tables, so concurrent reviewers never race get_or_create() into an
+IntegrityError and a write is one round-trip instead of two or three.
+
+Used by CompletionMatrixUpdater, the tracking approve/reject endpoints,
+bulk_review and sync_from_assignments.
+
+Note: rows updated through the conflict path come back without a pk;
+callers only read the values they passed in.
+"""
+
+UPSERT_BATCH_SIZE = 1000
+
+ANNOTATOR_STATUS_KEYS = ['example', 'annotator']
+APPROVER_STATUS_KEYS = ['example', 'approver']
+TRACKING_KEYS = ['project', 'example']
+
+REVIEW_FIELDS = ['status', 'reviewed_at', 'review_notes']
+TRACKING_REVIEW_FIELDS = ['status', 'reviewed_by', 'reviewed_at', 'review_notes']
+
+
+def upsert(model, rows, unique_fields, update_fields, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Insert rows, updating update_fields on rows that already exist.
+
+    With no update_fields, existing rows are left untouched (ON CONFLICT DO NOTHING).
+    """
+    if not rows:
+        return rows
+    if not update_fields:
+        return model.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+    return model.objects.bulk_create(
+        rows,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields
+    )
+
+
+def inserted_rows(model, rows, match_fields):
+    """
+    The rows an ON CONFLICT DO NOTHING bulk_create actually wrote.
+
+    bulk_create(ignore_conflicts=True) leaves pk unset and does not report
+    skipped rows, so a row counts as inserted when the stored row matches it
+    on all match_fields (attnames; include a timestamp the insert set).
+    Call inside the transaction that did the insert.
+    """
+    if not rows:
+        return []
+    first = match_fields[0]
+    stored = set(
+        model.objects.filter(
+            **{f'{first}__in': {getattr(row, first) for row in rows}}
+        ).values_list(*match_fields)
+    )
+    return [row for row in rows if tuple(getattr(row, f) for f in match_fields) in stored]
+
+
+def upsert_annotator_statuses(rows, update_fields):
+    from .completion_tracking import AnnotatorCompletionStatus
+    return upsert(AnnotatorCompletionStatus, rows, ANNOTATOR_STATUS_KEYS, update_fields)
+
+
+def upsert_approver_statuses(rows, update_fields=REVIEW_FIELDS):
+    from .completion_tracking import ApproverCompletionStatus
+    return upsert(ApproverCompletionStatus, rows, APPROVER_STATUS_KEYS, update_fields)
+
+
+def upsert_tracking(rows, update_fields=TRACKING_REVIEW_FIELDS):
+    from .simple_tracking import AnnotationTracking
+    return upsert(AnnotationTracking, rows, TRACKING_KEYS, update_fields)
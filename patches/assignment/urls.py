@@ -15,6 +15,7 @@ from .completion_views import (
 from .comprehensive_example_api import ComprehensiveExampleViewSet
 # NOTE: ExampleLockingViewSet removed - single annotator per project, no race conditions
 from .tracking_api import AnnotationTrackingViewSet
+from .import_checkpoint_views import ImportCheckpointViewSet
 
 urlpatterns = [
     # ===== Assignment URLs =====
@@ -33,6 +34,10 @@ urlpatterns = [
     # Unassigned count
     path('unassigned/', AssignmentViewSet.as_view({'get': 'unassigned'}), name='assignment-unassigned'),
     
+    # Claim-next allocator (leased, SKIP LOCKED)
+    path('claim-next/', AssignmentViewSet.as_view({'post': 'claim_next'}), name='assignment-claim-next'),
+    path('claim-release/', AssignmentViewSet.as_view({'post': 'claim_release'}), name='assignment-claim-release'),
+    
     # Actions on specific assignment
     path('<int:pk>/start/', AssignmentViewSet.as_view({'post': 'start'}), name='assignment-start'),
     path('<int:pk>/submit/', AssignmentViewSet.as_view({'post': 'submit'}), name='assignment-submit'),
@@ -55,6 +60,11 @@ urlpatterns = [
          CompletionMatrixViewSet.as_view({'get': 'approvers'}), 
          name='completion-matrix-approvers'),
     
+    # Per-example matrix detail (paginated)
+    path('completion-matrix/examples/', 
+         CompletionMatrixViewSet.as_view({'get': 'examples'}), 
+         name='completion-matrix-examples'),
+    
     # My completion stats
     path('completion-matrix/my/', 
          CompletionMatrixViewSet.as_view({'get': 'my'}), 
@@ -121,6 +131,15 @@ urlpatterns = [
          ComprehensiveExampleViewSet.as_view({'get': 'export_csv'}), 
          name='examples-comprehensive-export'),
     
+    # ===== Resumable Imports =====
+    path('import-checkpoints/', 
+         ImportCheckpointViewSet.as_view({'get': 'list'}), 
+         name='import-checkpoint-list'),
+    
+    path('import-checkpoints/<int:pk>/resume/', 
+         ImportCheckpointViewSet.as_view({'post': 'resume'}), 
+         name='import-checkpoint-resume'),
+    
     # NOTE: Example locking URLs removed - single annotator per project, no race conditions
 ]
 
@@ -15,7 +15,8 @@ from django.shortcuts import get_object_or_404
 from .serializers import (
     AssignmentSerializer,
     BulkAssignmentSerializer,
-    AssignmentStatsSerializer
+    AssignmentStatsSerializer,
+    build_assignment_context
 )
 
 
@@ -32,6 +33,8 @@ class AssignmentViewSet(viewsets.ViewSet):
     - POST /projects/{project_id}/assignments/{id}/approve/ - Approve
     - POST /projects/{project_id}/assignments/{id}/reject/ - Reject
     - GET /projects/{project_id}/assignments/stats/ - Get statistics
+    - POST /projects/{project_id}/assignments/claim-next/ - Lease next example
+    - POST /projects/{project_id}/assignments/claim-release/ - Release lease
     """
     
     permission_classes = [IsAuthenticated]
@@ -46,7 +49,10 @@ class AssignmentViewSet(viewsets.ViewSet):
         from .models_separate import Assignment
         
         project = self.get_project(project_id)
-        assignments = Assignment.objects.filter(project=project, is_active=True)
+        assignments = Assignment.objects.filter(
+            project=project,
+            is_active=True
+        ).select_related('assigned_to', 'reviewed_by')
         
         # Filter by status if provided
         status_filter = request.query_params.get('status')
@@ -58,7 +64,11 @@ class AssignmentViewSet(viewsets.ViewSet):
         if user_id:
             assignments = assignments.filter(assigned_to_id=user_id)
         
-        serializer = AssignmentSerializer(assignments, many=True)
+        serializer = AssignmentSerializer(
+            assignments,
+            many=True,
+            context=build_assignment_context(project, assignments)
+        )
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -71,9 +81,13 @@ class AssignmentViewSet(viewsets.ViewSet):
             project=project,
             assigned_to=request.user,
             is_active=True
-        )
+        ).select_related('assigned_to', 'reviewed_by')
         
-        serializer = AssignmentSerializer(assignments, many=True)
+        serializer = AssignmentSerializer(
+            assignments,
+            many=True,
+            context=build_assignment_context(project, assignments)
+        )
         return Response(serializer.data)
     
     @action(detail=False, methods=['post'])
@@ -165,6 +179,62 @@ class AssignmentViewSet(viewsets.ViewSet):
         assignment.reject(reviewer=request.user, notes=notes)
         return Response({'status': 'rejected'})
     
+    @action(detail=False, methods=['post'], url_path='claim-next')
+    def claim_next(self, request, project_id):
+        """
+        Atomically lease the next example to the current annotator.
+        
+        Body (optional):
+        - after_example_id: only consider examples after this id (wraps around)
+        """
+        from .claims import claim_next
+        from .role_service import is_project_member
+        
+        project = self.get_project(project_id)
+        if not is_project_member(request.user, project) and not request.user.is_superuser:
+            return Response(
+                {'error': 'You must be a project member to claim examples'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        after_example_id = request.data.get('after_example_id')
+        try:
+            after_example_id = int(after_example_id) if after_example_id else None
+        except (ValueError, TypeError):
+            after_example_id = None
+        
+        assignment = claim_next(project, request.user, after_example_id=after_example_id)
+        if assignment is None:
+            return Response({
+                'example_id': None,
+                'message': 'No examples available to claim'
+            })
+        
+        return Response({
+            'example_id': assignment.example_id,
+            'assignment_id': assignment.id,
+            'status': assignment.status,
+            'lease_expires_at': assignment.lease_expires_at.isoformat()
+        })
+    
+    @action(detail=False, methods=['post'], url_path='claim-release')
+    def claim_release(self, request, project_id):
+        """Release the current annotator's lease (optionally for one example_id)."""
+        from .claims import release_claims
+        
+        project = self.get_project(project_id)
+        example_id = request.data.get('example_id')
+        try:
+            example_id = int(example_id) if example_id else None
+        except (ValueError, TypeError):
+            return Response(
+                {'error': 'example_id must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        released = release_claims(project, request.user, example_id=example_id)
+        return Response({'released': released})
+    
     @action(detail=False, methods=['get'])
     def stats(self, request, project_id):
         """Get assignment statistics by user."""
@@ -7,6 +7,7 @@ annotations when importing STT data with pre-filled transcripts.
 Place in: /doccano/backend/data_import/auto_text_labels.py
 """
 
+from django.db.models import QuerySet
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from examples.models import Example
@@ -14,6 +15,8 @@ from labels.models import TextLabel
 from django.contrib.auth import get_user_model
 import logging
 
+from .stt_labels import create_missing_text_labels
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,13 +64,14 @@ def create_text_label_for_example(example, user=None):
         return None
 
 
-def bulk_create_text_labels(examples, user=None):
+def bulk_create_text_labels(examples, user=None, dry_run=False):
     """
     Create TextLabels for multiple examples in bulk.
     
     Args:
         examples: QuerySet or list of Example instances
         user: The user to assign as annotator
+        dry_run: Only count the labels that would be created
     
     Returns:
         Number of labels created
@@ -82,27 +86,15 @@ def bulk_create_text_labels(examples, user=None):
         logger.warning("No user found for bulk text label creation")
         return 0
     
-    # Get examples that have text but no TextLabel
-    example_ids_with_labels = TextLabel.objects.values_list('example_id', flat=True)
-    
-    examples_to_label = [
-        ex for ex in examples 
-        if ex.text and ex.id not in example_ids_with_labels
-    ]
-    
-    if not examples_to_label:
-        return 0
-    
-    # Bulk create TextLabels
-    labels = [
-        TextLabel(example=ex, user=user, text=ex.text)
-        for ex in examples_to_label
-    ]
+    # Scope the anti-join to the given examples only
+    if not isinstance(examples, QuerySet):
+        examples = Example.objects.filter(id__in=[ex.id for ex in examples])
     
     try:
-        TextLabel.objects.bulk_create(labels, ignore_conflicts=True)
-        logger.info(f"Bulk created {len(labels)} TextLabels")
-        return len(labels)
+        count = create_missing_text_labels(examples, user, dry_run=dry_run)
+        if not dry_run:
+            logger.info(f"Bulk created {count} TextLabels")
+        return count
     except Exception as e:
         logger.error(f"Failed to bulk create TextLabels: {e}")
         return 0
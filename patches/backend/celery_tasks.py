@@ -5,17 +5,18 @@ This file replaces /doccano/backend/data_import/celery_tasks.py
 Adds automatic TextLabel creation after STT import.
 """
 
+from contextlib import nullcontext
 from typing import List
 
 import filetype
-from celery import shared_task
+from celery import current_task, shared_task
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django_drf_filepond.api import store_upload
 from django_drf_filepond.models import TemporaryUpload
 
-from .datasets import load_dataset
+from .datasets import StreamingJsonlDataset, load_dataset
 from .pipeline.catalog import Format, create_file_format
 from .pipeline.exceptions import (
     FileImportException,
@@ -27,13 +28,36 @@ from .pipeline.readers import FileName
 from projects.models import Project
 
 # Import for auto TextLabel creation
-from examples.models import Example
-from labels.models import TextLabel
+from .stt_labels import create_text_labels_for_project
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def import_tracking_scope(project):
+    """Monlam tracking suppression for imports (no-op if monlam_tracking is not installed)."""
+    try:
+        from monlam_tracking.import_scope import suppress_tracking
+        return suppress_tracking(project)
+    except ImportError:
+        return nullcontext()
+
+
+def start_import_checkpoint(project, user, file_format, task, uploads, options):
+    """Monlam import checkpoints (None if the assignment app is not installed)."""
+    try:
+        from assignment.import_checkpoints import ImportCheckpointer
+    except ImportError:
+        return None
+    return ImportCheckpointer(project, user, file_format, task, uploads, options)
+
+
+def report_import_progress(processed: int, errors: int):
+    """Publish streaming import progress as Celery task state (PROGRESS)."""
+    if current_task and current_task.request.id:
+        current_task.update_state(state="PROGRESS", meta={"processed": processed, "errors": errors})
+
+
 def check_file_type(filename, file_format: Format, filepath: str):
     if not settings.ENABLE_FILE_TYPE_CHECK:
         return
@@ -61,43 +85,22 @@ def check_uploaded_files(upload_ids: List[str], file_format: Format):
     return cleaned_ids, errors
 
 
-def create_text_labels_for_stt(project, user):
+def create_text_labels_for_stt(project, user, dry_run=False):
     """
     Create TextLabels for all STT examples that have text but no label.
     Called automatically after STT data import.
+    
+    With dry_run=True only returns how many labels would be created.
     """
     # Note: project_type is 'Speech2text' (lowercase 't')
     if project.project_type != 'Speech2text':
         return 0
     
-    # Get examples with text but no TextLabel
-    examples_with_labels = TextLabel.objects.filter(
-        example__project=project
-    ).values_list('example_id', flat=True)
-    
-    examples_to_label = Example.objects.filter(
-        project=project
-    ).exclude(
-        text=''
-    ).exclude(
-        text__isnull=True
-    ).exclude(
-        id__in=examples_with_labels
-    )
-    
-    if not examples_to_label.exists():
-        return 0
-    
-    # Bulk create TextLabels
-    labels = [
-        TextLabel(example=ex, user=user, text=ex.text)
-        for ex in examples_to_label
-    ]
-    
     try:
-        TextLabel.objects.bulk_create(labels, ignore_conflicts=True)
-        logger.info(f"Auto-created {len(labels)} TextLabels for STT project {project.id}")
-        return len(labels)
+        count = create_text_labels_for_project(project, user, dry_run=dry_run)
+        if not dry_run and count:
+            logger.info(f"Auto-created {count} TextLabels for STT project {project.id}")
+        return count
     except Exception as e:
         logger.error(f"Failed to create TextLabels for project {project.id}: {e}")
         return 0
@@ -107,6 +110,7 @@ def create_text_labels_for_stt(project, user):
 def import_dataset(user_id, project_id, file_format: str, upload_ids: List[str], task: str, **kwargs):
     project = get_object_or_404(Project, pk=project_id)
     user = get_object_or_404(get_user_model(), pk=user_id)
+    checkpoint = None
     try:
         fmt = create_file_format(file_format)
         upload_ids, errors = check_uploaded_files(upload_ids, fmt)
@@ -114,15 +118,16 @@ def import_dataset(user_id, project_id, file_format: str, upload_ids: List[str],
         
         # === MONLAM PATCH: Handle file path errors gracefully ===
         filenames = []
+        uploads = []
         for tu in temporary_uploads:
             try:
                 file_path = tu.get_file_path()
                 # Check if file exists before adding to list
                 import os
                 if os.path.exists(file_path):
-                    filenames.append(
-                        FileName(full_path=file_path, generated_name=tu.file.name, upload_name=tu.upload_name)
-                    )
+                    filename = FileName(full_path=file_path, generated_name=tu.file.name, upload_name=tu.upload_name)
+                    filenames.append(filename)
+                    uploads.append((tu.upload_id, filename))
                 else:
                     logger.warning(f"File not found (skipping): {file_path}")
                     errors.append(FileParseException(tu.upload_name, 0, f"File not found: {file_path}"))
@@ -136,13 +141,34 @@ def import_dataset(user_id, project_id, file_format: str, upload_ids: List[str],
         # === END PATCH ===
 
         dataset = load_dataset(task, fmt, filenames, project, **kwargs)
-        dataset.save(user, batch_size=settings.IMPORT_BATCH_SIZE)
-        upload_to_store(temporary_uploads)
         
-        # === MONLAM PATCH: Auto-create TextLabels for STT projects ===
-        labels_created = create_text_labels_for_stt(project, user)
-        if labels_created > 0:
-            logger.info(f"STT Import: Created {labels_created} TextLabels automatically")
+        # === MONLAM PATCH: Checkpoint streaming imports so retries resume ===
+        if isinstance(dataset, StreamingJsonlDataset):
+            checkpoint = start_import_checkpoint(project, user, file_format, task, uploads, kwargs)
+        
+        # === MONLAM PATCH: Suppress per-row tracking signals during import ===
+        # Affected examples are backfilled in one set-based pass on exit
+        with import_tracking_scope(project) as tracking_scope:
+            if isinstance(dataset, StreamingJsonlDataset):
+                dataset.save(
+                    user,
+                    batch_size=settings.IMPORT_BATCH_SIZE,
+                    progress=report_import_progress,
+                    checkpoint=checkpoint,
+                )
+            else:
+                dataset.save(user, batch_size=settings.IMPORT_BATCH_SIZE)
+            upload_to_store(temporary_uploads)
+            
+            # === MONLAM PATCH: Auto-create TextLabels for STT projects ===
+            labels_created = create_text_labels_for_stt(project, user)
+            if labels_created > 0:
+                logger.info(f"STT Import: Created {labels_created} TextLabels automatically")
+            # === END PATCH ===
+        if tracking_scope is not None:
+            logger.info(f"Import tracking backfill for project {project.id}: {tracking_scope.stats}")
+        if checkpoint is not None:
+            checkpoint.complete()
         # === END PATCH ===
         
         errors.extend(dataset.errors)
@@ -154,6 +180,11 @@ def import_dataset(user_id, project_id, file_format: str, upload_ids: List[str],
         return {"error": [{"filename": "unknown", "line": 0, "message": str(e)}]}
     except Exception as e:
         logger.error(f"Unexpected error during import: {e}")
+        if checkpoint is not None:
+            checkpoint.fail(e)
+            # Let autoretry resume from the checkpoint while retries remain
+            if current_task and current_task.request.retries < import_dataset.max_retries:
+                raise
         return {"error": [{"filename": "unknown", "line": 0, "message": str(e)}]}
 
 
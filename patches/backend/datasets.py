@@ -6,9 +6,12 @@ Adds Speech2TextJsonlDataset for importing JSONL with audio URLs and transcripts
 """
 
 import abc
-from typing import List, Type
+import json
+import uuid
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
 
 from django.contrib.auth.models import User
+from django.db import transaction
 
 from .models import DummyLabelType
 from .pipeline.catalog import RELATION_EXTRACTION, Format
@@ -33,6 +36,11 @@ import pandas as pd
 from pydantic import UUID4
 from examples.models import Example
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class Dataset(abc.ABC):
     def __init__(self, reader: Reader, project: Project, **kwargs):
@@ -120,6 +128,142 @@ class BinaryDataset(Dataset):
 # MONLAM PATCH: Speech2Text JSONL Dataset
 # ============================================================================
 
+def _rows(records) -> List[Dict]:
+    """Accept either a pandas batch (Reader) or a list of dicts (StreamingJsonlReader)."""
+    if isinstance(records, pd.DataFrame):
+        return records.to_dict(orient="records")
+    return records
+
+
+class StreamingJsonlReader:
+    """
+    Pandas-free JSONL reader for large STT / image manifests.
+
+    Parses line by line (orjson if installed, else json) and yields plain
+    dicts with the same bookkeeping columns as Doccano's Reader
+    (example_uuid, filename, upload_name, #line_number), so memory stays
+    constant in the batch size. Per-line errors are collected as
+    FileParseException.
+
+    Resumable: example uuids are derived from (file, line number), and
+    resume_from() makes each file start at a stored byte offset. After a
+    batch is yielded, `position` holds (generated_name, line, byte_offset)
+    of its last line; batches never span files.
+    """
+
+    def __init__(self, filenames: List[FileName], encoding: Optional[str] = None):
+        self.filenames = filenames
+        encoding = encoding or "utf_8"
+        # Doccano's "Auto" detection needs the whole file; utf-8-sig covers BOM'd manifests
+        self.encoding = "utf_8_sig" if encoding.lower() == "auto" else encoding
+        self._errors: List[FileParseException] = []
+        self._loads = orjson.loads if orjson is not None else json.loads
+        self._start: Dict[str, Tuple[int, int]] = {}
+        self.position: Tuple[str, int, int] = ("", 0, 0)
+
+    def resume_from(self, positions: Dict[str, Tuple[int, int]]):
+        """{generated_name: (line_number, byte_offset)} already imported."""
+        self._start = dict(positions)
+
+    @staticmethod
+    def example_uuid(filename: FileName, line_num: int) -> uuid.UUID:
+        return uuid.uuid5(uuid.NAMESPACE_URL, f"{filename.generated_name}#{line_num}")
+
+    def read_file(self, filename: FileName) -> Iterator[Dict]:
+        line_num, offset = self._start.get(filename.generated_name, (0, 0))
+        with open(filename.full_path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                line_num += 1
+                offset += len(raw)
+                self.position = (filename.generated_name, line_num, offset)
+                line = raw.decode(self.encoding, errors="replace").strip()
+                if not line:
+                    continue
+                try:
+                    row = self._loads(line)
+                except ValueError as e:
+                    self._errors.append(FileParseException(filename.upload_name, line_num, str(e)))
+                    continue
+                if not isinstance(row, dict):
+                    self._errors.append(
+                        FileParseException(filename.upload_name, line_num, "Each line must be a JSON object")
+                    )
+                    continue
+                yield {
+                    "example_uuid": self.example_uuid(filename, line_num),
+                    "filename": filename.generated_name,
+                    "upload_name": filename.upload_name,
+                    "#line_number": line_num,
+                    **row,
+                }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for filename in self.filenames:
+            yield from self.read_file(filename)
+
+    def batch(self, batch_size: int) -> Iterator[List[Dict]]:
+        for filename in self.filenames:
+            batch = []
+            for record in self.read_file(filename):
+                batch.append(record)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    @property
+    def errors(self) -> List[FileParseException]:
+        return self._errors
+
+
+class StreamingJsonlDataset(Dataset):
+    """
+    Base for JSONL datasets read with StreamingJsonlReader.
+
+    save() inserts examples in batch_size chunks, each in its own
+    transaction together with the optional checkpoint update, and reports
+    progress through an optional callback(processed, errors). Records whose
+    example uuid already exists are skipped, so a resumed import never
+    duplicates rows.
+    """
+
+    def save(
+        self,
+        user: User,
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int, int], None]] = None,
+        checkpoint=None,
+    ):
+        if checkpoint is not None:
+            self.reader.resume_from(checkpoint.positions())
+
+        processed = 0
+        for records in self.reader.batch(batch_size):
+            generated_name, line_num, offset = self.reader.position
+            with transaction.atomic():
+                records = self.new_records(records)
+                if records:
+                    self.save_batch(user, records)
+                if checkpoint is not None:
+                    checkpoint.commit(generated_name, line_num, offset, len(records))
+            processed += len(records)
+            if progress is not None:
+                progress(processed, len(self.errors))
+
+    def new_records(self, records: List[Dict]) -> List[Dict]:
+        """Drop records already imported by an earlier (interrupted) run."""
+        uuids = [record["example_uuid"] for record in records]
+        existing = set(Example.objects.filter(uuid__in=uuids).values_list("uuid", flat=True))
+        if not existing:
+            return records
+        return [record for record in records if record["example_uuid"] not in existing]
+
+    def save_batch(self, user: User, records: List[Dict]):
+        raise NotImplementedError()
+
+
 class Speech2TextData(BaseData):
     """Custom data class for STT that properly handles audio URL and transcript."""
     text: str = ""
@@ -165,9 +309,9 @@ class Speech2TextExampleMaker:
         self.project = project
         self._errors: List[FileParseException] = []
 
-    def make(self, df: pd.DataFrame) -> List[Example]:
+    def make(self, df) -> List[Example]:
         examples = []
-        for row in df.to_dict(orient="records"):
+        for row in _rows(df):
             try:
                 # Get uuid and upload_name from reader
                 example_uuid = row.pop('example_uuid')
@@ -222,10 +366,10 @@ class Speech2TextLabelMaker:
     def __init__(self):
         self._errors: List[FileParseException] = []
     
-    def make(self, df: pd.DataFrame) -> List[TextLabel]:
+    def make(self, df) -> List[TextLabel]:
         labels = []
         
-        for row in df.to_dict(orient="records"):
+        for row in _rows(df):
             example_uuid = row.get('example_uuid')
             
             # Prefer 'label' field, fallback to 'text'
@@ -243,7 +387,7 @@ class Speech2TextLabelMaker:
         return self._errors
 
 
-class Speech2TextJsonlDataset(Dataset):
+class Speech2TextJsonlDataset(StreamingJsonlDataset):
     """
     Dataset for importing STT data from JSONL with the format:
     {"filename": "https://audio.url/file.wav", "text": "transcript", "label": "transcript", "meta": {...}}
@@ -261,11 +405,26 @@ class Speech2TextJsonlDataset(Dataset):
         super().__init__(reader, project, **kwargs)
         self.example_maker = Speech2TextExampleMaker(project=project)
 
-    def save(self, user: User, batch_size: int = 1000):
+    def save_batch(self, user: User, records: List[Dict]):
         # Only create examples - TextLabels are created by celery_tasks.py patch
-        for records in self.reader.batch(batch_size):
-            examples = Examples(self.example_maker.make(records))
-            examples.save()
+        made = self.example_maker.make(records)
+        examples = Examples(made)
+        examples.save()
+        self.record_payment_metrics(made)
+
+    @staticmethod
+    def record_payment_metrics(examples: List[Example]):
+        """Store syllable count / audio minutes for the batch (assignment.payment_metrics)."""
+        try:
+            from assignment.payment_metrics import record_imported_examples
+        except ImportError:
+            return
+        try:
+            with transaction.atomic():
+                record_imported_examples(examples)
+        except Exception as e:
+            # Missing rows are filled later by backfill_payment_metrics
+            print(f"[Monlam Import] ⚠️ Could not record payment metrics: {e}")
 
     @property
     def errors(self) -> List[FileParseException]:
@@ -314,9 +473,9 @@ class ImageClassificationExampleMaker:
         self.project = project
         self._errors: List[FileParseException] = []
 
-    def make(self, df: pd.DataFrame) -> List[Example]:
+    def make(self, df) -> List[Example]:
         examples = []
-        for row in df.to_dict(orient="records"):
+        for row in _rows(df):
             try:
                 example_uuid = row.pop('example_uuid')
                 upload_name = row.pop('upload_name', '')
@@ -362,19 +521,21 @@ class ImageClassificationLabelMaker:
     def __init__(self):
         self._errors: List[FileParseException] = []
     
-    def make(self, df: pd.DataFrame) -> List[CategoryLabel]:
+    def make(self, df) -> List[CategoryLabel]:
         labels = []
         
-        # Explode label arrays
-        df_labels = df.explode('label')
-        
-        for row in df_labels.to_dict(orient="records"):
+        for row in _rows(df):
             example_uuid = row.get('example_uuid')
-            label_text = row.get('label', '')
             
-            if label_text and example_uuid:
-                label = CategoryLabel(example_uuid=example_uuid, label=label_text)
-                labels.append(label)
+            # Explode label arrays
+            label_texts = row.get('label', '')
+            if not isinstance(label_texts, list):
+                label_texts = [label_texts]
+            
+            for label_text in label_texts:
+                if label_text and example_uuid:
+                    label = CategoryLabel(example_uuid=example_uuid, label=label_text)
+                    labels.append(label)
         
         return labels
     
@@ -383,7 +544,7 @@ class ImageClassificationLabelMaker:
         return self._errors
 
 
-class ImageClassificationJsonlDataset(Dataset):
+class ImageClassificationJsonlDataset(StreamingJsonlDataset):
     """
     Dataset for importing Image Classification data from JSONL with format:
     {"filename": "https://image.url/file.jpg", "label": ["cat", "animal"], "meta": {...}}
@@ -399,17 +560,16 @@ class ImageClassificationJsonlDataset(Dataset):
         self.label_maker = ImageClassificationLabelMaker()
         self.types = LabelTypes(CategoryType)
 
-    def save(self, user: User, batch_size: int = 1000):
-        for records in self.reader.batch(batch_size):
-            # Create examples
-            examples = Examples(self.example_maker.make(records))
-            examples.save()
-            
-            # Create category labels
-            labels = Categories(self.label_maker.make(records), self.types)
-            labels.clean(self.project)
-            labels.save_types(self.project)
-            labels.save(user, examples)
+    def save_batch(self, user: User, records: List[Dict]):
+        # Create examples
+        examples = Examples(self.example_maker.make(records))
+        examples.save()
+        
+        # Create category labels
+        labels = Categories(self.label_maker.make(records), self.types)
+        labels.clean(self.project)
+        labels.save_types(self.project)
+        labels.save(user, examples)
 
     @property
     def errors(self) -> List[FileParseException]:
@@ -548,8 +708,14 @@ def select_dataset(project: Project, task: str, file_format: Format) -> Type[Dat
 
 
 def load_dataset(task: str, file_format: Format, data_files: List[FileName], project: Project, **kwargs) -> Dataset:
+    dataset_class = select_dataset(project, task, file_format)
+    
+    # MONLAM PATCH: Stream large JSONL manifests without pandas
+    if issubclass(dataset_class, StreamingJsonlDataset):
+        reader = StreamingJsonlReader(data_files, encoding=kwargs.get("encoding"))
+        return dataset_class(reader, project, **kwargs)
+    
     parser = create_parser(file_format, **kwargs)
     reader = Reader(data_files, parser)
-    dataset_class = select_dataset(project, task, file_format)
     return dataset_class(reader, project, **kwargs)
 
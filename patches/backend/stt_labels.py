@@ -0,0 +1,74 @@
+"""
+Set-based TextLabel creation for STT examples.
+
+This file is copied to /doccano/backend/data_import/stt_labels.py
+Shared by celery_tasks.create_text_labels_for_stt (after import) and
+auto_text_labels.bulk_create_text_labels.
+
+Examples without a TextLabel are found with an anti-join (NOT EXISTS)
+scoped to the given queryset and walked in id order (keyset chunks),
+reading only (id, text) - Example objects are never materialized.
+"""
+
+import logging
+
+from django.db.models import Exists, OuterRef
+
+from examples.models import Example
+from labels.models import TextLabel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def unlabeled_examples(examples):
+    """Examples from the queryset that have text but no TextLabel."""
+    return examples.exclude(
+        text=''
+    ).exclude(
+        text__isnull=True
+    ).annotate(
+        has_text_label=Exists(TextLabel.objects.filter(example_id=OuterRef('pk')))
+    ).filter(has_text_label=False)
+
+
+def create_missing_text_labels(examples, user, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Create a TextLabel (text = Example.text) for every unlabeled example.
+
+    Args:
+        examples: Example queryset to scope the work (e.g. one project)
+        user: User to set as the label's annotator
+        dry_run: Only count the examples that would be labeled
+        chunk_size: Rows inserted per bulk_create
+
+    Returns:
+        Number of labels created (or that would be created in dry-run mode)
+    """
+    missing = unlabeled_examples(examples)
+    if dry_run:
+        return missing.count()
+
+    created = 0
+    last_id = 0
+    while True:
+        rows = list(
+            missing.filter(id__gt=last_id).order_by('id').values_list('id', 'text')[:chunk_size]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        TextLabel.objects.bulk_create(
+            [TextLabel(example_id=example_id, user=user, text=text) for example_id, text in rows],
+            ignore_conflicts=True
+        )
+        created += len(rows)
+    return created
+
+
+def create_text_labels_for_project(project, user, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """create_missing_text_labels scoped to one project."""
+    return create_missing_text_labels(
+        Example.objects.filter(project=project), user, dry_run=dry_run, chunk_size=chunk_size
+    )
@@ -39,6 +39,11 @@ class MonlamTrackingConfig(AppConfig):
             setup_annotation_signals()
             setup_example_state_signals()  # Also track ExampleState (tick mark)
             print('[Monlam Tracking] ✅ Auto-tracking signals connected')
+            
+            from .tracking_buffer import connect_buffer_signals, deferred_tracking_enabled
+            connect_buffer_signals()
+            if deferred_tracking_enabled():
+                print('[Monlam Tracking] ✅ Deferred (batched) annotation tracking enabled')
         except Exception as e:
             print(f'[Monlam Tracking] ⚠️ Auto-tracking not set up: {e}')
 
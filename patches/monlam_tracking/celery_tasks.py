@@ -0,0 +1,17 @@
+"""
+Celery tasks for the monlam_tracking app.
+
+Discovered by Doccano's Celery app alongside data_import/data_export tasks.
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def apply_tracking_events_task(events):
+    """Apply a batch of deferred annotation-tracking events (see tracking_buffer)."""
+    from .tracking_buffer import apply_tracking_events
+
+    stats = apply_tracking_events(events)
+    print(f'[Monlam Tracking] Applied deferred tracking batch: {stats}')
+    return stats
@@ -0,0 +1,100 @@
+"""
+Import-Scoped Tracking Suppression
+
+Bulk imports can create thousands of labels through non-bulk code paths
+(Seq2seq / classification label makers, auto_text_labels), each of which
+would run the full per-row tracking signal chain. Inside
+suppress_tracking() the Monlam tracking receivers only record the affected
+example ids; when the block exits the recorded events are replayed as one
+set-based pass through tracking_buffer.apply_tracking_events. This also
+runs when the import fails: batches committed before the failure are
+skipped by the resumed import, so their tracking must be written now.
+Events of rolled back batches are dropped (their examples do not exist).
+
+Usage:
+    with suppress_tracking(project) as scope:
+        dataset.save(user, batch_size=...)
+    print(scope.stats)
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.utils import timezone
+
+_local = threading.local()
+
+BACKFILL_CHUNK_SIZE = 5000
+
+
+class TrackingScope:
+    """Events recorded while tracking receivers are suppressed."""
+
+    def __init__(self, project):
+        self.project = project
+        self.events = {}
+        self.stats = {}
+
+    def record(self, example_id, user_id, kind):
+        # Keep the latest event per example, like the deferred buffer's coalescing
+        self.events[example_id] = (example_id, self.project.id, user_id, timezone.now(), kind)
+
+    @property
+    def example_ids(self):
+        return set(self.events.keys())
+
+    def backfill(self):
+        """Apply the recorded events of committed examples in chunks with bulk queries."""
+        from examples.models import Example
+        from .tracking_buffer import apply_tracking_events
+
+        totals = {}
+        events = list(self.events.values())
+        for i in range(0, len(events), BACKFILL_CHUNK_SIZE):
+            chunk = events[i:i + BACKFILL_CHUNK_SIZE]
+            committed = set(
+                Example.objects.filter(id__in=[event[0] for event in chunk]).values_list('id', flat=True)
+            )
+            stats = apply_tracking_events([event for event in chunk if event[0] in committed])
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        self.events = {}
+        self.stats = totals
+        if totals:
+            print(f'[Monlam Tracking] ✅ Import backfill for project {self.project.id}: {totals}')
+        return totals
+
+
+def current_scope():
+    """The active TrackingScope for this thread, or None."""
+    return getattr(_local, 'scope', None)
+
+
+@contextmanager
+def suppress_tracking(project, backfill=True):
+    """
+    Disable Monlam tracking receivers for the duration of an import.
+
+    Args:
+        project: Project being imported into
+        backfill: Replay recorded events set-based on exit (default True)
+    """
+    previous = current_scope()
+    scope = TrackingScope(project)
+    _local.scope = scope
+    failed = False
+    try:
+        yield scope
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _local.scope = previous
+        if backfill:
+            try:
+                scope.backfill()
+            except Exception as e:
+                if not failed:
+                    raise
+                # Keep the import's own exception as the one reported
+                print(f'[Monlam Tracking] ⚠️ Import backfill for project {project.id} failed: {e}')
@@ -46,6 +46,19 @@ def track_annotation_saved(sender, instance, created, **kwargs):
     if not created:
         return  # Only track new annotations
     
+    # Bulk import in progress: record the example, backfilled set-based afterwards
+    from .import_scope import current_scope
+    scope = current_scope()
+    if scope is not None:
+        if getattr(instance, 'user_id', None) and getattr(instance, 'example_id', None):
+            scope.record(instance.example_id, instance.user_id, sender.__name__.lower())
+        return
+    
+    from .tracking_buffer import deferred_tracking_enabled
+    if deferred_tracking_enabled():
+        _track_annotation_deferred(sender, instance)
+        return
+    
     try:
         from assignment.simple_tracking import AnnotationTracking
         
@@ -57,11 +70,8 @@ def track_annotation_saved(sender, instance, created, **kwargs):
             return
         
         # Validate that user is a project member
-        from projects.models import Member
-        is_member = Member.objects.filter(
-            user=user,
-            project=example.project
-        ).exists()
+        from assignment.role_service import is_project_member
+        is_member = is_project_member(user, example.project)
         
         # Only proceed if user is a project member or superuser
         if not is_member and not user.is_superuser:
@@ -207,6 +217,47 @@ def track_annotation_saved(sender, instance, created, **kwargs):
         print(f'[Monlam Signals] ⚠️ Tracking failed: {e}')
 
 
+def _track_annotation_deferred(sender, instance):
+    """
+    Deferred variant of track_annotation_saved (MONLAM_DEFERRED_TRACKING).
+    
+    Only the approved-example guard runs inside the request; everything else
+    is buffered and applied in bulk after commit (see tracking_buffer).
+    """
+    try:
+        from assignment.simple_tracking import AnnotationTracking
+        from assignment.permissions import get_user_role
+        from .tracking_buffer import enqueue
+        
+        user_id = getattr(instance, 'user_id', None)
+        example_id = getattr(instance, 'example_id', None)
+        if not user_id or not example_id:
+            return
+        
+        example = instance.example
+        
+        # CRITICAL: Block annotators from saving to approved examples (synchronous)
+        is_approved = AnnotationTracking.objects.filter(
+            project_id=example.project_id,
+            example_id=example_id,
+            status='approved'
+        ).exists()
+        if is_approved:
+            role_name, is_privileged = get_user_role(instance.user, example.project_id)
+            if not is_privileged:
+                print(f'[Monlam Signals] ❌ BLOCKED: User {instance.user.username} (annotator) attempted to save annotation to approved example {example_id}')
+                try:
+                    instance.delete()
+                except Exception as e:
+                    print(f'[Monlam Signals] ⚠️ Could not delete annotation instance: {e}')
+                return
+        
+        enqueue(example_id, example.project_id, user_id, sender.__name__.lower())
+    
+    except Exception as e:
+        print(f'[Monlam Signals] ⚠️ Deferred tracking failed: {e}')
+
+
 def setup_example_state_signals():
     """
     Connect signal handlers for ExampleState model.
@@ -244,20 +295,23 @@ def track_example_state_saved(sender, instance, created, **kwargs):
     if not instance.confirmed_by:
         return  # Only process if confirmed_by is set
     
+    from .import_scope import current_scope
+    scope = current_scope()
+    if scope is not None:
+        scope.record(instance.example_id, instance.confirmed_by_id, 'examplestate')
+        return
+    
     try:
         from assignment.simple_tracking import AnnotationTracking
         from assignment.models_separate import Assignment
-        from projects.models import Member
+        from assignment.role_service import is_project_member
         
         example = instance.example
         confirmed_by = instance.confirmed_by
         confirmed_at = instance.confirmed_at or timezone.now()
         
         # Validate that confirmed_by is still a project member
-        is_member = Member.objects.filter(
-            user=confirmed_by,
-            project=example.project
-        ).exists()
+        is_member = is_project_member(confirmed_by, example.project)
         
         # Only proceed if user is a project member or superuser
         if not is_member and not confirmed_by.is_superuser:
@@ -0,0 +1,347 @@
+"""
+Deferred Annotation Tracking
+
+Batched alternative to doing all of track_annotation_saved's work inside
+the annotator's request. Enabled with settings.MONLAM_DEFERRED_TRACKING
+(or the MONLAM_DEFERRED_TRACKING=true environment variable).
+
+- The signal handler keeps the synchronous approved-example guard, then
+  only enqueues a compact (example_id, project_id, user_id, ts, kind)
+  event into a per-thread buffer.
+- Inside a transaction, events are batched per atomic block (keyed on the
+  connection's savepoint stack) and each batch is registered once with
+  transaction.on_commit. A rollback discards the callback and with it the
+  batch, so rolled back saves never produce tracking rows.
+- In autocommit mode the buffer is flushed at the end of the request.
+- A flush hands the events to a Celery worker (apply_tracking_events_task),
+  falling back to applying them inline if the broker is unavailable.
+- apply_tracking_events coalesces events per example and applies the
+  AnnotationTracking / ExampleState / Assignment transitions with bulk
+  queries.
+"""
+
+import os
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+_local = threading.local()
+
+
+def deferred_tracking_enabled():
+    """settings.MONLAM_DEFERRED_TRACKING, or the environment variable of the same name."""
+    default = os.environ.get('MONLAM_DEFERRED_TRACKING', '').lower() in ('1', 'true', 'yes')
+    return getattr(settings, 'MONLAM_DEFERRED_TRACKING', default)
+
+
+def _buffer():
+    events = getattr(_local, 'events', None)
+    if events is None:
+        events = _local.events = []
+    return events
+
+
+class _AtomicBatch:
+    """Events of one atomic block, sent by its on_commit callback."""
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self):
+        events, self.events = self.events, []
+        _send(events)
+
+
+def _pending(batch):
+    # Rolled back blocks drop their on_commit callbacks; committed ones have run
+    return any(item[1] is batch for item in connection.run_on_commit)
+
+
+def _atomic_batch():
+    """The batch of the current atomic block, registering its on_commit callback once."""
+    key = tuple(connection.savepoint_ids)
+    batches = {
+        k: batch for k, batch in (getattr(_local, 'batches', None) or {}).items()
+        if _pending(batch)
+    }
+    batch = batches.get(key)
+    if batch is None:
+        batch = batches[key] = _AtomicBatch()
+        transaction.on_commit(batch)
+    _local.batches = batches
+    return batch
+
+
+def enqueue(example_id, project_id, user_id, kind):
+    """Buffer one annotation-saved event; schedule a flush if none is pending."""
+    event = (example_id, project_id, user_id, timezone.now().isoformat(), kind)
+
+    if connection.in_atomic_block:
+        _atomic_batch().events.append(event)
+        return
+
+    _buffer().append(event)
+    if getattr(_local, 'in_request', False):
+        # Autocommit inside a request: flush once when the request ends
+        _local.flush_scheduled = True
+    else:
+        # Shell / management command without a transaction: nothing to batch with
+        flush()
+
+
+def flush():
+    """Send the autocommit-mode buffer to the worker (or apply it inline)."""
+    events = getattr(_local, 'events', None) or []
+    _local.events = []
+    _local.flush_scheduled = False
+    _send(events)
+
+
+def _send(events):
+    if not events:
+        return
+
+    try:
+        from .celery_tasks import apply_tracking_events_task
+        apply_tracking_events_task.delay(events)
+    except Exception as e:
+        print(f'[Monlam Tracking] ⚠️ Could not queue {len(events)} tracking events, applying inline: {e}')
+        apply_tracking_events(events)
+
+
+def discard():
+    """Drop buffered autocommit-mode events and forget finished atomic batches."""
+    _local.events = []
+    _local.flush_scheduled = False
+    _local.batches = {}
+
+
+def coalesce(events):
+    """
+    Reduce events to one entry per example: the latest (user, timestamp) wins,
+    matching what sequential signal handling would have left behind.
+
+    Returns:
+        dict: {example_id: (project_id, user_id, datetime)}
+    """
+    latest = {}
+    for example_id, project_id, user_id, ts, kind in events:
+        when = parse_datetime(ts) if isinstance(ts, str) else ts
+        current = latest.get(example_id)
+        if current is None or when >= current[2]:
+            latest[example_id] = (project_id, user_id, when)
+    return latest
+
+
+def apply_tracking_events(events):
+    """
+    Apply buffered annotation events in bulk.
+
+    Same transitions as the synchronous track_annotation_saved:
+    - AnnotationTracking created as submitted, or pending/rejected -> submitted
+    - ExampleState confirmed for annotator-only users
+    - active Assignment moved to submitted (what the ExampleState signal
+      would do for a newly confirmed example)
+
+    Returns:
+        Dict with counts of rows created/updated
+    """
+    from django.contrib.auth import get_user_model
+    from examples.models import ExampleState
+    from assignment.simple_tracking import AnnotationTracking
+    from assignment.models_separate import Assignment
+    from assignment.role_service import resolve
+    from assignment.roles import ROLE_ANNOTATOR
+    from assignment.rollups import record_confirmation
+    from assignment.upserts import inserted_rows
+    from assignment.completion_view import mark_projects_dirty
+    from assignment.activity_events import ActivityEvent, record_bulk_events
+
+    stats = {
+        'events': len(events),
+        'examples': 0,
+        'tracking_created': 0,
+        'tracking_updated': 0,
+        'states_created': 0,
+        'states_updated': 0,
+        'assignments_updated': 0,
+    }
+    latest = coalesce(events)
+    if not latest:
+        return stats
+    stats['examples'] = len(latest)
+
+    User = get_user_model()
+    user_ids = {user_id for _, user_id, _ in latest.values()}
+    superusers = set(
+        User.objects.filter(id__in=user_ids, is_superuser=True).values_list('id', flat=True)
+    )
+
+    # Membership / role per (user, project) - served by the role cache
+    eligible = {}
+    for example_id, (project_id, user_id, when) in latest.items():
+        is_member, role_name = resolve(user_id, project_id)
+        if not is_member and user_id not in superusers:
+            continue
+        is_privileged = user_id in superusers or any(
+            r in (role_name or '') for r in ['admin', 'manager', 'approver']
+        )
+        is_annotator_only = user_id not in superusers and role_name == ROLE_ANNOTATOR
+        eligible[example_id] = (project_id, user_id, when, is_privileged, is_annotator_only)
+
+    if not eligible:
+        return stats
+
+    example_ids = list(eligible.keys())
+    tracking_map = {
+        t.example_id: t
+        for t in AnnotationTracking.objects.filter(example_id__in=example_ids)
+    }
+    state_map = {
+        s.example_id: s
+        for s in ExampleState.objects.filter(example_id__in=example_ids)
+    }
+
+    tracking_create, tracking_update = [], []
+    state_create, state_update = [], []
+    confirmed = {}
+
+    for example_id, (project_id, user_id, when, is_privileged, is_annotator_only) in eligible.items():
+        tracking = tracking_map.get(example_id)
+
+        # Approved examples stay untouched for annotators (the synchronous guard
+        # already removed the annotation; this covers events queued before approval)
+        if tracking and tracking.status == 'approved' and not is_privileged:
+            continue
+
+        if tracking is None:
+            tracking = AnnotationTracking(
+                project_id=project_id,
+                example_id=example_id,
+                annotated_by_id=user_id,
+                annotated_at=when,
+                status='submitted'
+            )
+            tracking_create.append(tracking)
+        else:
+            needs_save = False
+            if not tracking.annotated_by_id:
+                tracking.annotated_by_id = user_id
+                tracking.annotated_at = when
+                tracking.status = 'submitted'
+                needs_save = True
+            if tracking.status in ['pending', 'rejected']:
+                tracking.annotated_at = when
+                tracking.status = 'submitted'
+                needs_save = True
+            if needs_save:
+                tracking_update.append(tracking)
+
+        if not is_annotator_only:
+            continue
+
+        confirmed_at = tracking.annotated_at or when
+        state = state_map.get(example_id)
+        if state is None:
+            state = ExampleState(
+                example_id=example_id,
+                confirmed_by_id=user_id,
+                confirmed_at=confirmed_at
+            )
+            state_create.append(state)
+            confirmed[example_id] = (project_id, user_id, confirmed_at)
+        else:
+            state.confirmed_by_id = user_id
+            state.confirmed_at = confirmed_at
+            state_update.append(state)
+
+    inserted_tracking, inserted_states = [], []
+    with transaction.atomic():
+        if tracking_create:
+            AnnotationTracking.objects.bulk_create(tracking_create, ignore_conflicts=True)
+            inserted_tracking = inserted_rows(
+                AnnotationTracking, tracking_create, ['example_id', 'annotated_by_id', 'annotated_at']
+            )
+        if tracking_update:
+            AnnotationTracking.objects.bulk_update(
+                tracking_update, ['annotated_by', 'annotated_at', 'status']
+            )
+        if state_create:
+            ExampleState.objects.bulk_create(state_create, ignore_conflicts=True)
+            # Rows skipped by ignore_conflicts were confirmed (and counted) elsewhere
+            inserted_states = inserted_rows(
+                ExampleState, state_create, ['example_id', 'confirmed_by_id', 'confirmed_at']
+            )
+        if state_update:
+            ExampleState.objects.bulk_update(state_update, ['confirmed_by', 'confirmed_at'])
+
+        if confirmed:
+            assignments = list(
+                Assignment.objects.filter(
+                    example_id__in=list(confirmed.keys()),
+                    is_active=True,
+                    status__in=['assigned', 'in_progress', 'pending']
+                )
+            )
+            for assignment in assignments:
+                project_id, user_id, confirmed_at = confirmed[assignment.example_id]
+                assignment.status = 'submitted'
+                assignment.submitted_at = confirmed_at
+                if not assignment.assigned_to_id:
+                    assignment.assigned_to_id = user_id
+            if assignments:
+                Assignment.objects.bulk_update(assignments, ['status', 'submitted_at', 'assigned_to'])
+                # bulk writes send no post_save: mark the completion view explicitly
+                mark_projects_dirty({assignment.project_id for assignment in assignments})
+            stats['assignments_updated'] = len(assignments)
+
+    # bulk_create skips post_save, so feed the rollups directly
+    for state in inserted_states:
+        project_id = confirmed[state.example_id][0]
+        try:
+            record_confirmation(project_id, state.confirmed_by_id, state.example_id, when=state.confirmed_at)
+        except Exception as e:
+            print(f'[Monlam Tracking] ⚠️ Could not record confirmation for example {state.example_id}: {e}')
+
+    # ... and the activity events (every row written here ends up submitted)
+    record_bulk_events(ActivityEvent.SUBMIT, [
+        (t.project_id, t.example_id, t.annotated_by_id, t.annotated_at)
+        for t in inserted_tracking + tracking_update
+    ])
+    record_bulk_events(ActivityEvent.CONFIRM, [
+        (confirmed[s.example_id][0], s.example_id, s.confirmed_by_id, s.confirmed_at)
+        for s in inserted_states
+    ])
+
+    stats['tracking_created'] = len(tracking_create)
+    stats['tracking_updated'] = len(tracking_update)
+    stats['states_created'] = len(state_create)
+    stats['states_updated'] = len(state_update)
+    return stats
+
+
+# ============================================================================
+# Request lifecycle
+# ============================================================================
+
+def _request_started(sender, **kwargs):
+    discard()
+    _local.in_request = True
+
+
+def _request_finished(sender, **kwargs):
+    _local.in_request = False
+    # Only set by autocommit-mode enqueues; atomic batches flush on commit
+    if getattr(_local, 'flush_scheduled', False):
+        flush()
+
+
+def connect_buffer_signals():
+    """Flush autocommit-mode buffers when the request ends."""
+    from django.core.signals import request_started, request_finished
+
+    request_started.connect(_request_started, dispatch_uid='monlam_tracking_buffer_start')
+    request_finished.connect(_request_finished, dispatch_uid='monlam_tracking_buffer_end')
@@ -5,7 +5,38 @@ Calculates payment for annotators and reviewers based on project-specific rules.
 """
 
 import re
-from typing import Dict, Optional
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+TSHEG = '\u0f0b'  # ་ - Tibetan syllable separator
+
+_HAS_TIBETAN = re.compile(r'[\u0F00-\u0FFF]')
+_TIBETAN_RUN = re.compile(r'[\u0F00-\u0FFF]+')
+
+
+def _count_syllables(text) -> int:
+    if not text or not isinstance(text, str):
+        return 0
+    
+    # Remove extra whitespace
+    text = text.strip()
+    if not text:
+        return 0
+    
+    # Tsheg becomes a space so str.split() (no regex) yields the runs
+    # between tsheg / whitespace with empties dropped
+    count = len(text.replace(TSHEG, ' ').split())
+    
+    # A single part: no tsheg / spaces to split on
+    if count == 1:
+        if _HAS_TIBETAN.search(text):
+            # For Tibetan text without tsheg, count each character group
+            # This is a fallback - ideally text should have tsheg
+            return len(_TIBETAN_RUN.findall(text))
+        # For non-Tibetan text, count words
+        return len(text.split())
+    
+    return count
 
 
 def count_tibetan_syllables(text: str) -> int:
@@ -23,41 +54,40 @@ def count_tibetan_syllables(text: str) -> int:
     Returns:
         Number of syllables counted
     """
-    if not text or not isinstance(text, str):
-        return 0
-    
-    # Remove extra whitespace
-    text = text.strip()
-    if not text:
-        return 0
-    
-    # Split by tsheg (་) - the primary Tibetan syllable separator
-    # Also split by spaces and line breaks
-    # Tibetan Unicode range: U+0F00 to U+0FFF
-    # Tsheg: U+0F0B (་)
-    
-    # Split by tsheg first
-    parts = re.split(r'[་\s\n\r]+', text)
+    return _count_syllables(text)
+
+
+def count_tibetan_syllables_many(texts: Iterable) -> List[int]:
+    """
+    Count syllables for many texts at once (same result as
+    count_tibetan_syllables for each item).
     
-    # Filter out empty strings
-    syllables = [p for p in parts if p.strip()]
+    Args:
+        texts: Any iterable of texts - a list, a queryset values_list,
+            or a NumPy object array. Non-string items count as 0.
     
-    # If no tsheg found, try splitting by spaces
-    if len(syllables) == 1 and text:
-        # Check if text contains Tibetan characters
-        has_tibetan = bool(re.search(r'[\u0F00-\u0FFF]', text))
-        if has_tibetan:
-            # For Tibetan text without tsheg, count each character group
-            # This is a fallback - ideally text should have tsheg
-            syllables = re.findall(r'[\u0F00-\u0FFF]+', text)
-        else:
-            # For non-Tibetan text, count words
-            syllables = text.split()
+    Returns:
+        List of syllable counts, in input order
+    """
+    count = _count_syllables
+    return [count(text) for text in texts]
+
+
+# Project-specific payment rules live in assignment.PaymentRate (prefix +
+# effective dates, editable in the admin) behind a cached prefix matcher
+
+
+def get_project_payment_prefix(project_name: str) -> Optional[str]:
+    """
+    The configured prefix a project name falls under, or None.
     
-    return len(syllables)
+    Payroll groups projects by this prefix (rates are per prefix).
+    """
+    from assignment.payment_rates import get_matcher
+    return get_matcher().prefix(project_name)
 
 
-def get_project_payment_config(project_name: str) -> Optional[Dict]:
+def get_project_payment_config(project_name: str, on: Optional[date] = None) -> Optional[Dict]:
     """
     Get payment configuration for a project.
     
@@ -66,72 +96,18 @@ def get_project_payment_config(project_name: str) -> Optional[Dict]:
     - KH_AB_A_***** (matches KH_AB_A prefix)
     - KH_MV_A_***** (matches KH_MV_A prefix)
     etc.
+    The longest matching prefix with a rate effective on the date wins.
+    
+    Args:
+        project_name: Name of the project
+        on: Date the work was done (default: today)
     
     Returns:
-        Dict with payment rates, or None if project not configured
+        Dict with payment rates (plus 'id' and 'prefix' of the PaymentRate
+        row), or None if project not configured
     """
-    if not project_name:
-        return None
-    
-    # Project-specific payment rules
-    # Keys are prefixes that project names should start with
-    payment_configs = {
-        # AM_AB_A and KH_AB_A: Rs. 5 × Total Audio Minutes + Rs. 2 per audio segment
-        'AM_AB_A': {
-            'audio_minute_rate': 5.0,
-            'segment_rate': 2.0,
-            'syllable_rate': None,  # Not used for this project
-        },
-        'KH_AB_A': {
-            'audio_minute_rate': 5.0,
-            'segment_rate': 2.0,
-            'syllable_rate': None,
-        },
-        
-        # KH_MV_A, KH_MV_B, AM_MV_B, AM_MV_A: Rs. 5 × Total Audio Minutes + Rs. 0.35 per reviewed syllable
-        'KH_MV_A': {
-            'audio_minute_rate': 5.0,
-            'segment_rate': None,
-            'syllable_rate': 0.35,
-        },
-        'KH_MV_B': {
-            'audio_minute_rate': 5.0,
-            'segment_rate': None,
-            'syllable_rate': 0.35,
-        },
-        'AM_MV_B': {
-            'audio_minute_rate': 5.0,
-            'segment_rate': None,
-            'syllable_rate': 0.35,
-        },
-        'AM_MV_A': {
-            'audio_minute_rate': 5.0,
-            'segment_rate': None,
-            'syllable_rate': 0.35,
-        },
-        
-        # STT_TEACHING_A: Rs. 5 × Total Audio Minutes + Rs. 0.3 per reviewed syllable
-        'STT_TEACHING_A': {
-            'audio_minute_rate': 5.0,
-            'segment_rate': None,
-            'syllable_rate': 0.3,
-        },
-    }
-    
-    # Check exact match first (for backward compatibility)
-    if project_name in payment_configs:
-        return payment_configs[project_name]
-    
-    # Check if project name starts with any of the prefix keys
-    # Sort by length (longest first) to match more specific prefixes first
-    # e.g., "STT_TEACHING_A" should match before "STT" if both existed
-    sorted_keys = sorted(payment_configs.keys(), key=len, reverse=True)
-    
-    for prefix in sorted_keys:
-        if project_name.startswith(prefix):
-            return payment_configs[prefix]
-    
-    return None
+    from assignment.payment_rates import get_matcher
+    return get_matcher().lookup(project_name, on=on)
 
 
 def calculate_payment(
@@ -139,7 +115,9 @@ def calculate_payment(
     total_audio_minutes: float,
     approved_segments: int = 0,
     reviewed_syllables: int = 0,
-    is_reviewer: bool = False
+    is_reviewer: bool = False,
+    on: Optional[date] = None,
+    config: Optional[Dict] = None
 ) -> Dict:
     """
     Calculate payment for an annotator or reviewer.
@@ -150,6 +128,8 @@ def calculate_payment(
         approved_segments: Number of submitted/approved audio segments (for annotators - based on submitted status)
         reviewed_syllables: Number of submitted/reviewed syllables (for annotators/reviewers - based on submitted status)
         is_reviewer: Whether this is a reviewer (affects which rates apply)
+        on: Date whose rates apply (default: today)
+        config: Rates to use instead of looking them up (e.g. from payroll)
     
     Returns:
         Dict with:
@@ -159,7 +139,8 @@ def calculate_payment(
         - syllable_payment: Payment from syllables (if applicable)
         - breakdown: Human-readable breakdown
     """
-    config = get_project_payment_config(project_name)
+    if config is None:
+        config = get_project_payment_config(project_name, on=on)
     
     if not config:
         return {
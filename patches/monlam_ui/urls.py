@@ -70,6 +70,12 @@ urlpatterns = [
         name='analytics-api'
     ),
     
+    path(
+        'analytics/payroll/',
+        views.payroll_export,
+        name='payroll-export'
+    ),
+    
     # ============================================
     # CHANGE PASSWORD (Global - for all users)
     # ============================================
@@ -85,5 +91,12 @@ urlpatterns = [
         views.api_change_password,
         name='api-change-password'
     ),
+    
+    # Role cache hit-rate (staff only)
+    path(
+        'api/role-cache-stats/',
+        views.api_role_cache_stats,
+        name='api-role-cache-stats'
+    ),
 ]
 
@@ -25,6 +25,8 @@ except ImportError:
     ROLE_ANNOTATION_APPROVER = 'annotation_approver'
     ROLE_PROJECT_MANAGER = 'project_manager'
 
+from assignment.role_service import get_role_name, is_project_member
+
 
 @login_required
 def project_landing(request, project_id):
@@ -35,13 +37,13 @@ def project_landing(request, project_id):
     - Completion Dashboard
     - Standard Project
     """
-    from projects.models import Project, Member
+    from projects.models import Project
     
     project = get_object_or_404(Project, pk=project_id)
     
     # Check access
     if not request.user.is_superuser:
-        if not Member.objects.filter(project_id=project_id, user=request.user).exists():
+        if not is_project_member(request.user, project_id):
             return render(request, '403.html', status=403)
     
     context = {
@@ -69,7 +71,7 @@ def completion_dashboard(request, project_id):
     - Project Admins
     - NOT visible to Annotators
     """
-    from projects.models import Project, Member
+    from projects.models import Project
     from assignment.permissions import get_user_role
     
     project = get_object_or_404(Project, pk=project_id)
@@ -77,7 +79,7 @@ def completion_dashboard(request, project_id):
     # Check if user has access to this project
     if not request.user.is_superuser:
         # Check if user is a member of this project (via role_mappings)
-        if not Member.objects.filter(project_id=project_id, user=request.user).exists():
+        if not is_project_member(request.user, project_id):
             return render(request, '403.html', status=403)
     
     # Get user role to determine if they can see payment metrics
@@ -104,13 +106,13 @@ def enhanced_dataset(request, project_id):
     - Annotation Status
     - Approval Status
     """
-    from projects.models import Project, Member
+    from projects.models import Project
     
     project = get_object_or_404(Project, pk=project_id)
     
     # Check access
     if not request.user.is_superuser:
-        if not Member.objects.filter(project_id=project_id, user=request.user).exists():
+        if not is_project_member(request.user, project_id):
             return render(request, '403.html', status=403)
     
     # Get project type and convert to URL format
@@ -153,7 +155,7 @@ def annotation_with_approval(request, project_id, example_id):
     - Audio auto-loop for STT projects
     - Multi-level approval status (annotation_approver and project_admin)
     """
-    from projects.models import Project, Member
+    from projects.models import Project
     from examples.models import Example
     from assignment.models_separate import Assignment
     from assignment.completion_tracking import ApproverCompletionStatus
@@ -164,7 +166,7 @@ def annotation_with_approval(request, project_id, example_id):
     
     # Check access
     if not request.user.is_superuser:
-        if not Member.objects.filter(project_id=project_id, user=request.user).exists():
+        if not is_project_member(request.user, project_id):
             return render(request, '403.html', status=403)
     
     # CRITICAL: Check if annotator can access/edit this example
@@ -211,8 +213,7 @@ def annotation_with_approval(request, project_id, example_id):
     for ap in all_approvals:
         # Get approver's role
         try:
-            member = Member.objects.filter(project=project, user=ap.approver).select_related('role').first()
-            approver_role = member.role.name.lower() if member and member.role else None
+            approver_role = get_role_name(ap.approver_id, project)
         except Exception:
             approver_role = None
         
@@ -252,9 +253,8 @@ def annotation_with_approval(request, project_id, example_id):
     user_role = None
     can_review_now = False
     try:
-        member = Member.objects.filter(project=project, user=request.user).select_related('role').first()
-        if member and member.role:
-            user_role = member.role.name.lower()
+        user_role = get_role_name(request.user, project)
+        if user_role:
             can_approve = any(r in user_role for r in ['approver', 'manager', 'admin'])
             
             # Check if user can review now (with role-specific rules)
@@ -311,308 +311,40 @@ def api_dataset_assignments(request, project_id):
     API endpoint to get all assignments for dataset view
     Returns assignment data for each example in the project
     
-    CRITICAL: Syncs data from ExampleState and AnnotationTracking to ensure consistency:
-    - If ExampleState exists (confirmed/finished), ensure AnnotationTracking exists
-    - If AnnotationTracking exists, ensure Assignment status reflects it
-    - If ExampleState exists but no Assignment, create one
+    Consistency between ExampleState, AnnotationTracking and Assignment is
+    maintained by the background reconciler (assignment.reconciliation),
+    which this endpoint only schedules - it does not sync inline.
     """
-    from projects.models import Project, Member
+    from projects.models import Project
     from assignment.models_separate import Assignment
-    from assignment.serializers import AssignmentSerializer
-    from examples.models import Example, ExampleState
+    from assignment.serializers import AssignmentSerializer, build_assignment_context
     from assignment.simple_tracking import AnnotationTracking
-    from django.utils import timezone
     
     project = get_object_or_404(Project, pk=project_id)
     
     # Check access
     if not request.user.is_superuser:
-        if not Member.objects.filter(project_id=project_id, user=request.user).exists():
+        if not is_project_member(request.user, project_id):
             return JsonResponse({'error': 'Permission denied'}, status=403)
     
-    # Get all examples in the project
-    all_examples = Example.objects.filter(project=project)
-    
-    # Get all ExampleState records (confirmed/finished examples) - including those with null confirmed_by
-    all_states = ExampleState.objects.filter(
-        example__project=project
-    ).select_related('confirmed_by', 'example')
-    
-    # Get all ExampleState records with confirmed_by set
-    confirmed_states = [s for s in all_states if s.confirmed_by]
-    
-    # Get all AnnotationTracking records
-    tracking_records = AnnotationTracking.objects.filter(
-        project=project
-    ).select_related('annotated_by', 'reviewed_by')
-    
-    # Create maps for quick lookup
-    confirmed_map = {state.example_id: state for state in confirmed_states}
-    all_states_map = {state.example_id: state for state in all_states}
-    tracking_map = {tracking.example_id: tracking for tracking in tracking_records}
-    
-    # Get existing assignments
-    assignments = Assignment.objects.filter(
-        project=project,
-        is_active=True
-    ).select_related('assigned_to', 'reviewed_by')
-    
-    assignment_map = {a.example_id: a for a in assignments}
-    
-    # SYNC DIRECTION 1: ExampleState → AnnotationTracking → Assignment
-    # For each confirmed example, ensure AnnotationTracking and Assignment are in sync
-    for example_id, state in confirmed_map.items():
-        example = state.example
-        confirmed_by = state.confirmed_by
-        
-        # Get or create AnnotationTracking
-        tracking = tracking_map.get(example_id)
-        if not tracking:
-            # Create AnnotationTracking if ExampleState exists but tracking doesn't
-            tracking, created = AnnotationTracking.objects.get_or_create(
-                project=project,
-                example=example,
-                defaults={
-                    'annotated_by': confirmed_by,
-                    'annotated_at': state.confirmed_at or timezone.now(),
-                    'status': 'submitted'  # Confirmed = submitted for review
-                }
-            )
-            if created:
-                print(f'[Dataset API] ✅ Created AnnotationTracking for example {example_id} (from ExampleState)')
-            tracking_map[example_id] = tracking
-        elif not tracking.annotated_by:
-            # Update tracking if annotated_by is missing
-            tracking.annotated_by = confirmed_by
-            tracking.annotated_at = state.confirmed_at or tracking.annotated_at or timezone.now()
-            if tracking.status == 'pending':
-                tracking.status = 'submitted'
-            tracking.save()
-            print(f'[Dataset API] ✅ Updated AnnotationTracking for example {example_id} (added annotated_by)')
-        
-        # Get or update Assignment
-        assignment = assignment_map.get(example_id)
-        if assignment:
-            # Update Assignment status if it's still pending but example is confirmed
-            if assignment.status in ['assigned', 'in_progress', 'pending'] and tracking.status == 'submitted':
-                assignment.status = 'submitted'
-                assignment.submitted_at = tracking.annotated_at or timezone.now()
-                if not assignment.assigned_to:
-                    assignment.assigned_to = confirmed_by
-                assignment.save()
-                print(f'[Dataset API] ✅ Updated Assignment status to submitted for example {example_id}')
-        else:
-            # Create Assignment if it doesn't exist but example is confirmed
-            # Only create if we have tracking with annotated_by
-            if tracking and tracking.annotated_by:
-                assignment = Assignment.objects.create(
-                    project=project,
-                    example=example,
-                    assigned_to=tracking.annotated_by,
-                    status='submitted',
-                    submitted_at=tracking.annotated_at or timezone.now(),
-                    is_active=True
-                )
-                assignment_map[example_id] = assignment
-                print(f'[Dataset API] ✅ Created Assignment for example {example_id} (from ExampleState)')
-    
-    # SYNC DIRECTION 2: AnnotationTracking → ExampleState → Assignment
-    # For examples with AnnotationTracking but missing ExampleState or missing confirmed_by
-    for example_id, tracking in tracking_map.items():
-        if tracking.annotated_by:
-            # Check if ExampleState exists
-            state = all_states_map.get(example_id)
-            
-            if not state:
-                # Create ExampleState if AnnotationTracking exists but ExampleState doesn't
-                try:
-                    example = Example.objects.get(id=example_id, project=project)
-                    state = ExampleState.objects.create(
-                        example=example,
-                        confirmed_by=tracking.annotated_by,
-                        confirmed_at=tracking.annotated_at or timezone.now()
-                    )
-                    all_states_map[example_id] = state
-                    print(f'[Dataset API] ✅ Created ExampleState for example {example_id} (from AnnotationTracking)')
-                except Exception as e:
-                    print(f'[Dataset API] ⚠️ Could not create ExampleState for example {example_id}: {e}')
-            elif not state.confirmed_by:
-                # Update ExampleState if confirmed_by is missing
-                state.confirmed_by = tracking.annotated_by
-                state.confirmed_at = tracking.annotated_at or state.confirmed_at or timezone.now()
-                state.save()
-                print(f'[Dataset API] ✅ Updated ExampleState for example {example_id} (added confirmed_by from AnnotationTracking)')
-            
-            # Ensure Assignment is synced
-            assignment = assignment_map.get(example_id)
-            if assignment:
-                # Update Assignment status if it's still pending/in_progress but tracking shows submitted
-                if assignment.status in ['assigned', 'in_progress', 'pending'] and tracking.status == 'submitted':
-                    assignment.status = 'submitted'
-                    assignment.submitted_at = tracking.annotated_at or timezone.now()
-                    if not assignment.assigned_to:
-                        assignment.assigned_to = tracking.annotated_by
-                    assignment.save()
-                    print(f'[Dataset API] ✅ Updated Assignment status to submitted for example {example_id} (from AnnotationTracking)')
-            else:
-                # Create Assignment if it doesn't exist but tracking does
-                try:
-                    example = Example.objects.get(id=example_id, project=project)
-                    assignment = Assignment.objects.create(
-                        project=project,
-                        example=example,
-                        assigned_to=tracking.annotated_by,
-                        status='submitted' if tracking.status == 'submitted' else 'in_progress',
-                        submitted_at=tracking.annotated_at if tracking.status == 'submitted' else None,
-                        is_active=True
-                    )
-                    assignment_map[example_id] = assignment
-                    print(f'[Dataset API] ✅ Created Assignment for example {example_id} (from AnnotationTracking)')
-                except Exception as e:
-                    print(f'[Dataset API] ⚠️ Could not create Assignment for example {example_id}: {e}')
-    
-    # SYNC DIRECTION 3: Handle ExampleState with null confirmed_by
-    # If ExampleState exists but confirmed_by is null, try to get it from AnnotationTracking
-    for example_id, state in all_states_map.items():
-        if not state.confirmed_by:
-            tracking = tracking_map.get(example_id)
-            if tracking and tracking.annotated_by:
-                # Update ExampleState with confirmed_by from AnnotationTracking
-                state.confirmed_by = tracking.annotated_by
-                state.confirmed_at = tracking.annotated_at or state.confirmed_at or timezone.now()
-                state.save()
-                print(f'[Dataset API] ✅ Fixed ExampleState for example {example_id} (added confirmed_by from AnnotationTracking)')
-    
-    # SYNC DIRECTION 4: Fix incorrect Assignment.status values
-    # If Assignment.status is 'approved'/'rejected'/'submitted' but example is NOT finished, correct it
-    from assignment.completion_tracking import ApproverCompletionStatus
-    
-    for example_id, assignment in assignment_map.items():
-        example_state = all_states_map.get(example_id)
-        is_finished = example_state and example_state.confirmed_by is not None
-        
-        # If example is NOT finished, Assignment.status should NOT be 'approved', 'rejected', or 'submitted'
-        if not is_finished and assignment.status in ['approved', 'rejected', 'submitted']:
-            # Store original status for logging
-            original_status = assignment.status
-            
-            # Determine correct status based on progress
-            if assignment.started_at:
-                correct_status = 'in_progress'
-            else:
-                correct_status = 'assigned'
-            
-            print(f'[Dataset API] 🔧 Fixing Assignment {assignment.id} for example {example_id}: status="{original_status}" but example not finished → changing to "{correct_status}"')
-            assignment.status = correct_status
-            
-            # Clear submitted_at if it was incorrectly set
-            if original_status == 'submitted':
-                assignment.submitted_at = None
-            
-            # Clear review fields if they were incorrectly set
-            if original_status in ['approved', 'rejected']:
-                assignment.reviewed_by = None
-                assignment.reviewed_at = None
-                assignment.review_notes = ''
-            
-            assignment.save(update_fields=['status', 'submitted_at', 'reviewed_by', 'reviewed_at', 'review_notes'])
-        
-        # If example IS finished, ensure Assignment.status matches ApproverCompletionStatus
-        elif is_finished:
-            # Check ApproverCompletionStatus for this example
-            has_rejection = ApproverCompletionStatus.objects.filter(
-                example_id=example_id,
-                project=project,
-                status='rejected'
-            ).exists()
-            
-            has_approval = ApproverCompletionStatus.objects.filter(
-                example_id=example_id,
-                project=project,
-                status='approved'
-            ).exists()
-            
-            # Determine what status should be
-            if has_rejection:
-                expected_status = 'rejected'
-            elif has_approval:
-                expected_status = 'approved'
-            else:
-                expected_status = 'submitted'
-            
-            # Fix if Assignment.status doesn't match
-            if assignment.status != expected_status:
-                print(f'[Dataset API] 🔧 Fixing Assignment {assignment.id} for example {example_id}: status="{assignment.status}" but should be "{expected_status}" (finished example)')
-                assignment.status = expected_status
-                if expected_status == 'submitted' and not assignment.submitted_at:
-                    assignment.submitted_at = example_state.confirmed_at or timezone.now()
-                assignment.save(update_fields=['status', 'submitted_at'])
+    # Schedule an incremental reconcile (only touches rows changed since the last run;
+    # throttled so table refreshes do not queue duplicates)
+    from assignment.reconciliation import schedule_reconcile
+    schedule_reconcile(project.id)
     
     # Check user role BEFORE filtering
     from assignment.permissions import get_user_role
     role_name, is_privileged = get_user_role(request.user, project.id)
     
-    # For privileged users (admins, managers, approvers): Ensure ALL examples have assignment records
-    # This allows them to see the complete status breakdown in the dataset table
+    # For privileged users (admins, managers, approvers): ALL examples need assignment records
+    # to show the complete status breakdown; missing ones are created on the worker
+    materializing = False
     if is_privileged:
-        # Get all example IDs that have assignments
-        assigned_example_ids = set(assignment_map.keys())
-        
-        # Get all example IDs in the project
-        all_example_ids = set(all_examples.values_list('id', flat=True))
-        
-        # Find examples without assignments
-        unassigned_example_ids = all_example_ids - assigned_example_ids
-        
-        # Create assignment records for unassigned examples (so privileged users can see them)
-        for example_id in unassigned_example_ids:
-            try:
-                example = Example.objects.get(id=example_id, project=project)
-                # Check if there's tracking data to determine status
-                tracking = tracking_map.get(example_id)
-                example_state = all_states_map.get(example_id)
-                
-                # Determine status and assigned_to
-                if tracking:
-                    # Use tracking status, but map to assignment status values
-                    tracking_status = tracking.status
-                    if tracking_status == 'submitted':
-                        status = 'submitted'
-                    elif tracking_status == 'approved':
-                        status = 'approved'
-                    elif tracking_status == 'rejected':
-                        status = 'rejected'
-                    elif tracking_status == 'pending':
-                        # Check if example is confirmed (finished)
-                        if example_state and example_state.confirmed_by:
-                            status = 'submitted'  # Confirmed = submitted
-                        else:
-                            status = 'in_progress'  # Pending but not confirmed = in progress
-                    else:
-                        status = 'assigned'
-                    assigned_to = tracking.annotated_by
-                elif example_state and example_state.confirmed_by:
-                    # Example is confirmed but no tracking - should be submitted
-                    status = 'submitted'
-                    assigned_to = example_state.confirmed_by
-                else:
-                    # No tracking, no state = truly unassigned
-                    status = 'assigned'
-                    assigned_to = None
-                
-                assignment = Assignment.objects.create(
-                    project=project,
-                    example=example,
-                    assigned_to=assigned_to,
-                    status=status,
-                    is_active=True
-                )
-                assignment_map[example_id] = assignment
-                print(f'[Dataset API] ✅ Created Assignment for example {example_id} (status={status}, for privileged user view)')
-            except Exception as e:
-                print(f'[Dataset API] ⚠️ Could not create Assignment for example {example_id}: {e}')
+        from assignment.materialize import has_unassigned_examples, schedule_materialize
+        if has_unassigned_examples(project):
+            materializing = True
+            schedule_materialize(project.id)
     
-    # Refresh assignments after syncing
     assignments = Assignment.objects.filter(
         project=project,
         is_active=True
@@ -638,11 +370,19 @@ def api_dataset_assignments(request, project_id):
         assignments = assignments.exclude(example_id__in=approved_example_ids)
         # Note: Rejected examples (status='rejected') are NOT filtered out - annotator can see and fix them
     
-    serializer = AssignmentSerializer(assignments, many=True)
+    # Preload states, tracking, approvals and member roles once so the
+    # serializer does dict lookups instead of per-row queries
+    assignments = list(assignments)
+    serializer = AssignmentSerializer(
+        assignments,
+        many=True,
+        context=build_assignment_context(project, assignments)
+    )
     
     return JsonResponse({
-        'count': assignments.count(),
-        'results': serializer.data
+        'count': len(assignments),
+        'results': serializer.data,
+        'materializing': materializing
     })
 
 
@@ -673,32 +413,25 @@ def api_completion_stats(request, project_id):
     """
     from projects.models import Project, Member
     from examples.models import ExampleState
-    from assignment.simple_tracking import AnnotationTracking
     
     project = get_object_or_404(Project, pk=project_id)
     
     # Check access
     if not request.user.is_superuser:
-        if not Member.objects.filter(project_id=project_id, user=request.user).exists():
+        if not is_project_member(request.user, project_id):
             return JsonResponse({'error': 'Permission denied'}, status=403)
     
     # Get overall stats
     total_examples = project.examples.count()
     
     # Get CONFIRMED examples from Doccano's ExampleState (checkmark clicked)
-    example_ids = list(project.examples.values_list('id', flat=True))
-    confirmed_states = ExampleState.objects.filter(
-        example_id__in=example_ids
-    ).select_related('confirmed_by')
-    confirmed_count = confirmed_states.count()
-    
-    # Get tracking stats (our approve/reject workflow)
-    tracking = AnnotationTracking.objects.filter(project=project)
+    confirmed_count = ExampleState.objects.filter(
+        example__project=project
+    ).count()
     
     # Get approval counts from ApproverCompletionStatus (source of truth for approvals)
     # This aligns with the Approver Activity table which uses ApproverCompletionStatus
     from assignment.completion_tracking import ApproverCompletionStatus
-    from assignment.roles import ROLE_PROJECT_ADMIN
     
     # Count distinct examples that have been approved (at least one approver approved)
     approved_example_ids = ApproverCompletionStatus.objects.filter(
@@ -717,46 +450,6 @@ def api_completion_stats(request, project_id):
     print(f'[Completion Stats] Approved count (from ApproverCompletionStatus): {approved_count}')
     print(f'[Completion Stats] Rejected count (from ApproverCompletionStatus): {rejected_count}')
     
-    # Get all project_admin members
-    admin_members = Member.objects.filter(
-        project=project
-    ).select_related('role').filter(
-        role__name__iexact=ROLE_PROJECT_ADMIN
-    )
-    admin_user_ids = [m.user_id for m in admin_members]
-    
-    # Count final approvals by project_admin
-    # Final Approved = total number of approvals made by project_admin users
-    # Each approval action by a project_admin counts as 1 Final Approved
-    print(f'[Completion Stats] Finding project_admin users: {admin_user_ids}')
-    if admin_user_ids:
-        final_approved_count = ApproverCompletionStatus.objects.filter(
-            project=project,
-            status='approved',
-            approver_id__in=admin_user_ids
-        ).count()  # Count total approvals by project_admin, not distinct examples
-        print(f'[Completion Stats] Final approved count (total approvals by project_admin): {final_approved_count}')
-    else:
-        # Fallback: check by role name directly if admin_user_ids is empty
-        final_approved_count = 0
-        for ap_completion in ApproverCompletionStatus.objects.filter(
-            project=project,
-            status='approved'
-        ).select_related('approver').defer('assignment'):
-            if ap_completion.approver:
-                try:
-                    approver_member = Member.objects.filter(
-                        user=ap_completion.approver,
-                        project=project
-                    ).select_related('role').first()
-                    if approver_member and approver_member.role:
-                        role_name = approver_member.role.name.lower().strip()
-                        if role_name == ROLE_PROJECT_ADMIN or 'project_admin' in role_name:
-                            final_approved_count += 1  # Count each approval
-                except Exception:
-                    pass
-        print(f'[Completion Stats] Final approved count (fallback): {final_approved_count}')
-    
     # Submitted = confirmed but not yet approved/rejected
     submitted_count = confirmed_count - approved_count - rejected_count
     if submitted_count < 0:
@@ -764,267 +457,85 @@ def api_completion_stats(request, project_id):
     
     pending_count = total_examples - confirmed_count
     
-    # Per-annotator stats - combine ExampleState (confirmed) and ApproverCompletionStatus (approvals)
-    # Build a mapping of example_id -> approval status from ApproverCompletionStatus (source of truth)
-    approval_by_example = {}
-    for ap_completion in ApproverCompletionStatus.objects.filter(project=project):
-        example_id = ap_completion.example_id
-        if example_id not in approval_by_example:
-            approval_by_example[example_id] = {'approved': False, 'rejected': False}
-        if ap_completion.status == 'approved':
-            approval_by_example[example_id]['approved'] = True
-        elif ap_completion.status == 'rejected':
-            approval_by_example[example_id]['rejected'] = True
-    
-    annotator_dict = {}
-    
-    # Get current project member user IDs for filtering
-    current_member_user_ids = set(
-        Member.objects.filter(project=project).values_list('user_id', flat=True)
-    )
-    
-    # Process ExampleState records (confirmed examples) and match with ApproverCompletionStatus
-    # Only include users who are CURRENT project members
-    for state in confirmed_states:
-        if state.confirmed_by:
-            # Only include if user is still a project member
-            if state.confirmed_by.id not in current_member_user_ids and not state.confirmed_by.is_superuser:
-                continue  # Skip users who are no longer project members
-            
-            username = state.confirmed_by.username
-            user_id = state.confirmed_by.id
-            example_id = state.example_id
-            
-            if username not in annotator_dict:
-                annotator_dict[username] = {
-                    'annotated_by__id': user_id,
-                    'annotated_by__username': username,
-                    'total_annotated': 0,  # Count of confirmed examples
-                    'submitted': 0,
-                    'approved': 0,
-                    'rejected': 0,
-                }
-            
-            annotator_dict[username]['total_annotated'] += 1
-            
-            # Check approval status from ApproverCompletionStatus (source of truth for approvals)
-            approval_status = approval_by_example.get(example_id, {})
-            if approval_status.get('approved'):
-                annotator_dict[username]['approved'] += 1
-            elif approval_status.get('rejected'):
-                annotator_dict[username]['rejected'] += 1
-            else:
-                # No approval/rejection yet - confirmed but awaiting review = submitted
-                annotator_dict[username]['submitted'] += 1
-    
-    # Final calculation: ensure total_annotated = submitted + approved + rejected for all annotators
-    # This ensures consistency even if tracking records are missing or mismatched
-    for username, stats in annotator_dict.items():
-        if stats['total_annotated'] > 0:
-            # Recalculate submitted to ensure: total_annotated = submitted + approved + rejected
-            calculated_submitted = stats['total_annotated'] - stats['approved'] - stats['rejected']
-            if calculated_submitted >= 0:
-                stats['submitted'] = calculated_submitted
-            else:
-                # If calculated_submitted < 0, it means we have more approved/rejected than confirmed
-                # This can happen if approvals/rejections exist for examples not confirmed by this annotator
-                # Reset to 0 and adjust approved/rejected to match total_annotated
-                stats['submitted'] = 0
-                # Cap approved + rejected at total_annotated
-                total_status = stats['approved'] + stats['rejected']
-                if total_status > stats['total_annotated']:
-                    # Proportionally adjust if needed (though this shouldn't happen with proper matching)
-                    ratio = stats['total_annotated'] / total_status if total_status > 0 else 1
-                    stats['approved'] = int(stats['approved'] * ratio)
-                    stats['rejected'] = int(stats['rejected'] * ratio)
-        else:
-            # No ExampleState records but we have tracking records (like tnamgyal)
-            # Calculate what total_annotated should be based on status counts
-            calculated_total = stats['submitted'] + stats['approved'] + stats['rejected']
-            if calculated_total > 0:
-                # Set total_annotated to match the sum of status counts
-                # This ensures: total_annotated = submitted + approved + rejected
-                stats['total_annotated'] = calculated_total
-                print(f'[Completion Stats] Fixed {username}: total_annotated was 0 but has {calculated_total} tracked examples (submitted={stats["submitted"]}, approved={stats["approved"]}, rejected={stats["rejected"]})')
-    
-    annotator_stats = sorted(annotator_dict.values(), key=lambda x: x['annotated_by__username'])
-    
-    # Per-approver stats (who approved/rejected)
-    # Get all approver completions for this project
-    # Defer 'assignment' field to avoid resolving the ForeignKey relationship
-    approver_completions = ApproverCompletionStatus.objects.filter(
-        project=project
-    ).select_related('approver').defer('assignment')
-    
-    # Debug: Check how many records we found
-    approver_count = approver_completions.count()
-    print(f'[Completion Stats] Found {approver_count} ApproverCompletionStatus records for project {project_id}')
-    
-    # Build approver stats with role and final approval info
-    approver_dict = {}
-    approver_roles_cache = {}  # Cache roles per approver to avoid repeated lookups
-    
-    # Process ApproverCompletionStatus records (primary source)
-    # Only include approvers who are CURRENT project members
-    processed_count = 0
-    error_count = 0
-    for ap_completion in approver_completions:
-        try:
-            # Skip if approver is None (shouldn't happen but be safe)
-            if not ap_completion.approver:
-                print(f'[Completion Stats] Warning: ApproverCompletionStatus {ap_completion.id} has no approver')
-                error_count += 1
-                continue
-            
-            # Only include if approver is still a project member
-            if ap_completion.approver.id not in current_member_user_ids and not ap_completion.approver.is_superuser:
-                continue  # Skip approvers who are no longer project members
-                
-            approver_id = ap_completion.approver.id
-            approver_username = ap_completion.approver.username
-            
-            # Get approver's role (cache it to avoid repeated lookups)
-            if approver_id not in approver_roles_cache:
-                approver_role = None
-                try:
-                    approver_member = Member.objects.filter(
-                        user=ap_completion.approver,
-                        project=project
-                    ).select_related('role').first()
-                    if approver_member and approver_member.role:
-                        approver_role = approver_member.role.name.lower().strip()
-                except Exception as e:
-                    print(f'[Completion Stats] Error getting approver role: {e}')
-                    approver_role = None
-                approver_roles_cache[approver_id] = approver_role
-            else:
-                approver_role = approver_roles_cache[approver_id]
-            
-            if approver_id not in approver_dict:
-                approver_dict[approver_id] = {
-                    'reviewed_by__id': approver_id,
-                    'reviewed_by__username': approver_username,
-                    'role': approver_role or 'unknown',
-                    'total_reviewed': 0,
-                    'approved': 0,
-                    'final_approved': 0,
-                    'rejected': 0,
-                }
-            
-            approver_dict[approver_id]['total_reviewed'] += 1
-            print(f'[Completion Stats] Processing approver {approver_username}: example {ap_completion.example_id}, status {ap_completion.status}, total_reviewed now {approver_dict[approver_id]["total_reviewed"]}')
-            
-            if ap_completion.status == 'approved':
-                approver_dict[approver_id]['approved'] += 1
-                # Count as final approved if this approver is project_admin
-                # Use robust comparison: check exact match or if 'project_admin' is in role name
-                is_project_admin = (
-                    approver_role == ROLE_PROJECT_ADMIN or 
-                    (approver_role and 'project_admin' in approver_role) or
-                    approver_dict[approver_id]['role'] == ROLE_PROJECT_ADMIN or
-                    (approver_dict[approver_id]['role'] and 'project_admin' in approver_dict[approver_id]['role'])
-                )
-                if is_project_admin:
-                    approver_dict[approver_id]['final_approved'] += 1
-            elif ap_completion.status == 'rejected':
-                approver_dict[approver_id]['rejected'] += 1
-            
-            processed_count += 1
-        except Exception as e:
-            print(f'[Completion Stats] Error processing ApproverCompletionStatus {ap_completion.id}: {e}')
-            import traceback
-            traceback.print_exc()
-            error_count += 1
+    # Per-user counters come from the precomputed rollup table (kept current by
+    # signals and the approve/reject endpoints) instead of scanning every
+    # ExampleState / ApproverCompletionStatus row
+    from assignment.rollups import ProjectStatusRollup, ensure_rollups
+    
+    rollups = ProjectStatusRollup.objects.filter(project=project).select_related('user')
+    # Not rebuilt since rollups were introduced: queue the rebuild on the worker
+    # (counters cover only post-deploy changes until it has run)
+    rollups_ready = ensure_rollups(project)
+    
+    # Current project member roles (one query)
+    member_roles = {
+        user_id: (role_name or '').lower().strip()
+        for user_id, role_name in Member.objects.filter(
+            project=project
+        ).values_list('user_id', 'role__name')
+    }
+    current_member_user_ids = set(member_roles.keys())
+    
+    annotator_stats = []
+    approver_stats = []
+    for rollup in rollups.order_by('user__username'):
+        user = rollup.user
+        # Only include users who are CURRENT project members
+        if user.id not in current_member_user_ids and not user.is_superuser:
             continue
-    
-    print(f'[Completion Stats] Processed {processed_count} ApproverCompletionStatus records, {error_count} errors, built {len(approver_dict)} approver entries')
-    
-    # Approver stats are now fully based on ApproverCompletionStatus (source of truth)
-    # No need to supplement with AnnotationTracking since ApproverCompletionStatus is the authoritative source
-    
-    # Ensure total_reviewed = approved + rejected + pending for each approver
-    # This ensures consistency
-    for approver_id, approver_data in approver_dict.items():
-        calculated_total = approver_data['approved'] + approver_data['rejected']
-        # If total_reviewed doesn't match, update it
-        if approver_data['total_reviewed'] != calculated_total:
-            print(f'[Completion Stats] Fixing total_reviewed for {approver_data["reviewed_by__username"]}: was {approver_data["total_reviewed"]}, should be {calculated_total}')
-            approver_data['total_reviewed'] = calculated_total
-    
-    approver_stats = sorted(approver_dict.values(), key=lambda x: x['reviewed_by__username'])
-    
-    # Calculate final_approved_count from approver_stats (sum of all final_approved)
-    # This ensures consistency with what's shown in the approver table
-    calculated_final_approved = sum(a['final_approved'] for a in approver_stats)
-    print(f'[Completion Stats] Final approved from approver_stats: {calculated_final_approved}, from DB query: {final_approved_count}')
-    
-    # Use the calculated value if it's different (more reliable since it matches the table)
-    if calculated_final_approved != final_approved_count:
-        print(f'[Completion Stats] Using calculated final_approved ({calculated_final_approved}) instead of DB query result ({final_approved_count})')
-        final_approved_count = calculated_final_approved
+        
+        if rollup.annotated > 0:
+            approved = max(rollup.annotated_approved, 0)
+            rejected = max(rollup.annotated_rejected, 0)
+            annotator_stats.append({
+                'annotated_by__id': user.id,
+                'annotated_by__username': user.username,
+                'total_annotated': rollup.annotated,
+                # total_annotated = submitted + approved + rejected
+                'submitted': max(rollup.annotated - approved - rejected, 0),
+                'approved': approved,
+                'rejected': rejected,
+            })
+        
+        if rollup.reviewed_approved > 0 or rollup.reviewed_rejected > 0:
+            approver_stats.append({
+                'reviewed_by__id': user.id,
+                'reviewed_by__username': user.username,
+                'role': member_roles.get(user.id) or 'unknown',
+                'total_reviewed': rollup.reviewed_approved + rollup.reviewed_rejected,
+                'approved': rollup.reviewed_approved,
+                'final_approved': rollup.final_approved,
+                'rejected': rollup.reviewed_rejected,
+            })
+    
+    # Final approvals by project_admin ONLY (matches the approver table)
+    final_approved_count = sum(a['final_approved'] for a in approver_stats)
     
     # ============================================
     # PAYMENT CALCULATION FOR APPROVERS
     # Uses same logic as analytics dashboard for consistency
     # ============================================
-    from .payment_utils import count_tibetan_syllables, calculate_payment
-    from examples.models import Example
+    from .payment_utils import calculate_payment
+    from assignment.payment_metrics import payment_sums
     
-    # Get examples with their metadata for payment calculation
-    examples_with_meta = Example.objects.filter(
-        project=project
-    ).select_related('project').only('id', 'project', 'meta', 'text')
-    
-    # Build mapping of example_id -> (duration, text)
-    example_meta_map = {}
-    for ex in examples_with_meta:
-        duration = 0.0
-        if ex.meta and isinstance(ex.meta, dict):
-            # Try different possible keys for duration
-            duration = ex.meta.get('duration', ex.meta.get('audio_duration', 0.0))
-            if duration and isinstance(duration, (int, float)):
-                duration = float(duration) / 60.0  # Convert seconds to minutes
-        example_meta_map[ex.id] = {
-            'duration_minutes': duration,
-            'text': ex.text or ''
-        }
-    
-    # Calculate payment per approver (grouped by project)
+    # Syllables / audio minutes are precomputed per example (import, signals and
+    # `manage.py backfill_payment_metrics`), so payment is a SQL SUM
     # Payment is based on REVIEWED examples (approved status in ApproverCompletionStatus)
-    approver_payment_data = {}  # approver_id -> {audio_minutes, reviewed_segments, reviewed_syllables}
-    
-    # Process ApproverCompletionStatus for payment calculation
     # Only include approvers who are CURRENT project members
-    for ap_completion in approver_completions:
-        if not ap_completion.approver or ap_completion.status != 'approved':
-            continue  # Only count approved reviews for payment
-        
-        # Only include if approver is still a project member
-        if ap_completion.approver.id not in current_member_user_ids and not ap_completion.approver.is_superuser:
-            continue  # Skip approvers who are no longer project members
-        
-        approver_id = ap_completion.approver.id
-        example_id = ap_completion.example_id
-        
-        if example_id not in example_meta_map:
-            continue
-        
-        ex_meta = example_meta_map[example_id]
-        duration = ex_meta['duration_minutes']
-        text = ex_meta['text']
-        
-        if approver_id not in approver_payment_data:
-            approver_payment_data[approver_id] = {
-                'audio_minutes': 0.0,
-                'reviewed_segments': 0,  # Each reviewed example counts as a segment
-                'reviewed_syllables': 0
-            }
-        
-        approver_payment_data[approver_id]['audio_minutes'] += duration
-        approver_payment_data[approver_id]['reviewed_segments'] += 1
-        # Count syllables from the annotation text
-        syllables = count_tibetan_syllables(text)
-        approver_payment_data[approver_id]['reviewed_syllables'] += syllables
+    approver_payment_data = {}  # approver_id -> {audio_minutes, reviewed_segments, reviewed_syllables}
+    for row in ApproverCompletionStatus.objects.filter(
+        project=project,
+        example__project=project,
+        status='approved',
+        approver__isnull=False
+    ).filter(
+        Q(approver_id__in=current_member_user_ids) | Q(approver__is_superuser=True)
+    ).values('approver_id').annotate(**payment_sums()).order_by():
+        approver_payment_data[row['approver_id']] = {
+            'audio_minutes': row['audio_minutes'],
+            'reviewed_segments': row['segments'],  # Each reviewed example counts as a segment
+            'reviewed_syllables': row['syllables']
+        }
     
     # Add payment metrics to approver stats
     total_audio_minutes_all = 0.0
@@ -1085,6 +596,7 @@ def api_completion_stats(request, project_id):
         },
         'annotators': annotator_stats,
         'approvers': approver_stats,
+        'rollups_pending': not rollups_ready,
     })
 
 
@@ -1347,74 +859,44 @@ def analytics_api(request):
     else:
         projects = Project.objects.all()
     
-    # Get all example IDs for these projects
-    example_ids = list(Example.objects.filter(project__in=projects).values_list('id', flat=True))
+    # Confirmations, submissions and reviews come from the day-indexed activity
+    # event table (assignment.activity_events): grouped aggregates over a range
+    # scan on (day, project, event_type) instead of walking AnnotationTracking
+    # rows in Python with every example id in an IN list
+    # (history is loaded by backfill_activity_events: command or beat task;
+    # projects not backfilled yet are reported, never backfilled here)
+    from django.db.models import Max, Min, OuterRef, Subquery, Sum
+    from assignment.activity_events import ActivityEvent, events_in_range, projects_pending_backfill
+    from assignment.simple_tracking import AnnotationTracking
     
-    # Get ExampleState data (confirmations)
-    states = ExampleState.objects.filter(
-        example_id__in=example_ids,
-        confirmed_at__gte=start_datetime,
-        confirmed_at__lte=end_datetime
-    ).select_related('confirmed_by', 'example')
+    activity_backfill_pending = list(projects_pending_backfill(projects).values_list('id', flat=True))
     
-    # Get tracking data - filter by date range for activity tracking
-    try:
-        from assignment.simple_tracking import AnnotationTracking
-        # Get tracking data within date range (based on annotated_at or reviewed_at)
-        # Include if annotated_at is in range OR reviewed_at is in range
-        tracking_in_range = AnnotationTracking.objects.filter(
-            project__in=projects
-        ).filter(
-            Q(annotated_at__isnull=False, annotated_at__gte=start_datetime, annotated_at__lte=end_datetime) |
-            Q(reviewed_at__isnull=False, reviewed_at__gte=start_datetime, reviewed_at__lte=end_datetime)
-        ).select_related('annotated_by', 'reviewed_by')
-        
-        # Get tracking for payment calculation - FILTERED BY DATE RANGE (same as activity tracking)
-        # For annotators: filter by annotated_at (when they submitted)
-        # For reviewers: filter by reviewed_at (when they reviewed)
-        tracking_for_payment = AnnotationTracking.objects.filter(
-            project__in=projects
-        ).filter(
-            Q(annotated_at__isnull=False, annotated_at__gte=start_datetime, annotated_at__lte=end_datetime) |
-            Q(reviewed_at__isnull=False, reviewed_at__gte=start_datetime, reviewed_at__lte=end_datetime)
-        ).select_related('annotated_by', 'reviewed_by')
-        
-        # Also get all tracking (unfiltered) for summary stats that need all-time data
-        tracking_all = AnnotationTracking.objects.filter(
-            project__in=projects
-        ).select_related('annotated_by', 'reviewed_by')
-    except Exception as e:
-        print(f"[Analytics] Error loading tracking data: {e}")
-        tracking_in_range = AnnotationTracking.objects.none()
-        tracking_for_payment = AnnotationTracking.objects.none()
-        tracking_all = AnnotationTracking.objects.none()
+    confirm_events = events_in_range(projects, start_datetime, end_datetime, ActivityEvent.CONFIRM)
+    submit_events = events_in_range(projects, start_datetime, end_datetime, ActivityEvent.SUBMIT)
+    approve_events = events_in_range(projects, start_datetime, end_datetime, ActivityEvent.APPROVE)
+    reject_events = events_in_range(projects, start_datetime, end_datetime, ActivityEvent.REJECT)
+    
+    def annotator_of():
+        """Username of the example's annotator (ExampleState.confirmed_by), as a subquery."""
+        return Subquery(
+            ExampleState.objects.filter(
+                example_id=OuterRef('example_id'),
+                confirmed_by__isnull=False
+            ).values('confirmed_by__username')[:1]
+        )
     
     # Summary stats - ALL USE DATE-FILTERED DATA for consistency
-    total_examples = len(example_ids)
-    confirmed_count = states.count()  # Date-filtered confirmations
+    total_examples = Example.objects.filter(project__in=projects).count()
+    confirmed_count = confirm_events.count()  # Date-filtered confirmations
     
     # Pending count: Total examples minus date-filtered confirmed count
     # This shows how many examples are still pending confirmation within the date range
     pending_count = total_examples - confirmed_count
     
-    # Approved/rejected counts - USE DATE-FILTERED tracking_in_range
-    approved_count = 0
-    rejected_count = 0
-    if tracking_in_range:
-        # Count approvals/rejections that happened within date range
-        # AnnotationTracking uses 'reviewed' status (not 'approved')
-        approved_count = tracking_in_range.filter(
-            status='reviewed',  # AnnotationTracking uses 'reviewed' status
-            reviewed_at__isnull=False,
-            reviewed_at__gte=start_datetime,
-            reviewed_at__lte=end_datetime
-        ).count()
-        rejected_count = tracking_in_range.filter(
-            status='rejected',
-            reviewed_at__isnull=False,
-            reviewed_at__gte=start_datetime,
-            reviewed_at__lte=end_datetime
-        ).count()
+    # Approved/rejected counts - reviews made within the date range
+    # (an example reviewed by several approvers counts once)
+    approved_count = approve_events.aggregate(n=Count('example_id', distinct=True))['n']
+    rejected_count = reject_events.aggregate(n=Count('example_id', distinct=True))['n']
     
     # Get final approvals - ALWAYS project_admin approvals only - DATE-FILTERED
     # Final approved = approvals made by users with project_admin role
@@ -1468,191 +950,111 @@ def analytics_api(request):
         print(f"[Analytics] Traceback: {traceback.format_exc()}")
         final_approved_count = 0
     
-    # Get unique annotators in this period (from both states and tracking)
-    annotator_usernames_from_states = set(states.values_list('confirmed_by__username', flat=True).distinct())
-    annotator_usernames_from_tracking = set(tracking_in_range.values_list('annotated_by__username', flat=True).distinct())
+    # Get unique annotators in this period (from both confirmations and submissions)
+    annotator_usernames_from_states = set(
+        confirm_events.values_list('user__username', flat=True).distinct()
+    )
+    annotator_usernames_from_tracking = set(submit_events.values_list('user__username', flat=True).distinct())
     all_annotator_usernames = annotator_usernames_from_states | annotator_usernames_from_tracking
     active_annotators = len(all_annotator_usernames)
     
-    # Per-annotator stats - build from tracking_in_range for consistency
-    # Use AnnotationTracking as source of truth since it has both annotation and approval/rejection status
+    # Per-annotator stats - grouped aggregates over the events in range
     annotator_stats = {}
     
-    # First, build stats from tracking_in_range (annotations within date range)
-    for t in tracking_in_range:
-        if t.annotated_by and t.annotated_at and start_datetime <= t.annotated_at <= end_datetime:
-            username = t.annotated_by.username
-            if username not in annotator_stats:
-                annotator_stats[username] = {
-                    'username': username,
-                    'total': 0,  # Will count from ExampleState for consistency
-                    'approved': 0,
-                    'rejected': 0,
-                    'pending': 0,
-                    'total_time_seconds': 0,
-                    'first_date': t.annotated_at.date(),
-                    'last_date': t.annotated_at.date()
-                }
-            # Update dates
-            track_date = t.annotated_at.date()
-            if track_date < annotator_stats[username]['first_date']:
-                annotator_stats[username]['first_date'] = track_date
-            if track_date > annotator_stats[username]['last_date']:
-                annotator_stats[username]['last_date'] = track_date
-    
-    # Now count total from ExampleState (confirmations in date range) for each annotator
+    # First, build stats from the submissions within the date range
+    for row in submit_events.values('user__username').annotate(
+        first_day=Min('day'), last_day=Max('day')
+    ).order_by():
+        annotator_stats[row['user__username']] = {
+            'username': row['user__username'],
+            'total': 0,  # Counted from the confirm events below
+            'approved': 0,
+            'rejected': 0,
+            'pending': 0,
+            'total_time_seconds': 0,
+            'first_date': row['first_day'],
+            'last_date': row['last_day']
+        }
+    
+    # Now count total from confirm events (confirmations in date range) for each annotator
     # This ensures total matches the confirmed_count logic
-    for state in states:
-        if state.confirmed_by:
-            username = state.confirmed_by.username
-            if username not in annotator_stats:
-                # Initialize if not already in stats
-                annotator_stats[username] = {
-                    'username': username,
-                    'total': 0,
-                    'approved': 0,
-                    'rejected': 0,
-                    'pending': 0,
-                    'total_time_seconds': 0,
-                    'first_date': state.confirmed_at.date(),
-                    'last_date': state.confirmed_at.date()
-                }
-            annotator_stats[username]['total'] += 1
-            # Update dates
-            state_date = state.confirmed_at.date()
-            if state_date < annotator_stats[username]['first_date']:
-                annotator_stats[username]['first_date'] = state_date
-            if state_date > annotator_stats[username]['last_date']:
-                annotator_stats[username]['last_date'] = state_date
-    
-    # Add tracking status and time spent (from tracking_in_range - DATE-FILTERED)
-    # For annotator stats: count approved/rejected examples that were annotated by this user
-    # AND approved/rejected within the date range
-    # Since single annotator, match tracking with ExampleState to get annotator info
+    for row in confirm_events.values('user__username').annotate(
+        n=Count('pk'), first_day=Min('day'), last_day=Max('day')
+    ).order_by():
+        username = row['user__username']
+        if username not in annotator_stats:
+            # Initialize if not already in stats
+            annotator_stats[username] = {
+                'username': username,
+                'total': 0,
+                'approved': 0,
+                'rejected': 0,
+                'pending': 0,
+                'total_time_seconds': 0,
+                'first_date': row['first_day'],
+                'last_date': row['last_day']
+            }
+        annotator_stats[username]['total'] += row['n']
+        # Update dates
+        if row['first_day'] < annotator_stats[username]['first_date']:
+            annotator_stats[username]['first_date'] = row['first_day']
+        if row['last_day'] > annotator_stats[username]['last_date']:
+            annotator_stats[username]['last_date'] = row['last_day']
+    
+    # Approvals/rejections within the date range of each annotator's examples
+    # (annotator = ExampleState.confirmed_by), one grouped query per decision
+    for key, events in (('approved', approve_events), ('rejected', reject_events)):
+        for row in events.annotate(annotator=annotator_of()).values('annotator').annotate(
+            n=Count('example_id', distinct=True)
+        ).order_by():
+            if row['annotator'] in annotator_stats:
+                annotator_stats[row['annotator']][key] += row['n']
+    
+    # Time spent on annotations within the date range, per annotator
     total_time_all = 0
-    if tracking_in_range:
-        # Get ExampleState for all examples in tracking to identify annotators
-        example_ids_in_range = [t.example_id for t in tracking_in_range]
-        states_in_range = ExampleState.objects.filter(
-            example_id__in=example_ids_in_range,
-            confirmed_by__isnull=False
-        ).select_related('confirmed_by')
-        
-        # Create mapping: example_id -> confirmed_by user
-        example_to_annotator = {s.example_id: s.confirmed_by for s in states_in_range}
-        
-        for t in tracking_in_range:
-            # Get annotator from ExampleState
-            annotator = example_to_annotator.get(t.example_id)
-            
-            if annotator and annotator.username in annotator_stats:
-                # Only count if the approval/rejection happened within date range
-                # AND the example was annotated by this user
-                if t.status == 'reviewed' and t.reviewed_at:  # Changed from 'approved' to 'reviewed'
-                    if start_datetime <= t.reviewed_at <= end_datetime:
-                        annotator_stats[annotator.username]['approved'] += 1
-                elif t.status == 'rejected' and t.reviewed_at:
-                    if start_datetime <= t.reviewed_at <= end_datetime:
-                        annotator_stats[annotator.username]['rejected'] += 1
-                
-                # Add time spent (only for annotations within date range)
-                if t.annotated_at and start_datetime <= t.annotated_at <= end_datetime:
-                    if hasattr(t, 'time_spent_seconds') and t.time_spent_seconds:
-                        annotator_stats[annotator.username]['total_time_seconds'] += t.time_spent_seconds
-                        total_time_all += t.time_spent_seconds
+    for row in AnnotationTracking.objects.filter(
+        project__in=projects,
+        annotated_at__gte=start_datetime,
+        annotated_at__lte=end_datetime,
+        time_spent_seconds__gt=0
+    ).annotate(annotator=annotator_of()).values('annotator').annotate(
+        seconds=Sum('time_spent_seconds')
+    ).order_by():
+        if row['annotator'] in annotator_stats:
+            annotator_stats[row['annotator']]['total_time_seconds'] += row['seconds']
+            total_time_all += row['seconds']
     
     # ============================================
     # PAYMENT CALCULATION
     # ============================================
-    from .payment_utils import count_tibetan_syllables, calculate_payment
-    
-    # Get examples with their metadata for payment calculation
-    examples_with_meta = Example.objects.filter(
-        id__in=example_ids
-    ).select_related('project').only('id', 'project', 'meta', 'text')
-    
-    # Build mapping of example_id -> (project_name, duration, text)
-    example_meta_map = {}
-    for ex in examples_with_meta:
-        duration = 0.0
-        if ex.meta and isinstance(ex.meta, dict):
-            # Try different possible keys for duration
-            duration = ex.meta.get('duration', ex.meta.get('audio_duration', 0.0))
-            if duration and isinstance(duration, (int, float)):
-                duration = float(duration) / 60.0  # Convert seconds to minutes
-        example_meta_map[ex.id] = {
-            'project_name': ex.project.name,
-            'duration_minutes': duration,
-            'text': ex.text or ''
+    from assignment.payment_metrics import payment_sums
+    
+    # Syllables / audio minutes are precomputed per example (import, signals and
+    # `manage.py backfill_payment_metrics`); everything below aggregates them with SQL SUMs
+    
+    def approved_review_sums(completions):
+        """{username: {'audio_minutes', 'syllables'}} over the approved rows."""
+        return {
+            row['approver__username']: row
+            for row in completions.filter(status='approved').values(
+                'approver__username'
+            ).annotate(**payment_sums()).order_by()
         }
     
     # Calculate payment per annotator (grouped by project)
     # Payment is based on SUBMITTED examples (not approved)
-    annotator_payment_data = {}  # username -> {project_name -> {audio_minutes, submitted_segments, submitted_syllables}}
-    reviewer_payment_data = {}   # username -> {project_name -> {reviewed_syllables}}
-    
-    # Process tracking data for payment calculation (use tracking_for_payment - FILTERED BY DATE RANGE)
-    if tracking_for_payment:
-        for t in tracking_for_payment:
-            if t.example_id not in example_meta_map:
-                continue
-            
-            ex_meta = example_meta_map[t.example_id]
-            project_name = ex_meta['project_name']
-            duration = ex_meta['duration_minutes']
-            text = ex_meta['text']
-            
-            # Annotator payment (for SUBMITTED examples - filter by annotated_at within date range)
-            # Include examples that were submitted (have annotated_at), regardless of current status
-            # This ensures payment is calculated even after examples are reviewed/rejected
-            if t.annotated_by and t.annotated_at and t.status in ['submitted', 'reviewed', 'rejected']:
-                # Only count if annotated_at is within the date+time range
-                if start_datetime <= t.annotated_at <= end_datetime:
-                    username = t.annotated_by.username
-                    if username not in annotator_payment_data:
-                        annotator_payment_data[username] = {}
-                    if project_name not in annotator_payment_data[username]:
-                        annotator_payment_data[username][project_name] = {
-                            'audio_minutes': 0.0,
-                            'submitted_segments': 0,
-                            'submitted_syllables': 0
-                        }
-                    annotator_payment_data[username][project_name]['audio_minutes'] += duration
-                    annotator_payment_data[username][project_name]['submitted_segments'] += 1
-                    # Count syllables for submitted examples
-                    syllables = count_tibetan_syllables(text)
-                    annotator_payment_data[username][project_name]['submitted_syllables'] += syllables
-            
-            # Reviewer payment (for reviewed examples - filter by reviewed_at within date range)
-            # Use ApproverCompletionStatus to identify reviewers (since AnnotationTracking no longer has reviewed_by)
-            # Reviewers get the same payment as annotators: audio + segments/syllables
-            if t.status == 'reviewed' and t.reviewed_at:  # Changed from 'approved' to 'reviewed'
-                # Only count if reviewed_at is within the date+time range
-                if start_datetime <= t.reviewed_at <= end_datetime:
-                    # Get reviewers from ApproverCompletionStatus for this example
-                    from assignment.completion_tracking import ApproverCompletionStatus
-                    approver_completions = ApproverCompletionStatus.objects.filter(
-                        example_id=t.example_id,
-                        status='approved',  # ApproverCompletionStatus still uses 'approved'
-                        reviewed_at__gte=start_datetime,
-                        reviewed_at__lte=end_datetime
-                    ).select_related('approver').defer('assignment')
-                    
-                    for ap_completion in approver_completions:
-                        username = ap_completion.approver.username
-                        if username not in reviewer_payment_data:
-                            reviewer_payment_data[username] = {}
-                        if project_name not in reviewer_payment_data[username]:
-                            reviewer_payment_data[username][project_name] = {
-                                'audio_minutes': 0.0,
-                                'reviewed_segments': 0,  # Each reviewed example counts as a segment
-                                'reviewed_syllables': 0
-                            }
-                        reviewer_payment_data[username][project_name]['audio_minutes'] += duration
-                        reviewer_payment_data[username][project_name]['reviewed_segments'] += 1
-                        # Count syllables from the annotation text
-                        syllables = count_tibetan_syllables(text)
-                        reviewer_payment_data[username][project_name]['reviewed_syllables'] += syllables
+    # Priced like the payroll export (assignment.payroll): grouped SUMs per day,
+    # each day at the rate effective on it, summed per (user, project)
+    # Annotators: SUBMITTED examples (annotated_at in range, regardless of current status)
+    # Reviewers: ApproverCompletionStatus approvals in range on examples reviewed in range
+    from assignment.payroll import annotator_totals, reviewer_totals, price_per_project
+    # username -> {project_name -> {audio_minutes, segments, syllables, total_rupees, configured, breakdown}}
+    annotator_payment_data = price_per_project(
+        annotator_totals(projects, start_datetime, end_datetime, by_day=True)
+    )
+    reviewer_payment_data = price_per_project(
+        reviewer_totals(projects, start_datetime, end_datetime, by_day=True)
+    )
     
     # Calculate payments for annotators
     for username, stats in annotator_stats.items():
@@ -1664,36 +1066,20 @@ def analytics_api(request):
         # Annotator payment (based on submitted examples)
         if username in annotator_payment_data:
             for project_name, data in annotator_payment_data[username].items():
-                payment = calculate_payment(
-                    project_name=project_name,
-                    total_audio_minutes=data['audio_minutes'],
-                    approved_segments=data['submitted_segments'],  # Use submitted_segments for payment
-                    reviewed_syllables=data.get('submitted_syllables', 0),  # Use submitted_syllables for payment
-                    is_reviewer=False
-                )
                 stats['total_audio_minutes'] += data['audio_minutes']
-                stats['total_syllables'] += data.get('submitted_syllables', 0)
-                stats['total_rupees'] += payment['total_rupees']
-                if payment['configured']:
-                    stats['payment_breakdown'].append(f"{project_name}: {payment['breakdown']}")
+                stats['total_syllables'] += data['syllables']
+                stats['total_rupees'] += data['total_rupees']
+                if data['configured']:
+                    stats['payment_breakdown'].append(f"{project_name}: {data['breakdown']}")
         
-        # Reviewer payment (if user also reviewed - same structure as annotators)
+        # Reviewer payment (if user also reviewed - reviewers get the same rates as annotators)
         if username in reviewer_payment_data:
             for project_name, data in reviewer_payment_data[username].items():
-                # Reviewers get the same payment structure as annotators
-                # Use reviewed_segments for segment-based projects, reviewed_syllables for syllable-based projects
-                payment = calculate_payment(
-                    project_name=project_name,
-                    total_audio_minutes=data['audio_minutes'],
-                    approved_segments=data['reviewed_segments'],  # Use reviewed_segments for segment rate
-                    reviewed_syllables=data['reviewed_syllables'],  # Use reviewed_syllables for syllable rate
-                    is_reviewer=False  # Same calculation as annotators
-                )
                 stats['total_audio_minutes'] += data['audio_minutes']
-                stats['total_syllables'] += data['reviewed_syllables']
-                stats['total_rupees'] += payment['total_rupees']
-                if payment['configured']:
-                    stats['payment_breakdown'].append(f"{project_name} (Review): {payment['breakdown']}")
+                stats['total_syllables'] += data['syllables']
+                stats['total_rupees'] += data['total_rupees']
+                if data['configured']:
+                    stats['payment_breakdown'].append(f"{project_name} (Review): {data['breakdown']}")
         
         stats['total_audio_minutes'] = round(stats['total_audio_minutes'], 2)
         stats['total_rupees'] = round(stats['total_rupees'], 2)
@@ -1741,11 +1127,37 @@ def analytics_api(request):
     total_audio_minutes = sum(stats['total_audio_minutes'] for stats in annotator_stats.values())
     total_syllables = sum(stats['total_syllables'] for stats in annotator_stats.values())
     
-    # Per-project stats
+    # Per-project stats (grouped queries: example totals + confirmed from rollups)
+    from assignment.rollups import ProjectStatusRollup, ensure_rollups
+    
+    # Rollups of projects not rebuilt yet only cover changes since deploy:
+    # queue the rebuild and count those projects from ExampleState meanwhile
+    built_project_ids = [p.id for p in projects if ensure_rollups(p)]
+    pending_project_ids = [p.id for p in projects if p.id not in built_project_ids]
+    
+    examples_per_project = dict(
+        Example.objects.filter(project__in=projects).values('project_id').annotate(
+            n=Count('id')
+        ).values_list('project_id', 'n')
+    )
+    confirmed_per_project = dict(
+        ProjectStatusRollup.objects.filter(project_id__in=built_project_ids).values('project_id').annotate(
+            n=Sum('annotated')
+        ).values_list('project_id', 'n')
+    )
+    if pending_project_ids:
+        confirmed_per_project.update(
+            ExampleState.objects.filter(
+                example__project_id__in=pending_project_ids,
+                confirmed_by__isnull=False
+            ).values('example__project_id').annotate(
+                n=Count('id')
+            ).values_list('example__project_id', 'n')
+        )
     project_stats = []
     for project in projects:
-        proj_examples = Example.objects.filter(project=project).count()
-        proj_confirmed = ExampleState.objects.filter(example__project=project).count()
+        proj_examples = examples_per_project.get(project.id, 0)
+        proj_confirmed = confirmed_per_project.get(project.id) or 0
         project_stats.append({
             'id': project.id,
             'name': project.name,
@@ -1754,44 +1166,34 @@ def analytics_api(request):
             'pending': proj_examples - proj_confirmed
         })
     
-    # Daily activity
+    # Daily activity - same source as the summary (the activity events), per local day
     daily_activity = {}
-    for state in states:
-        date_str = state.confirmed_at.strftime('%Y-%m-%d')
-        if date_str not in daily_activity:
-            daily_activity[date_str] = {
+    for row in confirm_events.values('day').annotate(
+        annotations=Count('pk'),
+        active_users=Count('user_id', distinct=True)
+    ).order_by():
+        date_str = row['day'].strftime('%Y-%m-%d')
+        daily_activity[date_str] = {
+            'date': date_str,
+            'annotations': row['annotations'],
+            'approved': 0,
+            'rejected': 0,
+            'active_users': row['active_users']
+        }
+    
+    # Reviews per day (an example reviewed by several approvers counts once)
+    for key, events in (('approved', approve_events), ('rejected', reject_events)):
+        for row in events.values('day').annotate(n=Count('example_id', distinct=True)).order_by():
+            date_str = row['day'].strftime('%Y-%m-%d')
+            daily_activity.setdefault(date_str, {
                 'date': date_str,
                 'annotations': 0,
                 'approved': 0,
                 'rejected': 0,
-                'users': set()
-            }
-        daily_activity[date_str]['annotations'] += 1
-        if state.confirmed_by:
-            daily_activity[date_str]['users'].add(state.confirmed_by.username)
-    
-    # Add tracking to daily activity (use tracking_in_range for daily stats)
-    if tracking_in_range:
-        for t in tracking_in_range:
-            if t.reviewed_at:
-                date_str = t.reviewed_at.strftime('%Y-%m-%d')
-                if date_str in daily_activity:
-                    if t.status == 'reviewed':  # Changed from 'approved' to 'reviewed'
-                        daily_activity[date_str]['approved'] += 1
-                    elif t.status == 'rejected':
-                        daily_activity[date_str]['rejected'] += 1
-    
-    # Convert sets to counts
-    daily_list = []
-    for date_str in sorted(daily_activity.keys()):
-        day = daily_activity[date_str]
-        daily_list.append({
-            'date': day['date'],
-            'annotations': day['annotations'],
-            'approved': day['approved'],
-            'rejected': day['rejected'],
-            'active_users': len(day['users'])
-        })
+                'active_users': 0
+            })[key] = row['n']
+    
+    daily_list = [daily_activity[date_str] for date_str in sorted(daily_activity.keys())]
     
     # Get reviewer stats (separate from annotators) - use ApproverCompletionStatus for accurate tracking
     reviewer_stats = {}
@@ -1802,7 +1204,7 @@ def analytics_api(request):
         # Use ApproverCompletionStatus for more accurate reviewer tracking
         approver_completions = ApproverCompletionStatus.objects.filter(
             project__in=projects
-        ).select_related('approver', 'example').defer('assignment')
+        ).select_related('approver', 'project').defer('assignment')
         
         # Check if we have any ApproverCompletionStatus records
         if not approver_completions.exists():
@@ -1832,12 +1234,7 @@ def analytics_api(request):
             if cache_key not in approver_roles_cache:
                 approver_role = None
                 try:
-                    approver_member = Member.objects.filter(
-                        user=ap_completion.approver,
-                        project=ap_completion.project
-                    ).select_related('role').first()
-                    if approver_member and approver_member.role:
-                        approver_role = approver_member.role.name.lower().strip()
+                    approver_role = get_role_name(ap_completion.approver_id, ap_completion.project_id)
                 except Exception as e:
                     print(f'[Analytics] Error getting approver role: {e}')
                     approver_role = None
@@ -1857,15 +1254,17 @@ def analytics_api(request):
                 if is_project_admin:
                     reviewer_stats[username]['final_approved'] += 1  # Only project_admin approvals count as final
                 
-                # Add payment data for reviewers (only for approved reviews)
-                if ap_completion.example_id in example_meta_map:
-                    ex_meta = example_meta_map[ap_completion.example_id]
-                    reviewer_stats[username]['total_audio_minutes'] += ex_meta['duration_minutes']
-                    syllables = count_tibetan_syllables(ex_meta['text'])
-                    reviewer_stats[username]['total_syllables'] += syllables
             elif ap_completion.status == 'rejected':
                 reviewer_stats[username]['rejected'] += 1
         
+        # Payment data for reviewers (only for approved reviews)
+        for username, sums in approved_review_sums(
+            ApproverCompletionStatus.objects.filter(project__in=projects)
+        ).items():
+            if username in reviewer_stats:
+                reviewer_stats[username]['total_audio_minutes'] += sums['audio_minutes']
+                reviewer_stats[username]['total_syllables'] += sums['syllables']
+        
         # If no ApproverCompletionStatus records found, use fallback
         if use_fallback:
             print("[Analytics] No ApproverCompletionStatus records found, using AnnotationTracking fallback")
@@ -1876,16 +1275,21 @@ def analytics_api(request):
     # Fallback: If ApproverCompletionStatus is empty, use ApproverCompletionStatus for reviewed examples
     # Since AnnotationTracking no longer has reviewed_by, we must use ApproverCompletionStatus
     if use_fallback or not reviewer_stats:
-        # Get reviewed example IDs from tracking
-        reviewed_example_ids = [t.example_id for t in tracking_in_range if t.status in ['reviewed', 'rejected']]
+        # Examples whose tracking was reviewed in range (subquery, not an id list)
+        reviewed_in_range = AnnotationTracking.objects.filter(
+            project__in=projects,
+            status__in=['reviewed', 'rejected'],
+            reviewed_at__gte=start_datetime,
+            reviewed_at__lte=end_datetime
+        ).values('example_id')
         
         # Get ApproverCompletionStatus records for these examples
         from assignment.completion_tracking import ApproverCompletionStatus
         fallback_approver_completions = ApproverCompletionStatus.objects.filter(
-            example_id__in=reviewed_example_ids,
+            example_id__in=reviewed_in_range,
             reviewed_at__gte=start_datetime,
             reviewed_at__lte=end_datetime
-        ).select_related('approver', 'example', 'project').defer('assignment')
+        ).select_related('approver', 'project').defer('assignment')
         
         for ap_completion in fallback_approver_completions:
             username = ap_completion.approver.username
@@ -1913,12 +1317,7 @@ def analytics_api(request):
                 if cache_key not in approver_roles_cache:
                     approver_role = None
                     try:
-                        approver_member = Member.objects.filter(
-                            user=ap_completion.approver,
-                            project=ap_completion.project
-                        ).select_related('role').first()
-                        if approver_member and approver_member.role:
-                            approver_role = approver_member.role.name.lower().strip()
+                        approver_role = get_role_name(ap_completion.approver_id, ap_completion.project_id)
                     except Exception as e:
                         print(f'[Analytics] Error getting approver role in fallback: {e}')
                         approver_role = None
@@ -1935,59 +1334,26 @@ def analytics_api(request):
                 if is_project_admin:
                     reviewer_stats[username]['final_approved'] += 1  # Only project_admin approvals count as final
                 
-                # Add payment data for reviewers (only for approved reviews)
-                if ap_completion.example_id in example_meta_map:
-                    ex_meta = example_meta_map[ap_completion.example_id]
-                    reviewer_stats[username]['total_audio_minutes'] += ex_meta['duration_minutes']
-                    syllables = count_tibetan_syllables(ex_meta['text'])
-                    reviewer_stats[username]['total_syllables'] += syllables
             elif ap_completion.status == 'rejected':
                 reviewer_stats[username]['rejected'] += 1
+        
+        # Payment data for reviewers (only for approved reviews)
+        for username, sums in approved_review_sums(fallback_approver_completions).items():
+            reviewer_stats[username]['total_audio_minutes'] += sums['audio_minutes']
+            reviewer_stats[username]['total_syllables'] += sums['syllables']
     
     # Calculate reviewer payments (use ApproverCompletionStatus - FILTERED BY DATE RANGE)
     # Since AnnotationTracking no longer has reviewed_by, use ApproverCompletionStatus
+    # Same grouped SUM as reviewer_payment_data above (approved within range,
+    # example's tracking reviewed within range)
     for username, stats in reviewer_stats.items():
-        # Group by project for payment calculation
-        reviewer_projects = {}
-        # Get ApproverCompletionStatus records for this reviewer within date range
-        from assignment.completion_tracking import ApproverCompletionStatus
-        approver_completions = ApproverCompletionStatus.objects.filter(
-            approver__username=username,
-            status='approved',  # ApproverCompletionStatus still uses 'approved'
-            reviewed_at__gte=start_datetime,
-            reviewed_at__lte=end_datetime
-        ).select_related('approver', 'example', 'project').defer('assignment')
-        
-        for ap_completion in approver_completions:
-            # Get corresponding tracking to check reviewed_at matches
-            tracking = tracking_for_payment.filter(example_id=ap_completion.example_id).first()
-            if tracking and tracking.status == 'reviewed' and tracking.reviewed_at:
-                if start_datetime <= tracking.reviewed_at <= end_datetime:
-                    if ap_completion.example_id in example_meta_map:
-                        ex_meta = example_meta_map[ap_completion.example_id]
-                        project_name = ex_meta['project_name']
-                        if project_name not in reviewer_projects:
-                            reviewer_projects[project_name] = {
-                                'audio_minutes': 0.0,
-                                'reviewed_segments': 0,
-                                'reviewed_syllables': 0
-                            }
-                        reviewer_projects[project_name]['audio_minutes'] += ex_meta['duration_minutes']
-                        reviewer_projects[project_name]['reviewed_segments'] += 1
-                        reviewer_projects[project_name]['reviewed_syllables'] += count_tibetan_syllables(ex_meta['text'])
+        reviewer_projects = reviewer_payment_data.get(username, {})
         
-        # Calculate payment for each project
+        # Payment for each project (already priced per day above)
         for project_name, data in reviewer_projects.items():
-            payment = calculate_payment(
-                project_name=project_name,
-                total_audio_minutes=data['audio_minutes'],
-                approved_segments=data['reviewed_segments'],
-                reviewed_syllables=data['reviewed_syllables'],
-                is_reviewer=False
-            )
-            stats['total_rupees'] += payment['total_rupees']
-            if payment['configured']:
-                stats['payment_breakdown'].append(f"{project_name}: {payment['breakdown']}")
+            stats['total_rupees'] += data['total_rupees']
+            if data['configured']:
+                stats['payment_breakdown'].append(f"{project_name}: {data['breakdown']}")
         
         stats['total_audio_minutes'] = round(stats['total_audio_minutes'], 2)
         stats['total_rupees'] = round(stats['total_rupees'], 2)
@@ -2013,6 +1379,8 @@ def analytics_api(request):
         'reviewers': reviewer_list if reviewer_list else [],
         'projects': project_stats if project_stats else [],
         'daily_activity': daily_list if daily_list else [],
+        'activity_backfill_pending': activity_backfill_pending,
+        'rollups_pending': bool(pending_project_ids),
         'date_range': {
             'start': start_date.isoformat(),
             'end': end_date.isoformat(),
@@ -2023,3 +1391,77 @@ def analytics_api(request):
         }
     })
 
+
+
+@login_required
+@require_http_methods(["GET"])
+def payroll_export(request):
+    """
+    Payroll CSV for all projects (or one) over a month or date range.
+    URL: /monlam/analytics/payroll/
+    
+    ACCESS: Admin, Staff, Project Managers, Project Admins, Approvers
+    
+    Query params:
+    - month: YYYY-MM (default: last month)
+    - start_date / end_date: YYYY-MM-DD (instead of month)
+    - project_id: optional, filter by project
+    - gzip: true for a .csv.gz download
+    - format: json for the lines as JSON
+    """
+    if not has_analytics_access(request.user):
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    from datetime import datetime
+    from projects.models import Project
+    from assignment.csv_streaming import stream_csv
+    from assignment.payroll import (
+        compute_payroll, iter_payroll_csv_rows, month_dates, period_bounds, previous_month
+    )
+    
+    start_date_str = request.GET.get('start_date', '')
+    end_date_str = request.GET.get('end_date', '')
+    try:
+        if start_date_str and end_date_str:
+            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+        else:
+            start_date, end_date = month_dates(request.GET.get('month') or previous_month())
+    except ValueError:
+        return JsonResponse({'error': 'Invalid month or date (use YYYY-MM / YYYY-MM-DD)'}, status=400)
+    
+    projects = Project.objects.all()
+    project_id = request.GET.get('project_id', '')
+    if project_id:
+        projects = projects.filter(id=project_id)
+    
+    start_datetime, end_datetime = period_bounds(start_date, end_date)
+    lines = compute_payroll(start_datetime, end_datetime, projects=projects)
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'lines': lines,
+            'total_rupees': round(sum(line['total_rupees'] for line in lines), 2),
+        })
+    
+    return stream_csv(
+        iter_payroll_csv_rows(lines),
+        f'payroll_{start_date.isoformat()}_{end_date.isoformat()}',
+        gzip=request.GET.get('gzip', '').lower() == 'true'
+    )
+
+
+@login_required
+@require_http_methods(["GET"])
+def api_role_cache_stats(request):
+    """
+    Role cache hit/miss counters for this worker process.
+    GET /monlam/api/role-cache-stats/ (staff only)
+    """
+    if not (request.user.is_superuser or request.user.is_staff):
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    
+    from assignment.role_service import role_cache_stats
+    return JsonResponse(role_cache_stats())